@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+"""Library scaling benchmarks
+
+Generates synthetic libraries of small tagged MP3 files (flat and nested) in a
+temporary directory and times the library, metadata, song list and playback
+paths of the player against them. Runs headless, results are written as JSON.
+
+    python benchmarks/bench_library.py --sizes 1000,10000 --output results.json
+    python benchmarks/bench_library.py --baseline old.json
+"""
+import os
+import sys
+import json
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+from time import perf_counter
+from pathlib import Path
+
+ROOT: Path = Path(__file__).resolve().parent.parent
+
+# Metadata index and thumbnails go to a throwaway cache, so every run starts cold
+CACHE_DIR: str = tempfile.mkdtemp(prefix="playstar-bench-cache-")
+os.environ["XDG_CACHE_HOME"] = CACHE_DIR
+os.environ["XDG_STATE_HOME"] = CACHE_DIR
+
+# Ursina looks for assets next to the main script
+sys.argv[0] = str(ROOT / "project.py")
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+import project
+from resources.components import audio_scripts
+from resources.components.album_art import find_cover
+from synthetic_library import generate_library
+
+
+DEFAULT_SIZES: list[int] = [1_000, 10_000, 100_000, 1_000_000]
+LAYOUTS: tuple[str, ...] = ("flat", "nested")
+
+
+def timed(fn, repeat: int = 1) -> dict:
+    """Runs fn repeat times
+
+    Returns:
+        dict: total seconds, calls and seconds per call
+    """
+    start = perf_counter()
+    for _ in range(repeat):
+        fn()
+    total = perf_counter() - start
+
+    return {"seconds": total, "calls": repeat, "per_call": total / repeat}
+
+
+class Harness():
+    def __init__(self) -> None:
+        """Headless player with an empty disc; each library is loaded as a new disc
+        """
+        self.app = project.create_app(headless=True)
+        self.empty = Path(tempfile.mkdtemp(prefix="playstar-bench-empty-"))
+
+        self.memory = project.LocalTempMemory()
+        self.options = project.ParserGen().parse_args([str(self.empty), "--no-snapshot"])
+        self.memory.maindict.update(
+            dir_manager=project.DirectoryManager(),
+            local_memory=self.memory,
+            options=self.options
+        )
+        self.ui = project.Interface(memory=self.memory)
+
+    def load(self, raw: dict) -> None:
+        # Already scanned, so the disc is neither streamed nor watched
+        disc = project.Disc(raw["path"], self.options, self.ui.changer.indexer)
+        disc.add(raw["content"])
+        self.ui.load_disc(disc)
+
+    def settle(self, frames: int = 5) -> None:
+        project.step_frames(frames)
+
+
+def bench_library(harness: Harness, root: Path, folders: list[str], args: argparse.Namespace) -> dict:
+    results = {}
+    dir_manager = project.DirectoryManager()
+
+    # Full scan, as the loading screen used to do it
+    raw = None
+    def scan():
+        nonlocal raw
+        raw = dir_manager.getDirContent(root)
+    results["getDirContent"] = timed(scan)
+
+    content = raw["content"]
+    rng = random.Random(args.seed)
+    sample = [str(root / name) for name in rng.sample(content, min(args.sample, len(content)))]
+
+    # Cold: tags are parsed, warm: served by the metadata index
+    results["get_audio_metadata.cold"] = timed(
+        lambda: [audio_scripts.get_audio_metadata(path) for path in sample]
+    )
+    results["get_audio_metadata.cold"]["per_call"] /= len(sample)
+    results["get_audio_metadata.warm"] = timed(
+        lambda: [audio_scripts.get_audio_metadata(path) for path in sample]
+    )
+    results["get_audio_metadata.warm"]["per_call"] /= len(sample)
+
+    harness.load(raw)
+    pages = max((len(content) - 1) // 5, 0)
+
+    def render_page():
+        harness.memory.maindict["currentpage"] = rng.randint(0, pages)
+        harness.ui.render_dir(raw)
+    results["render_dir"] = timed(render_page, args.repeat)
+
+    harness.ui.select_song(rng.randrange(len(content)))
+    results["skipSong"] = timed(harness.ui.skipSong, args.repeat)
+    results["prevSong"] = timed(harness.ui.prevSong, args.repeat)
+    harness.ui.soundmgr.stop()
+    harness.settle()
+
+    folder_sample = rng.sample(folders, min(args.sample, len(folders)))
+    results["find_cover"] = timed(
+        lambda: [find_cover(root / folder) for folder in folder_sample]
+    )
+    results["find_cover"]["per_call"] /= len(folder_sample)
+
+    return results
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report: dict, baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    for library, results in report["libraries"].items():
+        old_results = baseline.get("libraries", {}).get(library, {})
+
+        for name, result in results.items():
+            if name in old_results and old_results[name]["per_call"] > 0:
+                ratio = result["per_call"] / old_results[name]["per_call"]
+                print(f"{library:>16} {name:<28} {ratio:6.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="bench_library.py", description="Times the player against synthetic libraries")
+    parser.add_argument('--sizes', type=lambda v: [int(x) for x in v.split(',')], default=DEFAULT_SIZES,
+                        help="Comma-separated library sizes (default: 1000,10000,100000,1000000)")
+    parser.add_argument('--layouts', type=lambda v: v.split(','), default=list(LAYOUTS),
+                        help="Comma-separated layouts: flat, nested")
+    parser.add_argument('--sample', type=int, default=500,
+                        help="Files and folders sampled for metadata and cover timings")
+    parser.add_argument('--repeat', type=int, default=200,
+                        help="Calls per render_dir, skipSong and prevSong timing")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--tmpdir', default=None, help="Where libraries are generated")
+    parser.add_argument('--output', default="benchmark-results.json")
+    parser.add_argument('--baseline', default=None, help="Previous results to compare against")
+    args = parser.parse_args()
+
+    harness = Harness()
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "args": {k: v for k, v in vars(args).items() if k not in ("output", "baseline", "tmpdir")},
+        "libraries": {},
+    }
+
+    try:
+        for layout in args.layouts:
+            for size in args.sizes:
+                name = f"{layout}-{size}"
+                root = Path(tempfile.mkdtemp(prefix=f"playstar-bench-{name}-", dir=args.tmpdir))
+
+                try:
+                    start = perf_counter()
+                    folders = generate_library(root, size, layout)
+                    print(f"{name}: generated in {perf_counter() - start:.1f}s", file=sys.stderr)
+
+                    report["libraries"][name] = bench_library(harness, root, folders, args)
+                finally:
+                    shutil.rmtree(root, ignore_errors=True)
+
+                for metric, result in report["libraries"][name].items():
+                    print(f"{name:>16} {metric:<28} {result['per_call'] * 1000:10.3f} ms", file=sys.stderr)
+    finally:
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+        shutil.rmtree(harness.empty, ignore_errors=True)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    if args.baseline:
+        compare(report, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
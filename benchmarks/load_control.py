@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+"""Control socket load test
+
+Connects many local clients to the player's control socket at once. Each one
+sends a mix of commands and waits for every reply, while subscribers count
+the state events pushed to them. Reports reply latency percentiles,
+throughput and errors as JSON.
+
+Without --socket, a headless player is started on a synthetic library:
+
+    python benchmarks/load_control.py --clients 100 --requests 200 --output control.json
+    python benchmarks/load_control.py --socket /tmp/playstar.sock
+"""
+import os
+import sys
+import json
+import random
+import shutil
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from time import perf_counter
+from pathlib import Path
+
+from synthetic_library import generate_library
+
+ROOT: Path = Path(__file__).resolve().parent.parent
+
+# Command mix of the clients, by weight
+COMMANDS: list[tuple[dict, int]] = [
+    ({"cmd": "state"}, 50),
+    ({"cmd": "queue", "count": 5}, 15),
+    ({"cmd": "volume", "by": 1}, 10),
+    ({"cmd": "volume", "by": -1}, 10),
+    ({"cmd": "toggle"}, 5),
+    ({"cmd": "next"}, 5),
+    ({"cmd": "prev"}, 5),
+]
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+async def client(socket_path: str, requests: int, rng: random.Random, latencies: list[float], errors: list[str]) -> None:
+    """Sends requests one after the other, timing each reply
+    """
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    commands, weights = zip(*COMMANDS)
+
+    try:
+        for request_id in range(requests):
+            request = {"id": request_id, **rng.choices(commands, weights)[0]}
+
+            start = perf_counter()
+            writer.write(json.dumps(request).encode() + b"\n")
+            await writer.drain()
+            reply = json.loads(await reader.readline())
+            latencies.append(perf_counter() - start)
+
+            if reply.get("id") != request_id:
+                errors.append(f"reply {reply.get('id')} to request {request_id}")
+            elif not reply["ok"]:
+                errors.append(reply["error"])
+    finally:
+        writer.close()
+
+
+async def subscriber(socket_path: str, stop: asyncio.Event) -> dict:
+    """Counts state events until stop is set
+    """
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    writer.write(b'{"id": 0, "cmd": "subscribe"}\n')
+    await writer.drain()
+
+    events = 0
+    longest_gap = 0.0
+    last = perf_counter()
+
+    try:
+        reply = json.loads(await reader.readline())
+        if not reply["ok"]:
+            raise RuntimeError(reply["error"])
+
+        while not stop.is_set():
+            try:
+                line = await asyncio.wait_for(reader.readline(), timeout=.1)
+            except asyncio.TimeoutError:
+                continue
+            if not line:
+                break
+
+            if json.loads(line).get("event") == "state":
+                now = perf_counter()
+                events += 1
+                longest_gap = max(longest_gap, now - last)
+                last = now
+    finally:
+        writer.close()
+
+    return {"events": events, "longest_gap": longest_gap}
+
+
+async def run_load(socket_path: str, args: argparse.Namespace) -> dict:
+    latencies: list[float] = []
+    errors: list[str] = []
+    stop = asyncio.Event()
+
+    subscribers = [asyncio.create_task(subscriber(socket_path, stop)) for _ in range(args.subscribers)]
+
+    start = perf_counter()
+    await asyncio.gather(*(
+        client(socket_path, args.requests, random.Random(args.seed + i), latencies, errors)
+        for i in range(args.clients)
+    ))
+    elapsed = perf_counter() - start
+
+    stop.set()
+    subscribed = await asyncio.gather(*subscribers)
+
+    return {
+        "clients": args.clients,
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed,
+        "latency_ms": {
+            "p50": percentile(latencies, .5) * 1000,
+            "p90": percentile(latencies, .9) * 1000,
+            "p99": percentile(latencies, .99) * 1000,
+            "max": max(latencies, default=0) * 1000,
+        },
+        "errors": len(errors),
+        "error_samples": sorted(set(errors))[:10],
+        "subscribers": args.subscribers,
+        "events_per_subscriber": [s["events"] for s in subscribed],
+        "longest_event_gap_ms": max((s["longest_gap"] for s in subscribed), default=0) * 1000,
+    }
+
+
+async def wait_ready(socket_path: str, timeout: float) -> None:
+    """Waits until the player answers a state request
+    """
+    deadline = perf_counter() + timeout
+
+    while perf_counter() < deadline:
+        try:
+            reader, writer = await asyncio.open_unix_connection(socket_path)
+            writer.write(b'{"cmd": "state"}\n')
+            await writer.drain()
+            reply = json.loads(await reader.readline())
+            writer.close()
+
+            if reply["ok"]:
+                return
+        except (OSError, ValueError):
+            pass
+
+        await asyncio.sleep(.2)
+
+    raise TimeoutError(f"player didn't answer on {socket_path} within {timeout}s")
+
+
+def start_player(library: Path, socket_path: str, args: argparse.Namespace) -> subprocess.Popen:
+    return subprocess.Popen(
+        [
+            sys.executable, str(ROOT / "project.py"), str(library),
+            "--headless", "--fast-boot", "--no-snapshot",
+            "--control-socket", socket_path,
+            "--idle-fps", str(args.idle_fps),
+        ],
+        cwd=ROOT
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="load_control.py", description="Load-tests the player's control socket")
+    parser.add_argument('--socket', default=None, help="Socket of a running player, one is started otherwise")
+    parser.add_argument('--library', default=None, help="Library of the started player (default: 200 synthetic songs)")
+    parser.add_argument('--clients', type=int, default=100, help="Concurrent clients")
+    parser.add_argument('--requests', type=int, default=200, help="Requests per client")
+    parser.add_argument('--subscribers', type=int, default=10, help="Clients only receiving state events")
+    parser.add_argument('--idle-fps', type=float, default=5, help="--idle-fps of the started player")
+    parser.add_argument('--timeout', type=float, default=60, help="Seconds to wait for the started player")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default="control-load.json")
+    args = parser.parse_args()
+
+    player = None
+    temp_dir = None
+    socket_path = args.socket
+
+    try:
+        if socket_path is None:
+            temp_dir = Path(tempfile.mkdtemp(prefix="playstar-control-"))
+            socket_path = str(temp_dir / "control.sock")
+
+            # Cache and state of the started player stay in the temporary directory
+            os.environ["XDG_CACHE_HOME"] = str(temp_dir)
+            os.environ["XDG_STATE_HOME"] = str(temp_dir)
+
+            library = Path(args.library) if args.library else temp_dir / "library"
+            if not args.library:
+                library.mkdir()
+                generate_library(library, 200, "flat")
+
+            player = start_player(library, socket_path, args)
+
+        asyncio.run(wait_ready(socket_path, args.timeout))
+        report = asyncio.run(run_load(socket_path, args))
+    finally:
+        if player:
+            player.terminate()
+            player.wait()
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    print(
+        f"{report['requests']} requests from {report['clients']} clients in {report['seconds']:.2f}s "
+        f"({report['requests_per_second']:.0f}/s), latency p50 {report['latency_ms']['p50']:.1f} ms "
+        f"p99 {report['latency_ms']['p99']:.1f} ms, {report['errors']} errors",
+        file=sys.stderr
+    )
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
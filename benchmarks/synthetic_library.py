@@ -0,0 +1,79 @@
+"""Synthetic music libraries for the benchmarks
+
+Tiny tagged MP3 files (ID3v2.3 title and artist) and cover images, written
+without importing the player so any benchmark script can use them.
+"""
+import struct
+from pathlib import Path
+
+
+# Nested layout: Artist NNNN/Album NN/NNN.mp3
+TRACKS_PER_ALBUM: int = 12
+ALBUMS_PER_ARTIST: int = 8
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz: 417-byte frames
+MP3_FRAME: bytes = b"\xff\xfb\x90\x00" + bytes(413)
+MP3_FRAMES: int = 8
+
+# Smallest valid JPEG is enough for cover discovery
+COVER_BYTES: bytes = bytes.fromhex(
+    "ffd8ffe000104a46494600010100000100010000ffdb004300080606070605080707070909080a0c"
+    "140d0c0b0b0c1912130f141d1a1f1e1d1a1c1c20242e2720222c231c1c2837292c30313434341f27"
+    "393d38323c2e333432ffc0000b080001000101011100ffc4001f0000010501010101010100000000"
+    "000000000102030405060708090a0bffc400b5100002010303020403050504040000017d01020300"
+    "041105122131410613516107227114328191a1082342b1c11552d1f02433627282090a161718191a"
+    "25262728292a3435363738393a434445464748494a535455565758595a636465666768696a737475"
+    "767778797a838485868788898a92939495969798999aa2a3a4a5a6a7a8a9aab2b3b4b5b6b7b8b9ba"
+    "c2c3c4c5c6c7c8c9cad2d3d4d5d6d7d8d9dae1e2e3e4e5e6e7e8e9eaf1f2f3f4f5f6f7f8f9faffda"
+    "0008010100003f00fbd3ffd9"
+)
+
+
+def id3_frame(frame_id: str, text: str) -> bytes:
+    data = b"\x00" + text.encode("latin-1")
+    return frame_id.encode() + struct.pack(">I", len(data)) + b"\x00\x00" + data
+
+
+def tagged_mp3(title: str, artist: str) -> bytes:
+    """Returns a tiny MP3 file with an ID3v2.3 title and artist
+    """
+    frames = id3_frame("TIT2", title) + id3_frame("TPE1", artist)
+    size = len(frames)
+    syncsafe = bytes((size >> shift) & 0x7f for shift in (21, 14, 7, 0))
+
+    return b"ID3\x03\x00\x00" + syncsafe + frames + MP3_FRAME * MP3_FRAMES
+
+
+def generate_library(root: Path, size: int, layout: str) -> list[str]:
+    """Writes a synthetic library
+
+    Args:
+        root (Path): empty directory to fill
+        size (int): number of songs
+        layout (str): "flat" (one folder) or "nested" (artist/album folders)
+
+    Returns:
+        list[str]: album folders, relative to root
+    """
+    folders = set()
+
+    for i in range(size):
+        if layout == "flat":
+            folder = ""
+        else:
+            album = i // TRACKS_PER_ALBUM
+            folder = f"Artist {album // ALBUMS_PER_ARTIST:05}/Album {album % ALBUMS_PER_ARTIST:02}"
+
+        if folder not in folders:
+            folders.add(folder)
+            (root / folder).mkdir(parents=True, exist_ok=True)
+
+            # Half of the albums have a cover
+            if len(folders) % 2:
+                (root / folder / "cover.jpg").write_bytes(COVER_BYTES)
+
+        (root / folder / f"{i:07}.mp3").write_bytes(
+            tagged_mp3(f"Track {i}", f"Artist {i // (TRACKS_PER_ALBUM * ALBUMS_PER_ARTIST)}")
+        )
+
+    return sorted(folders)
@@ -0,0 +1 @@
+# Makes the repository root importable, so plain `pytest` finds resources/ and project.py
@@ -1,28 +1,57 @@
 #!/usr/bin/env python
 
+# Launch clock, taken before anything heavy is imported
+from time import perf_counter, perf_counter_ns
+LAUNCH_TIME: float = perf_counter()
+
 # Baisc Libs
 import os
 import sys
-import shutil
+import atexit
 import argparse
+import math
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from argparse import Namespace
-from typing import Any
+from typing import Any, Callable, Iterator
 from pathlib import (Path, PosixPath)
 
-# Audio Libs
-import vlc
+# Audio Libs (vlc and tinytag are loaded by audio_scripts.load_backends)
 from resources.components import audio_scripts
+from resources.components.album_art import AlbumArtLoader
+from resources.components.asset_manager import AssetManager
+from resources.components.control_server import ControlError, ControlServer
+from resources.components.frame_profiler import FrameProfiler
+from resources.components.frame_scheduler import FrameScheduler
+from resources.components.glyph_cache import DEFAULT_RESOLUTION, GlyphCache
+from resources.components.hud_model import HudViewModel
+from resources.components.library_scanner import (DEFAULT_EXTENSIONS, LibraryScan,
+                                                  normalize_extensions, scan_library)
+from resources.components.library_watcher import (ADDED, LISTED, MODIFIED, REMOVED, RENAMED, REMOVED_TREE,
+                                                  RESCANNED, Delta, LibraryWatcher, watch_library)
+from resources.components.metadata_loader import MetadataLoader
+from resources.components.metrics import get_metrics
+from resources.components.page_model import PageModel
+from resources.components.play_queue import REPEAT_MODES, PlayQueue
+from resources.components.playlist import is_playlist, read_playlist, song_name
+from resources.components.search_index import SearchIndex
+from resources.components.snapshot import LibraryRefresh, load_snapshot, save_snapshot
+from resources.components.song_list import SongListView
 
 # Engine Libs
+from panda3d.core import ClockObject, loadPrcFileData
 from ursina.prefabs.health_bar import HealthBar
-from ursina import (Ursina, Entity, Button,Func, Text, Audio, 
+from ursina import (Ursina, Entity, Button,Func, Text, Audio, Texture,
                     color, time, destroy, 
                     window, camera)
 
 
-# Target Path where songs is located
 APPLICATION_NAME: str = "PlayStar"
-TARGET_PATH: str = ""
+
+log = logging.getLogger("playstar")
 
 # Program's local path
 __location__ = os.path.realpath(
@@ -31,15 +60,53 @@ __location__ = os.path.realpath(
 )
 
 
-# Ursina Engine Definition
-app = Ursina(
-    title=APPLICATION_NAME,
-    development_mode=False,
-    borderless=False,
-    fullscreen=False,
-    window_type='onscreen',
-    size=(896, 504)
-)
+# Ursina Engine Definition, created by create_app
+app = None
+
+
+def create_app(headless: bool = False) -> Ursina:
+    """Creates the ursina application. Needed before any interface is built
+
+    Args:
+        headless (bool, optional): render to an offscreen buffer instead of a
+            window and send all audio to a null sink. Defaults to False.
+
+    Returns:
+        Ursina: the application, also kept in the module's app
+    """
+    global app
+
+    if headless:
+        # Panda3D sounds are muted and libvlc gets a dummy output
+        loadPrcFileData("", "audio-library-name null")
+        audio_scripts.set_audio_output(audio_scripts.NULL_AUDIO_OUTPUT)
+
+    app = Ursina(
+        title=APPLICATION_NAME,
+        development_mode=False,
+        borderless=False,
+        fullscreen=False,
+        window_type='offscreen' if headless else 'onscreen',
+        size=(896, 504)
+    )
+    return app
+
+
+def step_frames(frames: int, dt: float | None = None) -> None:
+    """Runs the update loop a fixed number of frames
+
+    Args:
+        frames (int): frames to run
+        dt (float | None, optional): fixed seconds per frame, None to follow
+            the real clock. Defaults to None.
+    """
+    if dt is not None:
+        clock = ClockObject.getGlobalClock()
+        clock.setMode(ClockObject.MNonRealTime)
+        clock.setFrameRate(1 / dt)
+
+    for _ in range(frames):
+        app.step()
 
 
 def localpath(req_path: str) -> PosixPath:
@@ -56,35 +123,85 @@ def localpath(req_path: str) -> PosixPath:
     return rest_path
 
 
-def copy_cover_to_local(origin_path: PosixPath) -> list[str]:
-    """Searches for cover file (image) and copies to local assets folder
+# Size of currentAlbumImage, album art is decoded to fit it
+ALBUM_ART_SCALE: float = 4.5
+
+
+def on_screen_size(scale: float, z: float = 0) -> int:
+    """Returns how many pixels a quad covers in the window
 
     Args:
-        origin_path (PosixPath): Location to search for image files
+        scale (float): quad's world scale
+        z (float, optional): quad's world z. Defaults to 0.
 
     Returns:
-        list[str]: found matching files.
+        int: size in pixels, rounded up to a power of two
     """
-    base_names: list[str] = ["cover", "folder"]
-    extensions: list[str] = [".jpg", ".jpeg", ".png"]
-    
-    target_names: list[str] = [f"{name}{ext}" for name in base_names for ext in extensions]
+    distance = abs(z - camera.world_z)
+    visible_width = 2 * distance * math.tan(math.radians(camera.fov / 2))
+    pixels = scale / visible_width * window.size[0]
 
-    found_files: list = []
+    return 2 ** math.ceil(math.log2(max(pixels, 16)))
 
-    for file in os.listdir(origin_path):
-        if file.lower() in target_names:
-            file_path: str = os.path.join(origin_path, file)
-            found_files.append(file_path)
 
-            if os.path.exists(x:=localpath('assets/textures/cover.jpg')):
-                os.remove(x)
-            
-            shutil.copy2(src=file_path, dst=localpath("assets/textures/cover.jpg"))
-            print(f"File {file} copied to {localpath("assets/textures/cover.jpg")}")
+def start_library_work(memory: "LocalTempMemory") -> None:
+    """Loads the first disc of the changer and starts the background loaders, once
+
+    Everything is stored in memory so LoadDiscInterface can start the work and
+    Interface picks it up where it is. Other discs are only loaded when they
+    are selected or about to be.
+
+    Args:
+        memory (LocalTempMemory): main local memory class to store and read data
+    """
+    main_memory = memory.maindict
+    if "changer" in main_memory:
+        return
+
+    # The last run's library and player, unless its folders changed
+    options = main_memory["options"]
+    snapshot = None if options.no_snapshot else load_snapshot()
+
+    changer = DiscChanger(options.path, main_memory["dir_manager"], options, snapshot)
+    main_memory["changer"] = changer
+    atexit.register(changer.close)
+    main_memory["saved_player"] = changer.saved_player
+    use_disc(main_memory, changer.select(changer.index))
+
+    main_memory["metadata_loader"] = MetadataLoader()
+    main_memory["art_loader"] = AlbumArtLoader(size=on_screen_size(ALBUM_ART_SCALE))
+
+
+def get_glyph_cache(main_memory: dict) -> GlyphCache:
+    """Returns the glyph cache of the shared memory, creating it on first use
+
+    Args:
+        main_memory (dict): LocalTempMemory's maindict
+    """
+    if "glyph_cache" not in main_memory:
+        options = main_memory["options"]
+        glyphs = GlyphCache(
+            resolution=options.glyph_resolution,
+            max_bytes=int(options.glyph_memory * 1024 ** 2)
+        )
+        main_memory["glyph_cache"] = glyphs
+        atexit.register(glyphs.save)
+
+    return main_memory["glyph_cache"]
 
-    print(found_files)
-    return found_files
+
+def use_disc(main_memory: dict, disc: "Disc") -> None:
+    """Points the shared memory entries at a disc
+
+    Args:
+        main_memory (dict): LocalTempMemory's maindict
+        disc (Disc): disc to show
+    """
+    main_memory["disc"] = disc
+    main_memory["songs_dir"] = disc.path
+    main_memory["contentraw"] = disc.contentraw
+    main_memory["play_queue"] = disc.queue
+    main_memory["currentpage"] = disc.currentpage
 
 
 class LocalTempMemory():
@@ -94,10 +211,74 @@ class LocalTempMemory():
         self.maindict = {}
 
 class DirectoryManager():
-    def __init__(self) -> None:
+    def __init__(self, extensions: list[str] | None = None, recursive: bool = True,
+                 follow_symlinks: bool = True) -> None:
         """Manages files and directories
+
+        Args:
+            extensions (list[str] | None, optional): accepted audio extensions,
+                case-insensitive. Defaults to DEFAULT_EXTENSIONS.
+            recursive (bool, optional): scan sub-directories. Defaults to True.
+            follow_symlinks (bool, optional): list symlinked directories. Defaults to True.
+        """
+        self.extensions: frozenset[str] = (
+            normalize_extensions(extensions) if extensions else DEFAULT_EXTENSIONS
+        )
+        self.recursive: bool = recursive
+        self.follow_symlinks: bool = follow_symlinks
+
+    def scanDir(self, path: PosixPath, dirs: dict[str, int] | None = None) -> Iterator[str]:
+        """Yields music files under path as they are found
+
+        Args:
+            path (PosixPath): Required path to list files
+            dirs (dict[str, int] | None, optional): filled with the mtime_ns of
+                every directory listed. Defaults to None.
+
+        Returns:
+            Iterator[str]: file paths relative to path
+        """
+        return scan_library(path, self.extensions, recursive=self.recursive,
+                            follow_symlinks=self.follow_symlinks, dirs=dirs)
+
+    def startScan(self, path: PosixPath, dirs: dict[str, int] | None = None) -> LibraryScan:
+        """Scans path on a background thread
+
+        Args:
+            path (PosixPath): Required path to list files
+            dirs (dict[str, int] | None, optional): filled with the mtime_ns of
+                every directory listed. Defaults to None.
+
+        Returns:
+            LibraryScan: scan whose poll() returns new relative file paths
+        """
+        return LibraryScan(self.scanDir(path, dirs))
+
+    def startPlaylist(self, path: PosixPath, missing: deque[str] | None = None) -> LibraryScan:
+        """Reads a playlist file on a background thread
+
+        Args:
+            path (PosixPath): M3U/M3U8, PLS or XSPF file
+            missing (deque[str] | None, optional): receives entries that
+                aren't files. Defaults to None.
+
+        Returns:
+            LibraryScan: scan whose poll() returns songs in playlist order,
+                relative to the playlist's folder when inside it
         """
-        pass
+        return LibraryScan(read_playlist(path, missing))
+
+    def startWatch(self, path: PosixPath) -> LibraryWatcher:
+        """Watches path for added, removed and renamed songs
+
+        Args:
+            path (PosixPath): Required path to watch
+
+        Returns:
+            LibraryWatcher: watcher whose poll() returns deltas
+        """
+        # Same settings as the scan, so both list the same songs
+        return watch_library(path, self.extensions, self.recursive, self.follow_symlinks)
 
     def getDirContent(self, path: PosixPath) -> dict[str, Any]:
         """Returns music files from path
@@ -108,20 +289,389 @@ class DirectoryManager():
         Returns:
             dict[str, Any]: Found matching files and original path
         """
-        content = os.listdir(path)
-        content_filter = {
-            "allowable": [".flac", ".mp3", ".m4a", ".ogg"]
-        }
-
-        if content:
-            a_content = [x for x in content if x.endswith(tuple(content_filter["allowable"]))]
-        else:
-            a_content = []
-        rest = { "path": path, "content": a_content if not None else [] }
+        rest = { "path": path, "content": list(self.scanDir(path)) }
         return rest
 
 
 # Main UI
+class Disc():
+    def __init__(self, path: PosixPath, options: Namespace, indexer: ThreadPoolExecutor) -> None:
+        """A folder or playlist of the disc changer. Nothing is read until load() is called
+
+        Args:
+            path (PosixPath): album or library folder, or a playlist file
+            options (Namespace): parsed command-line arguments
+            indexer (ThreadPoolExecutor): single worker filling the search index
+        """
+        # Songs of a playlist are named relative to its folder, or absolute outside it
+        self.source: PosixPath = path
+        self.playlist: PosixPath | None = path if is_playlist(path) else None
+        self.path: PosixPath = Path(os.path.abspath(path.parent)) if self.playlist else path
+        self.contentraw: dict[str, Any] = { "path": self.path, "content": [] }
+        self.song_names: set[str] = set()
+        self.currentpage: int = 0
+
+        # Songs a watcher listed again after losing events, until it reports RESCANNED
+        self.listed: set[str] = set()
+
+        self.queue: PlayQueue = PlayQueue(repeat=options.repeat, shuffle=options.shuffle)
+
+        # Song-list labels, fitted once per song
+        self.pages: PageModel = PageModel()
+
+        # Titles, artists and file names; filled off the render thread, in order
+        self.search: SearchIndex = SearchIndex()
+        self.indexer: ThreadPoolExecutor = indexer
+
+        self.loaded: bool = False
+        self.scan: LibraryScan | None = None
+        self.watcher: LibraryWatcher | None = None
+        self.scan_started: int = 0
+
+        # Directory mtimes of the last scan, they tell a snapshot is still valid
+        self.dirs: dict[str, int] = {}
+        self.refresh: LibraryRefresh | None = None
+
+        # Saved by the last run, used once by load()
+        self.saved: dict | None = None
+
+        # First page and cover were requested ahead of time
+        self.warmed: bool = False
+
+        # Not watched while it's neither shown nor next, load() catches up.
+        # partial: its scan was cancelled before listing everything.
+        self.parked: bool = False
+        self.partial: bool = False
+
+        # Playlist entries that aren't files, queued by the reading thread
+        self.missing: deque[str] = deque()
+        self.missing_count: int = 0
+
+    def load(self, dir_manager: DirectoryManager) -> None:
+        """Starts scanning and watching the folder, once
+
+        Args:
+            dir_manager (DirectoryManager): scanner and watcher settings
+        """
+        if self.parked:
+            self.resume(dir_manager)
+            return
+
+        if self.loaded:
+            return
+        self.loaded = True
+
+        # Read again on every launch, the first entries play while the rest is read.
+        # Not watched: its folder may hold songs that aren't in the playlist.
+        if self.playlist:
+            self.scan_started = perf_counter_ns()
+            self.scan = dir_manager.startPlaylist(self.playlist, self.missing)
+            return
+
+        if self.saved:
+            self.restore(self.saved, dir_manager)
+        else:
+            # Songs are added page by page while the folder is scanned
+            self.scan_started = perf_counter_ns()
+            self.scan = dir_manager.startScan(self.path, self.dirs)
+
+        # Keeps the song list in sync with the folder without rescanning it.
+        # Deltas of a disc that isn't shown wait in the watcher until it is.
+        self.watcher = dir_manager.startWatch(self.path)
+
+        # Metadata indexed by earlier runs is searchable before it's loaded again
+        self.indexer.submit(self.index_known_titles)
+
+    def park(self) -> None:
+        """Stops the scan and the watcher of a disc that isn't shown or next
+        """
+        if not self.loaded or self.parked:
+            return
+        self.parked = True
+
+        if self.scan:
+            self.scan.cancel()
+            self.scan = None
+            self.partial = True
+
+        # Deltas it still holds are found again by the refresh on resume
+        if self.watcher:
+            self.watcher.stop()
+            self.watcher = None
+
+    def resume(self, dir_manager: DirectoryManager) -> None:
+        """Catches up on the changes made while the disc was parked, and watches it again
+
+        Args:
+            dir_manager (DirectoryManager): scanner and watcher settings
+        """
+        self.parked = False
+        content = self.contentraw["content"]
+
+        if self.playlist:
+            # Read again, songs already listed are skipped by add()
+            if self.partial:
+                self.partial = False
+                self.scan_started = perf_counter_ns()
+                self.scan = dir_manager.startPlaylist(self.playlist, self.missing)
+            return
+
+        # Changed directories are rescanned, like on a launch from a snapshot
+        if self.refresh is None:
+            dirs = self.dirs
+            if self.partial:
+                # The new scan lists every directory again, in self.dirs
+                dirs = dict(self.dirs)
+            self.refresh = LibraryRefresh(
+                self.path, list(content), dirs, dir_manager.extensions, dir_manager.recursive
+            )
+
+        # Songs the cancelled scan didn't reach, already listed ones are skipped by add()
+        if self.partial:
+            self.partial = False
+            self.scan_started = perf_counter_ns()
+            self.scan = dir_manager.startScan(self.path, self.dirs)
+
+        self.watcher = dir_manager.startWatch(self.path)
+
+    def restore(self, saved: dict, dir_manager: DirectoryManager) -> None:
+        """Lists the songs of the last run at once, only changed directories are rescanned
+
+        Args:
+            saved (dict): Disc.snapshot return format
+            dir_manager (DirectoryManager): scanner settings
+        """
+        self.saved = None
+        self.dirs = dict(saved["dirs"])
+
+        self.add(saved["content"])
+        self.queue.restore(saved["queue"])
+        self.currentpage = saved["page"]
+
+        # Shown until the metadata loader confirms them
+        self.pages.labels.update(saved["labels"])
+
+        self.refresh = LibraryRefresh(
+            self.path, saved["content"], self.dirs, dir_manager.extensions, dir_manager.recursive
+        )
+
+    def snapshot(self) -> dict | None:
+        """Returns what restore needs, None until the folder was fully listed
+        """
+        if not self.loaded or self.scan or self.refresh or self.playlist or self.partial:
+            return None
+
+        return {
+            "path": str(self.source),
+            "dirs": self.dirs,
+            "content": self.contentraw["content"],
+            "labels": self.pages.labels,
+            "queue": self.queue.state(),
+            "page": self.currentpage,
+        }
+
+    def song_name(self, file_path: str) -> str:
+        """Returns the name of a song file in contentraw
+
+        Args:
+            file_path (str): audio file path
+        """
+        if self.playlist:
+            return song_name(self.path, file_path)
+        return os.path.relpath(file_path, self.path)
+
+    def poll_missing(self) -> list[str]:
+        """Returns the playlist entries found missing since the last poll
+        """
+        missing = []
+        while self.missing:
+            missing.append(self.missing.popleft())
+
+        self.missing_count += len(missing)
+        return missing
+
+    def index_known_titles(self) -> None:
+        """Adds the titles and artists the metadata index knows to the search index
+        """
+        prefix_len = len(os.path.join(str(self.path), ""))
+
+        for song_path, title, artist in audio_scripts.get_metadata_index().titles_under(self.path):
+            self.search.add(song_path[prefix_len:], title, artist)
+
+    def index_song(self, name: str, metadata: dict | None) -> None:
+        """Makes a song's loaded title and artist searchable
+
+        Args:
+            name (str): file path relative to the disc's path
+            metadata (dict | None): get_audio_metadata format, None if unknown
+        """
+        if metadata and name in self.song_names:
+            self.indexer.submit(self.search.add, name, metadata['title'], metadata['artist'])
+
+    def add(self, names: list[str]) -> list[str]:
+        """Appends songs that aren't listed yet
+
+        Args:
+            names (list[str]): file paths relative to the disc's path
+
+        Returns:
+            list[str]: the songs that were actually new
+        """
+        # The watcher may have reported some of them already
+        names = [name for name in names if name not in self.song_names]
+        self.song_names.update(names)
+        self.contentraw["content"].extend(names)
+        self.queue.extend(len(names))
+        self.indexer.submit(self.search.add_files, names)
+
+        return names
+
+    def poll_scan(self) -> list[str]:
+        """Adds the songs found by the scan since the last poll
+
+        Returns:
+            list[str]: new songs, empty if there are none
+        """
+        if not self.scan:
+            return []
+
+        if names := self.scan.poll():
+            return self.add(names)
+
+        if self.scan.finished():
+            self.scan = None
+
+            metrics = get_metrics()
+            metrics.histogram("library_scan").record_since(self.scan_started)
+            metrics.counter("library_songs").inc(len(self.contentraw["content"]))
+
+        return []
+
+    def poll_deltas(self) -> list[Delta]:
+        """Returns the changes found by the refresh and the watcher since the last poll
+        """
+        deltas = []
+
+        if self.refresh:
+            deltas = self.refresh.poll()
+            if self.refresh.finished():
+                self.refresh = None
+
+        if self.watcher:
+            deltas += self.watcher.poll()
+
+        return deltas
+
+    def close(self) -> None:
+        """Stops the scan and the watcher
+        """
+        if self.scan:
+            self.scan.cancel()
+        if self.watcher:
+            self.watcher.stop()
+
+
+class DiscChanger():
+    def __init__(self, paths: list[str], dir_manager: DirectoryManager, options: Namespace,
+                 snapshot: dict | None = None) -> None:
+        """Holds the discs given on the command line
+
+        Args:
+            paths (list[str]): one folder or playlist file per disc
+            dir_manager (DirectoryManager): scanner and watcher settings
+            options (Namespace): parsed command-line arguments
+            snapshot (dict | None, optional): DiscChanger.snapshot of the last run. Defaults to None.
+        """
+        self.dir_manager: DirectoryManager = dir_manager
+        self.indexer: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="search-index")
+        self.options: Namespace = options
+        self.discs: list[Disc] = [Disc(Path(path), options, self.indexer) for path in paths]
+        self.index: int = 0
+        self.saved_player: dict | None = None
+
+        if snapshot and snapshot["settings"] == self.settings():
+            saved = {disc["path"]: disc for disc in snapshot["discs"]}
+            for disc in self.discs:
+                disc.saved = saved.get(str(disc.source))
+
+            # Same discs in the same order, the player goes back where it was
+            if snapshot["paths"] == [str(disc.source) for disc in self.discs]:
+                self.index = snapshot["index"]
+                self.saved_player = snapshot["player"]
+
+    def settings(self) -> list:
+        # Songs listed depend on these, a snapshot taken with others is ignored
+        return [sorted(self.dir_manager.extensions), self.dir_manager.recursive]
+
+    def snapshot(self, player: dict | None) -> dict:
+        """Returns the listed discs and the player state, as marshal-able data
+
+        Args:
+            player (dict | None): Interface.player_state return format
+        """
+        return {
+            "settings": self.settings(),
+            "paths": [str(disc.source) for disc in self.discs],
+            "index": self.index,
+            "discs": [saved for disc in self.discs if (saved := disc.snapshot())],
+            "player": player,
+        }
+
+    @property
+    def current(self) -> Disc:
+        return self.discs[self.index]
+
+    def upcoming(self) -> Disc | None:
+        """Returns the disc after the current one, None with a single disc
+        """
+        if len(self.discs) < 2:
+            return None
+        return self.discs[(self.index + 1) % len(self.discs)]
+
+    def select(self, index: int) -> Disc:
+        """Makes a disc the current one, loading it if needed
+
+        Args:
+            index (int): disc index, wraps around
+
+        Returns:
+            Disc: the selected disc
+        """
+        self.index = index % len(self.discs)
+        self.current.load(self.dir_manager)
+
+        # Only the shown disc and the next one are scanned and watched
+        upcoming = self.upcoming()
+        for disc in self.discs:
+            if disc is not self.current and disc is not upcoming:
+                disc.park()
+
+        return self.current
+
+    def insert(self, path: PosixPath) -> int:
+        """Adds a disc after the others, unless it's already in the changer
+
+        Args:
+            path (PosixPath): folder or playlist file
+
+        Returns:
+            int: index of the disc
+        """
+        for index, disc in enumerate(self.discs):
+            if disc.source == path:
+                return index
+
+        self.discs.append(Disc(path, self.options, self.indexer))
+        return len(self.discs) - 1
+
+    def close(self) -> None:
+        """Stops the scans and watchers of every disc
+        """
+        for disc in self.discs:
+            disc.close()
+        self.indexer.shutdown(wait=False, cancel_futures=True)
+
+
 class Interface(Entity):
     def __init__(self, memory: LocalTempMemory):
         """The main UI where songs are showerd
@@ -138,22 +688,53 @@ class Interface(Entity):
 
         # Mangers
         self.dir_manager: DirectoryManager = self.main_memory["dir_manager"]
+
+        if "sound_manager" not in self.main_memory:
+            self.main_memory["sound_manager"] = audio_scripts.SoundManager()
         self.soundmgr: audio_scripts.SoundManager = self.main_memory["sound_manager"]
-        
-        # Page-related variables
-        self.main_memory["currentpage"] = 0
-        self.buttons_buffer: list = []
 
-        # Engine Defintions
-        Text.default_resolution = 1080 * Text.size
+        # Full frame rate only while someone uses the player
+        if scheduler := self.main_memory.get("frame_scheduler"):
+            scheduler.is_playing = self.soundmgr.is_playing
+
+        # Library work may already be running since the loading screen
+        start_library_work(self.localmemory)
+
+        # User-facing latencies; rows of the current page still waiting for metadata
+        self.metrics = get_metrics()
+        self.unlabelled: set[str] = set()
+        self.interactive: bool = False
+
+        # Disc shown; its queue is shared by the buttons, the keyboard and auto-advance
+        self.changer: DiscChanger = self.main_memory["changer"]
+        self.disc: Disc = self.main_memory["disc"]
+        self.queue: PlayQueue = self.disc.queue
+
+        # Type-to-search; results replace the disc's songs in the song list
+        self.search_query: str | None = None
+        self.results: list[str] | None = None
+        self.results_version: int = 0
+        self.page_before_search: int = 0
+
+        # Results follow index changes at most options.hud_rate times per second
+        hud_rate = self.main_memory["options"].hud_rate
+        self.results_interval: float = 1 / hud_rate if hud_rate > 0 else 0
+        self.results_time: float = 0
+
+        # HUD state, time and progress refresh at options.hud_rate per second
+        self.hud: HudViewModel = HudViewModel(
+            refresh_rate=self.main_memory["options"].hud_rate
+        )
+
+        # Background metadata loading
+        self.metadata_loader: MetadataLoader = self.main_memory["metadata_loader"]
+
+        # Fonts per glyph resolution, shared with the loading screen
+        self.glyphs: GlyphCache = get_glyph_cache(self.main_memory)
 
         # Audio definitions
         self.dm = audio_scripts.DiscManager(localpath("assets/media/CD_SpinLoop.mp3"))
 
-        # Album-art definitions
-        current_album_image = Path(TARGET_PATH)
-        tmp_copy = copy_cover_to_local(current_album_image)
-
         # Entities
         self.background: Entity = Entity(
             model="quad",
@@ -193,11 +774,11 @@ class Interface(Entity):
         self.currentAlbumImage: Entity = Entity(
             model="quad",
             color=color.white,
-            texture='cover.jpg',
+            texture='assets/textures/default_albumart.png',
             z=-.01,
             x = -4.2,
             y = 1,
-            scale = 4.5,
+            scale = ALBUM_ART_SCALE,
         )
 
 
@@ -205,7 +786,6 @@ class Interface(Entity):
             "PLAYSTAR",
             parent=self,
             color=color.white,
-            font="assets/fonts/Audiowide/Audiowide-Regular.ttf",
             scale=15,
             position=(-6.5,3.9)
         )
@@ -240,7 +820,6 @@ class Interface(Entity):
         self.songTitle: Text = Text(
             "Song Title",
             parent=self,
-            font="assets/fonts/NotoSansJP/static/NotoSansJP-Light.ttf",
             scale=10,
             x=-1,
             y=-1.9
@@ -249,7 +828,6 @@ class Interface(Entity):
         self.songDescription: Text = Text(
             "Song Description",
             parent=self,
-            font="assets/fonts/NotoSansJP/static/NotoSansJP-Light.ttf",
             scale=10,
             x=-1,
             y=-2.65
@@ -258,7 +836,6 @@ class Interface(Entity):
         self.songTime: Text = Text(
             "00:00 / 00:00",
             parent=self,
-            font="assets/fonts/NotoSansJP/static/NotoSansJP-Light.ttf",
             scale=10,
             x=-5,
             y=-1.5
@@ -344,9 +921,32 @@ class Interface(Entity):
 
 
 
-        # Logic setup
-        if len(tmp_copy) <= 0:
-            self.enable_nocover_mode()
+        self.song_list: SongListView = SongListView(
+            parent=self,
+            on_select=self.row_selected
+        )
+
+        self.search_text: Text = Text(
+            "",
+            parent=self,
+            scale=10,
+            x=-1,
+            y=3.5,
+            enabled=False
+        )
+
+
+        # The logo is drawn half as large again as the other texts
+        self.glyphs.apply(self.top_logo, "assets/fonts/Audiowide/Audiowide-Regular.ttf", self.glyphs.resolution * 3 // 2)
+        for text in (self.songTitle, self.songDescription, self.songTime, self.search_text):
+            self.glyphs.apply(text, "assets/fonts/NotoSansJP/static/NotoSansJP-Light.ttf")
+        for row in self.song_list.rows:
+            self.glyphs.apply(row.text_entity, "assets/fonts/NotoSansJP/static/NotoSansJP-Light.ttf")
+
+
+        # Album-art definitions, covers are decoded at the size they're shown
+        self.art_loader: AlbumArtLoader = self.main_memory["art_loader"]
+        self.art_sources: list = []
 
 
         # Post Entity definitions
@@ -365,18 +965,65 @@ class Interface(Entity):
 
         ## Define button functions
         self.play_btn.on_click = self.play_clicked
-        self.main_memory["songs_dir"] = Path(TARGET_PATH)
-        self.main_memory["contentraw"] = self.dir_manager.getDirContent(
-            self.main_memory["songs_dir"]
-        )
+
+        # Songs found so far; the rest keeps streaming from the scan
+        self.song_names: set[str] = self.disc.song_names
 
         # Define update functions
         self.cd_r.update = self.update_cd_entity
-        self.play_btn.update = self.update_play_btn
 
         # Run unction to create buttons based on folder contents
-        self.render_dir(raw=self.main_memory["contentraw"])
+        self.load_disc(self.disc)
+
+        # Back to the song of the last run; the library and player are saved on exit
+        self.restore_player(self.main_memory.pop("saved_player", None))
+        if not self.main_memory["options"].no_snapshot:
+            atexit.register(self.save_snapshot)
+
+        # Remote commands, refused by the server until now
+        self.control: ControlServer | None = self.main_memory.get("control_server")
+        if self.control:
+            self.control.handlers.update(self.control_handlers())
+
+
+    def show_album_art(self, song: PosixPath | None = None) -> None:
+        """Shows the cover of a song, trying its folder's cover file, its embedded
+        picture and the library's cover, in that order
+
+        Args:
+            song (PosixPath | None, optional): song path, None for the library's cover
+        """
+        sources = []
+        if song:
+            sources.append((self.art_loader.request_folder, song.parent))
+            sources.append((self.art_loader.request_track, song))
+        sources.append((self.art_loader.request_folder, self.main_memory["songs_dir"]))
+
+        if sources == self.art_sources:
+            return
+
+        self.art_sources = sources
+        request, target = sources[0]
+        request(target, partial(self.set_album_art, sources, 0))
+
+    def set_album_art(self, sources: list, i: int, texture: Texture | None) -> None:
+        """AlbumArtLoader callback of show_album_art
 
+        Args:
+            sources (list): art sources of the song being shown
+            i (int): index of the source that answered
+            texture (Texture | None): decoded cover, None if the source has none
+        """
+        if sources is not self.art_sources:
+            return
+
+        if texture:
+            self.currentAlbumImage.texture = texture
+        elif i + 1 < len(sources):
+            request, target = sources[i + 1]
+            request(target, partial(self.set_album_art, sources, i + 1))
+        else:
+            self.enable_nocover_mode()
 
     def enable_nocover_mode(self) -> None:
         """Disables dynamic album-art. Sets currentAlbumImage.texture to a defualt one
@@ -387,25 +1034,18 @@ class Interface(Entity):
     def play_clicked(self) -> None:
         """Manages what to do when 'play' button is pressed
         """
-
-        vlc_state: vlc.State = vlc.State
-        current_state: vlc.State = self.soundmgr.current_song.get_state()
-
-        match current_state:
-            case vlc_state.Paused:
-                self.soundmgr.current_song.play()
-            case vlc_state.Playing:
-                self.soundmgr.current_song.pause()
-            case _:
-                return
+        # Nothing loaded on this disc yet, start it
+        if self.soundmgr.current_song_name is None:
+            self.skipSong()
+        else:
+            self.soundmgr.toggle_pause()
 
             
     def nextPage(self) -> None:
         """Change's the current_page to the next one.
         """
+        self.metrics.begin("page_flip")
         self.main_memory["currentpage"] += 1
-
-        self.destroySonglist()
         self.render_dir(self.main_memory["contentraw"])
     
     def prevPage(self) -> None:
@@ -414,158 +1054,675 @@ class Interface(Entity):
         cpage = self.main_memory["currentpage"]
 
         if cpage > 0:
+            self.metrics.begin("page_flip")
             self.main_memory["currentpage"] -= 1
-            self.destroySonglist()
             self.render_dir(self.main_memory["contentraw"])
 
     def prevSong(self) -> None:
         """Change's the current song to the previous one
         """
-        curr_song: str = self.soundmgr.current_song_name
-        raw_path: PosixPath = self.main_memory["contentraw"]["path"]
-        content: list = self.main_memory["contentraw"]["content"]
+        index = self.queue.prev()
 
-        if curr_song == None:
-            return
-        
-        # Locate current song
-        if cindex := content.index(curr_song) >= 0:
-            self.soundmgr.playsong(
-                str(
-                    raw_path / content[cindex-1]
-                ),
-                content[cindex-1]
-            )
-            
+        if index is not None:
+            self.play_index(index)
 
-    def skipSong(self) -> None:
+    def skipSong(self, auto: bool = False) -> None:
         """Change's the current song to the next one
+
+        Args:
+            auto (bool, optional): the current song ended by itself. Defaults to False.
         """
-        curr_song = self.soundmgr.current_song_name
-        raw_path: PosixPath = self.main_memory["contentraw"]["path"]
-        content = self.main_memory["contentraw"]["content"]
-    
-        if curr_song == None:
-            return
-        
-        self.progress_bar.value = 0 # Resets progress bar
-
-        # Locate current song
-        cindex = content.index(curr_song)
-
-        if cindex <= len(content):
-            self.soundmgr.playsong(
-                str(
-                    raw_path / content[(
-                        cindex+1 if cindex < len(content)-1 else 0
-                    )]
-                ),
-                content[(
-                    cindex+1 if cindex < len(content)-1 else 0
-                )]
-            )        
+        index = self.queue.next(auto)
+
+        if index is not None:
+            self.play_index(index)
 
     def render_dir(self, raw: dict) -> None:
-        """Gets the directory and render disponible songs as clickable buttons
+        """Binds the song list rows to the current page
+
+        Rows show file names until the metadata loader delivers their titles.
+        Neighbour pages are prefetched.
 
         Args:
             raw (dict): takes DirectoryManager.getDirContent return format.
         """
 
         firstpath = raw["path"]
-        content = raw["content"]
+        content = raw["content"] if self.results is None else self.results
         current_page = self.main_memory["currentpage"]
+        pages = self.disc.pages
 
-        if len(content) > 5 and current_page == 0:
-            self.nextpage_btn.enabled = True
-        
-        if current_page > 0:
-            self.prevpage_btn.enabled = True
-        else:
-            self.prevpage_btn.enabled = False
-        
+        start, rows, has_next = pages.page(content, current_page)
+        end = start + len(rows)
 
-        start = current_page * 5
-        end = start + 5
-        
-        current_content = content[start:end]
+        self.nextpage_btn.enabled = has_next
+        self.prevpage_btn.enabled = current_page > 0
 
-        for i in range(5):
-            try:
+        self.song_list.bind(start, [(str(firstpath / name), label) for name, label in rows])
 
-                # Verifies if file has title in metadata
-                new_title = current_content[i]
-                mt = audio_scripts.get_audio_metadata(
-                    str(firstpath / current_content[i])
-                )
+        # A page flip ends when every row shows its metadata title
+        untitled = [str(firstpath / name) for name, _ in rows if name not in pages.titled]
+        self.unlabelled = set(untitled)
+        for song_path in untitled:
+            self.metadata_loader.request(song_path, self.label_song)
 
-                if mt != None:
-                    if name := mt['title']:
-                        new_title = name
-                    else:
-                        new_title = current_content[i]
-                    
-                # Verify title length to cut case it's too long
-                if len(new_title) > 12:
-                    new_title = new_title[:15] + '...'
-                
-
-                # Creates the button
-                newb = Button(
-                    parent=self, 
-                    scale_y=.7, 
-                    scale_x=7.5, 
-                    text=f'{new_title}',
-                    origin_y=-3.05, 
-                    origin_x=-.33, 
-                    y=.5-(i*.8), 
-                    collider='box'
-                )
+        if not self.unlabelled:
+            self.metrics.end("page_flip")
 
-                # Edit button's text config
-                newb.text_entity.font = "assets/fonts/NotoSansJP/static/NotoSansJP-Light.ttf"
-                newb.text_entity.wordwrap = 30
-                newb.text_entity.line_height = .01
-                newb.text_entity.scale = (1.4, 15)
-                newb.text_entity.origin = (0, -50)
-                
-                # Edit button config and function
-                newb.color = color.rgba(1, 1, 1, .01)
-                newb.highlight_color = color.rgba(.149,.149,1, .4)
-                newb._on_click = Func(
-                    self.soundmgr.playsong, 
-                    str(firstpath / current_content[i]),
-                    current_content[i]
-                )
-                self.buttons_buffer.append(newb)
+        # Warm up the pages next to this one
+        size = pages.page_size
+        neighbours = content[max(start - size, 0):start] + content[end:end + size]
+        self.metadata_loader.prefetch([str(firstpath / name) for name in neighbours if name not in pages.titled])
 
-                
-            except IndexError:
-                # Disable the next_page button case it doesn't have enough files to a new page
-                print(f"Index out of range: {i}")
-                self.nextpage_btn.enabled = False
-    
-    
-    def destroySonglist(self):
-        """This function destroys the music selection buttons to render the next page
+    def add_songs(self, names: list[str]) -> None:
+        """Appends newly found songs, re-rendering only if the current page changes
+
+        Args:
+            names (list[str]): file paths relative to contentraw's path
+        """
+        self.show_added_songs(self.disc.add(names))
+
+    def show_added_songs(self, names: list[str]) -> None:
+        """Re-renders the current page if songs appended to the disc change it
+
+        Args:
+            names (list[str]): songs just appended to contentraw's content
+        """
+        # Search results are refreshed when the index catches up
+        if not names or self.results is not None:
+            return
+
+        content = self.main_memory["contentraw"]["content"]
+        old_len = len(content) - len(names)
+
+        # Rows or the next-page button of the visible page depend on the new songs
+        if old_len <= (self.main_memory["currentpage"] + 1) * self.disc.pages.page_size:
+            self.render_dir(self.main_memory["contentraw"])
+
+    def apply_library_deltas(self, deltas: list[Delta]) -> None:
+        """Applies watcher deltas to the song list and the metadata index
+
+        Args:
+            deltas (list[Delta]): LibraryWatcher.poll return format
+        """
+        raw = self.main_memory["contentraw"]
+        content: list = raw["content"]
+        added: dict[str, None] = {}
+        renamed: dict[str, str] = {}
+
+        # Song indices, built on the first removal or rename of the batch.
+        # Removed songs are only dropped from content once, after the batch.
+        positions: dict[str, int] | None = None
+        gone: set[int] = set()
+
+        pending = deque(deltas)
+        while pending:
+            kind, name, new_name = pending.popleft()
+
+            if kind == RENAMED and (name not in self.song_names or new_name in self.song_names or new_name in added):
+                # Moved over a listed song (saved through a temporary file), or from an unlisted name
+                pending.extendleft([(ADDED, new_name, None), (REMOVED, name, None)])
+                continue
+
+            if kind in (REMOVED, RENAMED, REMOVED_TREE, RESCANNED) and positions is None:
+                positions = {x: i for i, x in enumerate(content)}
+
+            if kind in (ADDED, MODIFIED, LISTED):
+                if kind == LISTED:
+                    self.disc.listed.add(name)
+
+                if name in self.song_names:
+                    # Rewritten or replaced in place; a rescan only lists it again
+                    if kind != LISTED:
+                        self.forget_metadata(name)
+                else:
+                    added[name] = None
+
+            elif kind == REMOVED:
+                if name in added:
+                    del added[name]
+                elif name in self.song_names:
+                    gone.add(positions.pop(name))
+                    self.song_names.discard(name)
+                    self.forget_metadata(name)
+                    self.disc.indexer.submit(self.disc.search.remove, name)
+
+            elif kind == RENAMED:
+                index = positions.pop(name)
+                content[index] = new_name
+                positions[new_name] = index
+
+                self.song_names.discard(name)
+                self.song_names.add(new_name)
+                self.forget_metadata(name)
+                renamed[name] = new_name
+                self.disc.indexer.submit(self.disc.search.rename, name, new_name)
+
+                if self.soundmgr.current_song_name == name:
+                    self.soundmgr.current_song_name = new_name
+
+            else:
+                # REMOVED_TREE, or RESCANNED: whatever the rescan didn't list
+                prefix = os.path.join(name, "") if name else ""
+                listed = self.disc.listed if kind == RESCANNED else set()
+
+                pending.extendleft(
+                    (REMOVED, x, None) for x in list(positions) + list(added)
+                    if x.startswith(prefix) and x not in listed
+                )
+                if kind == RESCANNED:
+                    self.disc.listed = set()
+
+        if gone:
+            mapping: list[int | None] = [None] * len(content)
+            kept = []
+            for index, x in enumerate(content):
+                if index not in gone:
+                    mapping[index] = len(kept)
+                    kept.append(x)
+            content[:] = kept
+
+            self.queue.remap(mapping, len(content))
+
+        if gone or renamed:
+            self.preload_next()
+
+        # Results keep pointing at renamed songs until the index catches up
+        if self.results is not None:
+            self.results = [
+                new_name for new_name in (renamed.get(name, name) for name in self.results)
+                if new_name in self.song_names
+            ]
+            content = self.results
+
+        # Stay on the last page if the current one doesn't exist anymore
+        last_page = self.disc.pages.page_count(len(content)) - 1
+        self.main_memory["currentpage"] = min(self.main_memory["currentpage"], last_page)
+
+        if added:
+            self.add_songs(list(added))
+        self.render_dir(raw)
+
+    def report_missing(self, entries: list[str]) -> None:
+        """Logs playlist entries that aren't files and tells control subscribers
+
+        Args:
+            entries (list[str]): entries as written in the playlist
+        """
+        get_metrics().counter("playlist_missing").inc(len(entries))
+        log.warning(
+            "%s: %d entries not found, e.g. %s",
+            self.disc.source, len(entries), ", ".join(entries[:3])
+        )
+        for entry in entries:
+            log.debug("Not found: %s", entry)
+
+        if self.control:
+            self.control.publish("missing", {
+                "playlist": str(self.disc.source), "count": len(entries), "entries": entries[:100]
+            })
+
+    def forget_metadata(self, name: str) -> None:
+        """Drops cached metadata of a changed or removed song
+
+        Args:
+            name (str): file path relative to contentraw's path
+        """
+        song_path = str(self.main_memory["contentraw"]["path"] / name)
+        self.disc.pages.forget(name)
+
+        # The metadata index checks size and mtime itself, only memory caches are dropped
+        self.metadata_loader.forget(song_path)
+        self.art_loader.forget(song_path)
+
+    def label_song(self, file_path: str, metadata: dict | None) -> None:
+        """Replaces a song row's file name with its metadata title
+
+        Args:
+            file_path (str): audio file path
+            metadata (dict | None): loaded metadata
+        """
+        name = self.disc.song_name(file_path)
+
+        # Callbacks of a disc that isn't shown anymore are dropped
+        if name in self.song_names:
+            self.song_list.set_label(file_path, self.disc.pages.set_metadata(name, metadata))
+            self.disc.index_song(name, metadata)
+
+        if file_path in self.unlabelled:
+            self.unlabelled.discard(file_path)
+            if not self.unlabelled:
+                self.metrics.end("page_flip")
+
+    def changeDisc(self, offset: int) -> None:
+        """Switches to another disc of the changer, reusing every entity
+
+        Args:
+            offset (int): discs to move, 1 for the next one, -1 for the previous one
+        """
+        if len(self.changer.discs) < 2:
+            return
+
+        self.select_disc(self.changer.index + offset)
+
+    def select_disc(self, index: int) -> None:
+        """Stops the current disc and shows another one
+
+        Args:
+            index (int): disc index in the changer
+        """
+        # The song belongs to the old disc, nothing of it stays in the player state
+        self.soundmgr.unload()
+        self.close_search()
+        self.disc.currentpage = self.main_memory["currentpage"]
+        self.load_disc(self.changer.select(index))
+
+    def open_disc(self, path: PosixPath) -> None:
+        """Adds a folder or playlist to the changer and switches to it
+
+        Args:
+            path (PosixPath): folder or playlist file
+        """
+        index = self.changer.insert(path)
+        if index != self.changer.index:
+            self.select_disc(index)
+
+    def load_disc(self, disc: Disc) -> None:
+        """Shows a disc in the song list and starts loading the one after it
+
+        Args:
+            disc (Disc): loaded disc
+        """
+        self.disc = disc
+        self.queue = disc.queue
+        self.song_names = disc.song_names
+        use_disc(self.main_memory, disc)
+
+        # Next starts the disc, or goes on from its last song
+        self.queue.rewind()
+
+        log.info("Disc %d/%d: %s", self.changer.index + 1, len(self.changer.discs), disc.source)
+
+        # Found songs are shown now, the rest streams in
+        disc.poll_scan()
+        self.show_album_art()
+        self.render_dir(disc.contentraw)
+
+        if upcoming := self.changer.upcoming():
+            upcoming.load(self.dir_manager)
+
+    def warm_disc(self, disc: Disc) -> None:
+        """Requests the first page's metadata and the cover of a disc about to be shown
+
+        Args:
+            disc (Disc): loaded disc
+        """
+        disc.warmed = True
+
+        self.metadata_loader.prefetch([str(disc.path / name) for name in disc.contentraw["content"][:5]])
+        self.art_loader.request_folder(disc.path, lambda texture: None)
+
+    def row_selected(self, index: int) -> None:
+        """Plays the song of a clicked row
+
+        Args:
+            index (int): index in the list shown, search results while searching
+        """
+        if self.results is None:
+            self.select_song(index)
+            return
+
+        # The song may have been removed since the results were shown
+        try:
+            self.select_song(self.main_memory["contentraw"]["content"].index(self.results[index]))
+        except (IndexError, ValueError):
+            pass
+
+    def open_search(self) -> None:
+        """Starts type-to-search with an empty query, which lists every song
+        """
+        self.search_query = ""
+        self.page_before_search = self.main_memory["currentpage"]
+        self.search_text.enabled = True
+        self.set_search_query("")
+
+    def set_search_query(self, query: str) -> None:
+        """Shows the songs matching a query from the first page
+
+        Args:
+            query (str): typed text
+        """
+        self.search_query = query
+        self.search_text.text = f"Search: {query}_"
+        self.main_memory["currentpage"] = 0
+        self.refresh_results()
+
+    def refresh_results(self) -> None:
+        """Re-runs the query on the search index and renders the results
+        """
+        search = self.disc.search
+        self.results_version = search.version
+        self.results_time = perf_counter()
+
+        if self.search_query.strip():
+            # The index may list songs of earlier runs that aren't on the disc anymore
+            self.results = [name for name in search.search(self.search_query) if name in self.song_names]
+        else:
+            self.results = list(self.main_memory["contentraw"]["content"])
+
+        last_page = self.disc.pages.page_count(len(self.results)) - 1
+        self.main_memory["currentpage"] = min(self.main_memory["currentpage"], last_page)
+        self.render_dir(self.main_memory["contentraw"])
+
+    def close_search(self) -> None:
+        """Goes back to the disc's songs, on the page shown before searching
+        """
+        if self.search_query is None:
+            return
+
+        self.search_query = None
+        self.results = None
+        self.search_text.enabled = False
+        self.main_memory["currentpage"] = self.page_before_search
+        self.render_dir(self.main_memory["contentraw"])
+
+    def search_input(self, key: str) -> bool:
+        """Edits the query while searching
+
+        Args:
+            key (str): ursina key name
+
+        Returns:
+            bool: True if the key was used
+        """
+        match key:
+            case "escape":
+                self.close_search()
+            case "backspace":
+                self.set_search_query(self.search_query[:-1])
+            case "space":
+                self.set_search_query(self.search_query + " ")
+            case _ if len(key) == 1:
+                self.set_search_query(self.search_query + key)
+            case _:
+                # Arrows and page keys keep working on the results
+                return False
+
+        return True
+
+    def player_state(self) -> dict | None:
+        """Returns the current song, position and volume, None if nothing was played
+        """
+        if self.soundmgr.current_song_name is None:
+            return None
+
+        return {
+            "song": self.soundmgr.current_song_name,
+            "time": max(self.soundmgr.current_time, 0),
+            "volume": self.soundmgr.current_volume,
+            "playing": self.soundmgr.is_playing(),
+        }
+
+    def restore_player(self, saved: dict | None) -> None:
+        """Loads the song of the last run where it was, playing or paused
+
+        Args:
+            saved (dict | None): player_state return format
+        """
+        if not saved:
+            return
+
+        raw = self.main_memory["contentraw"]
+        try:
+            index = raw["content"].index(saved["song"])
+        except ValueError:
+            return
+
+        if saved["volume"] >= 0:
+            self.soundmgr.current_volume = saved["volume"]
+
+        self.queue.select(index)
+        self.soundmgr.playsong(
+            str(raw["path"] / saved["song"]), saved["song"],
+            start_ms=saved["time"], paused=not saved["playing"]
+        )
+        self.preload_next()
+
+    def save_snapshot(self) -> None:
+        """Saves the discs and the player for the next launch
+        """
+        self.disc.currentpage = self.page_before_search if self.search_query is not None else self.main_memory["currentpage"]
+        save_snapshot(self.changer.snapshot(self.player_state()))
+
+    def control_state(self) -> dict:
+        """Returns what the control socket reports as the player state
+        """
+        if self.soundmgr.is_playing():
+            state = "playing"
+        elif self.soundmgr.is_paused():
+            state = "paused"
+        else:
+            state = "stopped"
+
+        return {
+            "state": state,
+            "song": self.soundmgr.current_song_name,
+            "title": self.soundmgr.current_song_title,
+            "artist": self.soundmgr.current_song_artist,
+            "time": self.soundmgr.current_time,
+            "length": self.soundmgr.current_length,
+            "volume": self.soundmgr.current_volume,
+            "shuffle": self.queue.shuffled,
+            "repeat": self.queue.repeat,
+            "disc": self.changer.index,
+            "path": str(self.disc.source),
+            "missing": self.disc.missing_count,
+        }
+
+    def control_handlers(self) -> dict[str, Callable[[dict], Any]]:
+        """Returns the control socket commands, see ControlServer for the protocol
+        """
+        return {
+            "state": lambda request: self.control_state(),
+            "subscribe": lambda request: self.control_state(),
+            "play": self.control_play,
+            "pause": self.control_pause,
+            "toggle": lambda request: self.play_clicked(),
+            "next": lambda request: self.skipSong(),
+            "prev": lambda request: self.prevSong(),
+            "seek": self.control_seek,
+            "volume": self.control_volume,
+            "queue": self.control_queue,
+            "open": self.control_open,
+        }
+
+    def control_open(self, request: dict) -> int:
+        """Switches to {"path": folder or playlist}, adding it to the changer
+
+        Args:
+            request (dict): control request
+
+        Returns:
+            int: disc index
+        """
+        if not isinstance(request.get("path"), str):
+            raise ControlError("open needs a path")
+
+        path = Path(request["path"]).expanduser()
+        if not (path.is_dir() or (is_playlist(path) and path.is_file())):
+            raise ControlError(f"not a folder or playlist: {request['path']}")
+
+        self.open_disc(path)
+        return self.changer.index
+
+    def control_play(self, request: dict) -> None:
+        """Plays {"song": name} or {"index": i} of the disc, or resumes without either
+
+        Args:
+            request (dict): control request
+        """
+        content = self.main_memory["contentraw"]["content"]
+
+        if "song" in request:
+            try:
+                index = content.index(request["song"])
+            except ValueError:
+                raise ControlError(f"no song named {request['song']!r}")
+        elif "index" in request:
+            index = request["index"]
+            if not isinstance(index, int) or not 0 <= index < len(content):
+                raise ControlError(f"index out of range: {index!r}")
+        elif self.soundmgr.is_paused():
+            self.play_clicked()
+            return
+        elif self.soundmgr.is_playing():
+            return
+        elif content:
+            # Stopped or nothing played yet
+            index = self.queue.current if self.queue.current is not None else 0
+        else:
+            raise ControlError("no songs on this disc")
+
+        self.select_song(index)
+
+    def control_pause(self, request: dict) -> None:
+        """Pauses a playing song, does nothing otherwise
+
+        Args:
+            request (dict): control request
+        """
+        if self.soundmgr.is_playing():
+            self.play_clicked()
+
+    def control_seek(self, request: dict) -> int:
+        """Moves the current song to {"time": ms}
+
+        Args:
+            request (dict): control request
+
+        Returns:
+            int: position seeked to, in ms
+        """
+        time_ms = request.get("time")
+        if not isinstance(time_ms, (int, float)):
+            raise ControlError("seek needs a time in ms")
+
+        if not self.soundmgr.seek(int(time_ms)):
+            raise ControlError("nothing is playing")
+
+        return self.soundmgr.current_time
+
+    def control_volume(self, request: dict) -> int:
+        """Sets {"value": 0-100} or changes the volume {"by": step}
+
+        Args:
+            request (dict): control request
+
+        Returns:
+            int: the new volume
+        """
+        if isinstance(request.get("value"), (int, float)):
+            return self.soundmgr.set_volume(int(request["value"]))
+        if isinstance(request.get("by"), (int, float)):
+            return self.soundmgr.set_volume(max(self.soundmgr.current_volume, 0) + int(request["by"]))
+
+        raise ControlError("volume needs a value or a step (by)")
+
+    def control_queue(self, request: dict) -> dict:
+        """Returns the current song and the {"count": n} songs after it
+
+        Args:
+            request (dict): control request
+
+        Returns:
+            dict: current song and upcoming songs, as names of the disc
+        """
+        count = request.get("count", 10)
+        if not isinstance(count, int) or count < 0:
+            raise ControlError(f"bad count: {count!r}")
+
+        content = self.main_memory["contentraw"]["content"]
+        current = self.queue.current
+
+        return {
+            "current": content[current] if current is not None else None,
+            "upcoming": [content[index] for index in self.queue.upcoming(min(count, 1000))],
+        }
+
+    def select_song(self, index: int) -> None:
+        """Plays the song at a library index
+
+        Args:
+            index (int): index in contentraw's content
+        """
+        self.play_index(self.queue.select(index))
+
+    def play_index(self, index: int) -> None:
+        """Plays the song at a library index without moving the queue
+
+        Args:
+            index (int): index in contentraw's content
+        """
+        raw = self.main_memory["contentraw"]
+        name = raw["content"][index]
+        self.soundmgr.playsong(str(raw["path"] / name), name)
+        self.preload_next()
+
+    def preload_next(self) -> None:
+        """Opens the song the queue plays next in the idle player
         """
-        for btn in self.buttons_buffer:
-            destroy(btn)
+        index = self.queue.peek_next()
+        if index is None:
+            # Nothing may start by itself when the current song ends
+            self.soundmgr.preload(None)
+            return
+
+        raw = self.main_memory["contentraw"]
+        self.soundmgr.preload(str(raw["path"] / raw["content"][index]))
+
+    def input(self, key: str) -> None:
+        """Keyboard shortcuts, sharing the queue with the buttons
+
+        Args:
+            key (str): ursina key name
+        """
+        if self.search_query is not None and self.search_input(key):
+            return
+
+        match key:
+            case "/":
+                self.open_search()
+            case "right arrow":
+                self.skipSong()
+            case "left arrow":
+                self.prevSong()
+            case "space":
+                self.play_clicked()
+            case "s":
+                self.queue.set_shuffle(not self.queue.shuffled)
+                self.preload_next()
+            case "r":
+                self.queue.cycle_repeat()
+                self.preload_next()
+            case "page down":
+                self.changeDisc(1)
+            case "page up":
+                self.changeDisc(-1)
 
     def update_cd_entity(self):
-        """Spinning CD Entity update
+        """Spinning CD Entity update, the disc rests while nothing plays
         """
-        self.cd_r.rotation_z += 300 * time.dt
+        if self.soundmgr.is_playing():
+            self.cd_r.rotation_z += 300 * time.dt
     
 
     def update_play_btn(self):
         """Updates play button
         """
-        current_song_state: vlc.State = self.soundmgr.current_song.get_state()
-        if current_song_state == vlc.State.Playing:
+        if self.soundmgr.is_playing():
             self.play_btn.texture = "assets/textures/pause_btn.png"
 
-        elif current_song_state == vlc.State.Paused:
+        else:
             self.play_btn.texture = "assets/textures/play_btn_white.png"
 
 
@@ -573,60 +1730,150 @@ class Interface(Entity):
         """Ursina Update for the main Entity
         """
         
-        # Updates volume bar
-        self.volume_bar.value = (self.volume_bar.value * 0) + self.soundmgr.current_volume
-        self.volume_bar.bar.texture_scale = (self.volume_bar.value/100, 1)
+        # First frame the player can be used
+        if not self.interactive:
+            self.interactive = True
+            interactive_time = perf_counter() - LAUNCH_TIME
+            self.metrics.histogram("launch_to_interactive").record(interactive_time * 1e6)
+            log.info("Interactive after %.3fs", interactive_time)
+
+        # Streams songs of a running library scan
+        self.show_added_songs(self.disc.poll_scan())
+
+        # Applies files added, removed or renamed since the scan or the last run
+        if deltas := self.disc.poll_deltas():
+            self.apply_library_deltas(deltas)
+
+        # Playlist entries that aren't files are reported, the others still play
+        if missing := self.disc.poll_missing():
+            self.report_missing(missing)
+
+        # Songs indexed since the last search may match it. A scan changes the
+        # index almost every frame, so the results follow it at the HUD rate.
+        if (self.search_query is not None and self.disc.search.version != self.results_version
+                and perf_counter() - self.results_time >= self.results_interval):
+            self.refresh_results()
+
+        # The next disc is scanned in the background, with its first page warmed up
+        if (upcoming := self.changer.upcoming()) and upcoming.loaded:
+            upcoming.poll_scan()
+            if not upcoming.warmed and (len(upcoming.contentraw["content"]) >= 5 or not upcoming.scan):
+                self.warm_disc(upcoming)
+
+        # Time and track advance are driven by libvlc events
+        _, end_reached = self.soundmgr.poll_events()
+
+        if end_reached:
+            self.skipSong(auto=True)
+
+        curr_time = self.soundmgr.current_time
+        length = self.soundmgr.current_length
+
+        # Only widgets whose value changed are touched
+        changes = self.hud.changes({
+            "song": self.soundmgr.current_song_name,
+            "volume": self.soundmgr.current_volume,
+            "title": self.soundmgr.current_song_title,
+            "artist": self.soundmgr.current_song_artist,
+            "state": self.soundmgr.current_state,
+            "time": (curr_time // 1000, length // 1000),
+            "progress": round(100 * curr_time / length, 1) if length > 0 and curr_time >= 0 else 0,
+        }, time.dt)
+
+        if changes:
+            self.apply_hud(changes)
+
+            # Subscribed clients see what the HUD shows, at its rate
+            if self.control:
+                self.control.publish("state", {"state": self.control_state()})
+
+    def apply_hud(self, changes: dict[str, Any]) -> None:
+        """Applies HudViewModel changes to the widgets
+
+        Args:
+            changes (dict[str, Any]): changed fields returned by HudViewModel.changes
+        """
+        if changes.get("song"):
+            self.show_album_art(self.main_memory["songs_dir"] / changes["song"])
+        elif "song" in changes:
+            # Unloaded by a disc switch
+            self.songTime.text = ""
+
+        if "volume" in changes:
+            self.volume_bar.value = changes["volume"]
+            self.volume_bar.bar.texture_scale = (self.volume_bar.value/100, 1)
 
         # Updates the title and description labels
-        self.songTitle.text = self.soundmgr.current_song_title
-        self.songDescription.text = self.soundmgr.current_song_artist
-        
-        length = self.soundmgr.current_song.get_length()
-        curr_time = self.soundmgr.current_song.get_time()
+        if "title" in changes:
+            self.songTitle.text = changes["title"] or ""
 
-        if length != -1 and curr_time != -1:
-            l_seconds = int((length)/1000 % 60)         # Remaining Seconds (ms to sec)
-            l_minutes = int((length)/(1000*60)%60)      # Remaining Minutes (ms to min)
-            
-            ct_seconds = int((curr_time)/1000 % 60)     # Current Seconds   (ms to sec)
-            ct_minutes = int((curr_time)/(1000*60)%60)  # Current Minutes   (ms to min)
-            
-            # Update songTime text (XX:XX / XX:XX)
-            time_text = (
-                f'{ct_minutes:02d}:{ct_seconds:02d}'
-                '/'
-                f'{l_minutes:02d}:{l_seconds:02d}'
-            )
+        if "artist" in changes:
+            self.songDescription.text = changes["artist"] or ""
 
-            self.songTime.text = time_text
+        if "state" in changes:
+            self.update_play_btn()
 
-            # Update progress bar
-            try:
-                self.progress_bar.value = (self.progress_bar.value * 0) \
-                                          +(100 * curr_time) / length
-            except ZeroDivisionError:
-                pass
-            
-            # Verify if seconds and minutes are the same to skip song
-            equals_minutes: bool = int(ct_minutes) == int(l_minutes)
-            equals_seconds: bool = int(ct_seconds) == int(l_seconds)
+        if "time" in changes:
+            self.update_song_time(*changes["time"])
+
+        if "progress" in changes:
+            self.progress_bar.value = changes["progress"]
+
+    def update_song_time(self, curr_time: int, length: int) -> None:
+        """Updates the time label
+
+        Args:
+            curr_time (int): current playback time in seconds
+            length (int): song length in seconds, negative if unknown
+        """
+        if length < 0 or curr_time < 0:
+            return
+
+        l_seconds = length % 60                 # Remaining Seconds
+        l_minutes = length // 60 % 60           # Remaining Minutes
+        
+        ct_seconds = curr_time % 60             # Current Seconds
+        ct_minutes = curr_time // 60 % 60       # Current Minutes
+        
+        # Update songTime text (XX:XX / XX:XX)
+        time_text = (
+            f'{ct_minutes:02d}:{ct_seconds:02d}'
+            '/'
+            f'{l_minutes:02d}:{l_seconds:02d}'
+        )
 
-            if equals_minutes and equals_seconds:
-                if ct_minutes != 0 and ct_seconds != 0:
-                    self.skipSong()
+        self.songTime.text = time_text
 
 
 class LoadDiscInterface(Entity):
-    def __init__(self, memory: LocalTempMemory) -> None:
+    def __init__(self, memory: LocalTempMemory, min_time: float = 11.0) -> None:
         """'Loading' interface
 
+        The library scan, the first page's metadata, the cover art and the audio
+        backends are loaded while it is shown. It switches to Interface as soon
+        as that work is done and at least min_time seconds passed.
+
         Args:
             memory (LocalTempMemory): main local memory class to store and read data
+            min_time (float, optional): minimum seconds of intro animation. Defaults to 11.0.
         """
         super().__init__()
 
 
         self.memory = memory
+        self.min_time: float = min_time
+        self.elapsed: float = 0
+        self.pending: int = 0
+        self.first_page_requested: bool = False
+
+        # Background startup work
+        self.backends_thread: threading.Thread = threading.Thread(
+            target=audio_scripts.load_backends,
+            name="load-backends",
+            daemon=True
+        )
+        self.backends_thread.start()
+        start_library_work(self.memory)
 
         self.background: Entity = Entity(
             parent=self,
@@ -655,7 +1902,6 @@ class LoadDiscInterface(Entity):
         )
         self.loading_text: Text = Text(
             "Loading",
-            font="assets/fonts/NotoSansJP/static/NotoSansJP-Bold.ttf",
             parent=self.loading_text_background,
             color=color.white,
             x=-.5,
@@ -663,6 +1909,7 @@ class LoadDiscInterface(Entity):
             scale=(10, 24),
             z=-.01
         )
+        get_glyph_cache(self.memory.maindict).apply(self.loading_text, "assets/fonts/NotoSansJP/static/NotoSansJP-Bold.ttf")
 
         self.cd_load_audio: Audio  = Audio(
             'assets/media/CDSpin.mp3',
@@ -694,10 +1941,51 @@ class LoadDiscInterface(Entity):
         destroy(self.loading_text_background)
         
 
+    def warm_first_page(self) -> None:
+        """Requests the first pages' metadata and the library cover
+        """
+        main_memory = self.memory.maindict
+        raw = main_memory["contentraw"]
+
+        self.first_page_requested = True
+        self.pending = 0
+
+        for name in raw["content"][:10]:
+            self.pending += 1
+            main_memory["metadata_loader"].request(str(raw["path"] / name), self.work_finished)
+
+        self.pending += 1
+        main_memory["art_loader"].request_folder(raw["path"], self.work_finished)
+
+    def work_finished(self, *_) -> None:
+        """Loader callback of warm_first_page
+        """
+        self.pending -= 1
+
+    def is_ready(self) -> bool:
+        """Returns True when Interface can be shown without waiting on disk
+        """
+        disc: Disc = self.memory.maindict["disc"]
+        disc.poll_scan()
+
+        if not self.first_page_requested:
+            if len(disc.contentraw["content"]) >= 10 or not disc.scan:
+                self.warm_first_page()
+            return False
+
+        # Started by main, before the loading screen
+        assets: AssetManager | None = self.memory.maindict.get("asset_manager")
+        if assets and not assets.ready:
+            return False
+
+        return self.pending <= 0 and not self.backends_thread.is_alive()
+
     def update_loadaudio(self) -> None:
         """Updates cd_load_audio entity
         """
-        if self.cd_load_audio.time >= 11.0:
+        self.elapsed += time.dt
+
+        if self.is_ready() and self.elapsed >= self.min_time:
             self.cd_load_audio.stop()
             self.callInterface(Interface)
 
@@ -730,33 +2018,98 @@ class ApplicationBase:
         #window.title = self.applicationName
     
 
-def main() -> None:
+def main(options: Namespace) -> None:
     """Main application run
+
+    Args:
+        options (Namespace): parsed command-line arguments
     """
 
+    logging.basicConfig(
+        level=options.log_level.upper(),
+        format="%(levelname)s %(name)s: %(message)s"
+    )
+
     # Define base and configure window
-    appbase = ApplicationBase("DVD Player")
-    appbase.configWindow()
+    create_app(headless=options.headless)
+
+    if not options.headless:
+        appbase = ApplicationBase("DVD Player")
+        appbase.configWindow()
 
     # Main vars
     temp_memory: LocalTempMemory = LocalTempMemory()
-    dir_manager: DirectoryManager = DirectoryManager()
-    soundmgr: audio_scripts.SoundManager = audio_scripts.SoundManager()
+    dir_manager: DirectoryManager = DirectoryManager(
+        extensions=options.extensions,
+        recursive=not options.no_recursive
+    )
 
-    # Arguments
+    # Arguments (the sound manager is created with Interface, once vlc is loaded)
     args = {
         "dir_manager": dir_manager,
         "local_memory": temp_memory,
-        "sound_manager": soundmgr
+        "options": options
     }
 
     temp_memory.maindict.update(args)
 
+    # Frame rate drops while nobody touches the player
+    temp_memory.maindict["frame_scheduler"] = FrameScheduler(
+        fps_cap=options.fps_cap,
+        playing_fps=options.playing_fps,
+        idle_fps=options.idle_fps
+    )
+
+    # Textures and fonts are read while the loading screen plays
+    temp_memory.maindict["asset_manager"] = AssetManager().preload()
+
+    # Remote control, commands are answered once Interface is up
+    if options.control_socket:
+        control = ControlServer(
+            options.control_socket,
+            on_command=temp_memory.maindict["frame_scheduler"].wake
+        ).start()
+        temp_memory.maindict["control_server"] = control
+        atexit.register(control.close)
+
+    # Time to first frame, heavy imports are deferred to keep it small
+    def report_first_frame(task) -> int:
+        temp_memory.maindict["first_frame_time"] = perf_counter() - LAUNCH_TIME
+        get_metrics().histogram("launch_to_first_frame").record(temp_memory.maindict["first_frame_time"] * 1e6)
+        log.info("First frame after %.3fs", temp_memory.maindict["first_frame_time"])
+        return task.done
+
+    app.taskMgr.add(report_first_frame, "report-first-frame")
+
+    # Latency metrics, served live and/or written on exit
+    metrics = get_metrics()
+    if options.metrics_socket:
+        metrics.serve(options.metrics_socket)
+    if options.metrics_file:
+        atexit.register(metrics.export, options.metrics_file)
+
+    # Opt-in, nothing is instrumented without --profile
+    if options.profile:
+        profiler = FrameProfiler(app).start()
+
+        def write_profile() -> None:
+            profiler.dump(options.profile)
+            print(profiler.summary())
+            print(f"Trace written to {options.profile}")
+
+        atexit.register(write_profile)
+
     # Launch interface
-    LoadDiscInterface(memory=temp_memory)
+    if options.fast_boot:
+        Interface(memory=temp_memory)
+    else:
+        LoadDiscInterface(memory=temp_memory, min_time=options.intro_time)
 
-    # Launch application
-    app.run()
+    # Launch application, or only run the requested frames
+    if options.frames:
+        step_frames(options.frames, dt=options.frame_dt)
+    else:
+        app.run()
 
 
 class ParserGen:
@@ -770,8 +2123,152 @@ class ParserGen:
             'path', 
             type=str, 
             nargs='*', 
-            help="The path for CD Files"
+            help="Folders or playlists (M3U/M3U8, PLS, XSPF), one per disc of the changer"
+        )
+
+        self.parser.add_argument(
+            '--hud-rate',
+            type=float,
+            default=4.0,
+            help="Refreshes per second of the time label and progress bar (0 = every frame)"
+        )
+
+        self.parser.add_argument(
+            '--extensions',
+            type=lambda value: value.split(','),
+            default=None,
+            help="Comma-separated audio extensions to list, example: mp3,flac,opus"
+        )
+
+        self.parser.add_argument(
+            '--fast-boot',
+            action='store_true',
+            help="Skip the loading screen and show the player right away"
+        )
+
+        self.parser.add_argument(
+            '--intro-time',
+            type=float,
+            default=11.0,
+            help="Minimum seconds of loading animation, the loading screen stays longer only while the library is loading"
+        )
+
+        self.parser.add_argument(
+            '--headless',
+            action='store_true',
+            help="Render offscreen without a window and play audio to a null sink"
+        )
+
+        self.parser.add_argument(
+            '--frames',
+            type=int,
+            default=0,
+            help="Run this many frames and exit (0 = run until the window is closed)"
+        )
+
+        self.parser.add_argument(
+            '--frame-dt',
+            type=float,
+            default=None,
+            help="With --frames, advance the clock by this many seconds per frame instead of real time"
+        )
+
+        self.parser.add_argument(
+            '--profile',
+            type=str,
+            default=None,
+            metavar='TRACE_FILE',
+            help="Time entity updates, input and libvlc calls per frame, write a Chrome trace on exit"
+        )
+
+        self.parser.add_argument(
+            '--metrics-file',
+            type=str,
+            default=None,
+            help="Write latency metrics (track switch, page flip, launch, scan) as JSON on exit"
+        )
+
+        self.parser.add_argument(
+            '--metrics-socket',
+            type=str,
+            default=None,
+            help="Serve a JSON snapshot of the metrics to every client of this Unix socket"
+        )
+
+        self.parser.add_argument(
+            '--control-socket',
+            type=str,
+            default=None,
+            help="Accept JSON-lines commands (play, pause, next, seek, volume, queue, subscribe...) on this Unix socket"
+        )
+
+        self.parser.add_argument(
+            '--log-level',
+            choices=("debug", "info", "warning", "error"),
+            default="warning",
+            help="Messages shown on stderr (default: warning)"
+        )
+
+        self.parser.add_argument(
+            '--shuffle',
+            action='store_true',
+            help="Start with shuffled play order (toggle with S)"
+        )
+
+        self.parser.add_argument(
+            '--repeat',
+            choices=REPEAT_MODES,
+            default="all",
+            help="Repeat mode: off, all or one (cycle with R)"
+        )
+
+        self.parser.add_argument(
+            '--fps-cap',
+            type=float,
+            default=60,
+            help="Frame rate while the player is used or animating (0 = uncapped, default: 60)"
+        )
+
+        self.parser.add_argument(
+            '--playing-fps',
+            type=float,
+            default=30,
+            help="Frame rate while a song plays and nothing is touched (default: 30)"
+        )
+
+        self.parser.add_argument(
+            '--idle-fps',
+            type=float,
+            default=5,
+            help="Frame rate while paused or stopped and nothing is touched (default: 5)"
+        )
+
+        self.parser.add_argument(
+            '--glyph-resolution',
+            type=int,
+            default=DEFAULT_RESOLUTION,
+            help=f"Pixels per font unit of song titles and labels, the logo uses 1.5x (default: {DEFAULT_RESOLUTION})"
+        )
+
+        self.parser.add_argument(
+            '--glyph-memory',
+            type=float,
+            default=16,
+            help="MiB of glyph textures kept before glyphs no longer shown are dropped (default: 16)"
         )
+
+        self.parser.add_argument(
+            '--no-snapshot',
+            action='store_true',
+            help="Scan the library from scratch and don't save the library and player state on exit"
+        )
+
+        self.parser.add_argument(
+            '--no-recursive',
+            action='store_true',
+            help="Only list songs directly inside the given path"
+        )
+
     def print_help(self) -> None:
         self.parser.print_help()
 
@@ -786,7 +2283,5 @@ if __name__ == "__main__":
     if len(args.path) == 0:
         main_parser.print_help()
         sys.exit(1)
-    else:
-        TARGET_PATH = args.path[0]
 
-    main()
+    main(args)
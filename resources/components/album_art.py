@@ -0,0 +1,393 @@
+import io
+import os
+import hashlib
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import PosixPath
+from typing import Callable
+
+from PIL import Image
+from ursina import Entity, Texture
+
+from .app_dirs import cache_dir
+from .audio_scripts import get_metadata_index, read_embedded_image
+
+
+COVER_NAMES: frozenset[str] = frozenset(
+    f"{name}{ext}" for name in ("cover", "folder") for ext in (".jpg", ".jpeg", ".png")
+)
+
+# Decodes between two checks of the thumbnail cache size
+PRUNE_INTERVAL: int = 64
+
+ArtCallback = Callable[[Texture | None], None]
+
+# Decodes a request's image, returns (cache key, image). Gets shared=False
+# when it must decode even if the picture looks already uploaded.
+Decoder = Callable[[bool], tuple[str | None, Image.Image | None]]
+
+
+def find_cover(folder: PosixPath | str) -> str | None:
+    """Searches a folder for a cover image (cover.jpg, folder.png, ...)
+
+    Args:
+        folder (PosixPath | str): album folder
+
+    Returns:
+        str | None: cover image path, None if the folder has no cover
+    """
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.name.lower() in COVER_NAMES and entry.is_file():
+                    return entry.path
+    except OSError:
+        pass
+
+    return None
+
+
+def open_thumbnail(thumb_path: PosixPath) -> Image.Image | None:
+    """Reads a cached thumbnail and marks it as recently used
+
+    Args:
+        thumb_path (PosixPath): thumbnail file
+
+    Returns:
+        Image.Image | None: RGBA image, None if it isn't cached
+    """
+    try:
+        with Image.open(thumb_path) as thumb:
+            image = thumb.convert("RGBA")
+    except OSError:
+        return None
+
+    # prune_thumbnails drops the least recently modified files first
+    try:
+        os.utime(thumb_path)
+    except OSError:
+        pass
+
+    return image
+
+
+def prune_thumbnails(thumbnail_dir: PosixPath, max_bytes: int) -> int:
+    """Deletes the least recently used thumbnails when the cache grows past max_bytes
+
+    The cache is brought down to 3/4 of max_bytes, so the next prune is
+    some saves away.
+
+    Args:
+        thumbnail_dir (PosixPath): thumbnail cache directory
+        max_bytes (int): largest total size of the thumbnails
+
+    Returns:
+        int: total size of the thumbnails left, in bytes
+    """
+    thumbs = []
+    total = 0
+
+    try:
+        with os.scandir(thumbnail_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".png") and entry.is_file():
+                    st = entry.stat()
+                    thumbs.append((st.st_mtime_ns, st.st_size, entry.path))
+                    total += st.st_size
+    except OSError:
+        return total
+
+    if total <= max_bytes:
+        return total
+
+    thumbs.sort()
+    for _, size, path in thumbs:
+        if total <= max_bytes * 3 // 4:
+            break
+        try:
+            os.unlink(path)
+            total -= size
+        except OSError:
+            pass
+
+    return total
+
+
+def load_thumbnail(image_path: str, size: int, thumbnail_dir: PosixPath | None) -> Image.Image | None:
+    """Decodes an image downscaled to fit size x size, using the on-disk thumbnail cache
+
+    Args:
+        image_path (str): source image
+        size (int): longest side in pixels
+        thumbnail_dir (PosixPath | None): thumbnail cache directory, None to disable it
+
+    Returns:
+        Image.Image | None: RGBA image, None if the source can't be decoded
+    """
+    try:
+        st = os.stat(image_path)
+    except OSError:
+        return None
+
+    thumb_path = None
+    if thumbnail_dir:
+        key = f"{image_path}\0{st.st_size}\0{st.st_mtime_ns}\0{size}"
+        thumb_path = thumbnail_dir / (hashlib.sha1(key.encode()).hexdigest() + ".png")
+
+        if thumb := open_thumbnail(thumb_path):
+            return thumb
+
+    return decode_thumbnail(image_path, size, thumb_path)
+
+
+def decode_thumbnail(source: str | io.BytesIO, size: int, thumb_path: PosixPath | None) -> Image.Image | None:
+    """Decodes an image downscaled to fit size x size and optionally saves it
+
+    Args:
+        source (str | io.BytesIO): image file or in-memory image data
+        size (int): longest side in pixels
+        thumb_path (PosixPath | None): where to save the thumbnail, None to skip it
+
+    Returns:
+        Image.Image | None: RGBA image, None if the source can't be decoded
+    """
+    try:
+        with Image.open(source) as img:
+            # JPEG can decode straight to a smaller scale, much cheaper than resizing later
+            img.draft("RGB", (size, size))
+            img.thumbnail((size, size), Image.Resampling.LANCZOS)
+            thumb = img.convert("RGBA")
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+
+    if thumb_path:
+        try:
+            thumb.save(thumb_path, optimize=False)
+        except OSError:
+            pass
+
+    return thumb
+
+
+class AlbumArtLoader(Entity):
+    def __init__(self, size: int = 256, capacity: int = 32, disk_cache: bool = True,
+                 disk_capacity: int = 64 * 1024 * 1024) -> None:
+        """Decodes and downscales album art on a worker thread
+
+        Decoded images are uploaded as textures on the render thread and kept
+        in a bounded LRU cache. Thumbnails can also be kept in the XDG cache,
+        the least recently used ones are deleted past disk_capacity.
+
+        Args:
+            size (int, optional): longest side of the textures in pixels. Defaults to 256.
+            capacity (int, optional): textures kept in memory. Defaults to 32.
+            disk_cache (bool, optional): keep thumbnails on disk. Defaults to True.
+            disk_capacity (int, optional): size of the thumbnails kept on disk in
+                bytes, checked every PRUNE_INTERVAL decodes. Defaults to 64 MiB.
+        """
+        super().__init__()
+
+        self.size: int = size
+        self.capacity: int = capacity
+        self.disk_capacity: int = disk_capacity
+        self.thumbnail_dir: PosixPath | None = None
+        # Decodes since the thumbnail cache was last pruned, worker thread only
+        self.unpruned: int = 0
+
+        if disk_cache:
+            self.thumbnail_dir = cache_dir() / "thumbnails"
+            try:
+                self.thumbnail_dir.mkdir(parents=True, exist_ok=True)
+            except OSError:
+                self.thumbnail_dir = None
+
+        self.pool: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="album-art")
+        if self.thumbnail_dir:
+            self.pool.submit(prune_thumbnails, self.thumbnail_dir, self.disk_capacity)
+        self.textures: OrderedDict[str, Texture | None] = OrderedDict()
+        self.callbacks: dict[str, list[ArtCallback]] = {}
+        self.results: deque[tuple[str, str | None, Image.Image | None, bool]] = deque()
+        self.decoders: dict[str, Decoder] = {}
+
+        # Track key -> shared image key, None for tracks without a picture
+        self.aliases: dict[str, str | None] = {}
+        # Shared image key -> track keys aliased to it, dropped with the texture
+        self.aliased: dict[str, list[str]] = {}
+        # Folder key -> folder mtime when it had no cover, worker thread only.
+        # Adding a cover changes the mtime, so the folder is searched again.
+        self.folder_misses: dict[str, int] = {}
+
+    def _work(self, key: str, decode: Decoder, shared: bool) -> None:
+        try:
+            image_key, image = decode(shared)
+        except Exception:
+            # Not remembered, the next request tries again
+            image_key, image = key, None
+        self.results.append((key, image_key, image, shared))
+
+        # Each decode may have saved a thumbnail
+        self.unpruned += 1
+        if self.thumbnail_dir and self.unpruned >= PRUNE_INTERVAL:
+            self.unpruned = 0
+            prune_thumbnails(self.thumbnail_dir, self.disk_capacity)
+
+    def _remember(self, key: str, texture: Texture | None) -> None:
+        self.textures[key] = texture
+        self.textures.move_to_end(key)
+
+        while len(self.textures) > self.capacity:
+            evicted, _ = self.textures.popitem(last=False)
+
+            # Aliases would point at nothing, their tracks go through the index again
+            for alias in self.aliased.pop(evicted, ()):
+                if self.aliases.get(alias) == evicted:
+                    del self.aliases[alias]
+
+    def _alias(self, key: str, image_key: str | None) -> None:
+        self.aliases[key] = image_key
+        if image_key is not None:
+            self.aliased.setdefault(image_key, []).append(key)
+
+    def _request(self, key: str, decode: Decoder, callback: ArtCallback) -> bool:
+        image_key = self.aliases.get(key, key)
+
+        if image_key is None:
+            callback(None)
+            return True
+
+        if image_key in self.textures:
+            self.textures.move_to_end(image_key)
+            callback(self.textures[image_key])
+            return True
+
+        if key not in self.callbacks:
+            self.callbacks[key] = []
+            self.decoders[key] = decode
+            self.pool.submit(self._work, key, decode, True)
+
+        self.callbacks[key].append(callback)
+        return False
+
+    def _decode_folder(self, key: str, folder: str, shared: bool) -> tuple[str | None, Image.Image | None]:
+        try:
+            mtime = os.stat(folder).st_mtime_ns
+        except OSError:
+            return None, None
+
+        if self.folder_misses.get(key) == mtime:
+            return None, None
+
+        if image_path := find_cover(folder):
+            self.folder_misses.pop(key, None)
+            return key, load_thumbnail(image_path, self.size, self.thumbnail_dir)
+
+        self.folder_misses[key] = mtime
+        return None, None
+
+    def _decode_track(self, track_path: str, shared: bool) -> tuple[str | None, Image.Image | None]:
+        index = get_metadata_index()
+        st = os.stat(track_path)
+        data = None
+
+        hit, image_hash = index.lookup_art(track_path, st)
+        if not hit:
+            data = read_embedded_image(track_path)
+            image_hash = hashlib.sha1(data).hexdigest() if data else ""
+            index.store_art(track_path, st, image_hash)
+
+        if not image_hash:
+            return None, None
+
+        # Another track of the same album already has this picture on the GPU
+        image_key = f"image:{image_hash}"
+        if shared and image_key in self.textures:
+            return image_key, None
+
+        thumb_path = None
+        if self.thumbnail_dir:
+            thumb_path = self.thumbnail_dir / f"{image_hash}-{self.size}.png"
+            if thumb := open_thumbnail(thumb_path):
+                return image_key, thumb
+
+        if data is None:
+            data = read_embedded_image(track_path)
+            if not data:
+                return None, None
+
+        return image_key, decode_thumbnail(io.BytesIO(data), self.size, thumb_path)
+
+    def request_folder(self, folder: PosixPath | str, callback: ArtCallback) -> bool:
+        """Requests the cover texture of an album folder
+
+        Args:
+            folder (PosixPath | str): album folder
+            callback (ArtCallback): called with the texture (None if the folder
+                has no usable cover) on the render thread
+
+        Returns:
+            bool: True if the texture was cached and callback ran immediately
+        """
+        folder = os.fspath(folder)
+        key = f"folder:{folder}"
+        return self._request(key, lambda shared: self._decode_folder(key, folder, shared), callback)
+
+    def request_track(self, track_path: PosixPath | str, callback: ArtCallback) -> bool:
+        """Requests the texture of a track's embedded picture
+
+        Tags are only read the first time; the picture hash is kept in the
+        metadata index and tracks sharing a picture share one texture.
+
+        Args:
+            track_path (PosixPath | str): audio file path
+            callback (ArtCallback): called with the texture (None if the track
+                has no embedded picture) on the render thread
+
+        Returns:
+            bool: True if the result was known and callback ran immediately
+        """
+        track_path = os.fspath(track_path)
+        return self._request(f"track:{track_path}", lambda shared: self._decode_track(track_path, shared), callback)
+
+    def forget(self, track_path: PosixPath | str) -> None:
+        """Drops what is known about a track's embedded picture
+
+        Args:
+            track_path (PosixPath | str): audio file path
+        """
+        self.aliases.pop(f"track:{os.fspath(track_path)}", None)
+
+    def update(self) -> None:
+        """Uploads decoded images and delivers them to their callbacks
+        """
+        while self.results:
+            key, image_key, image, shared = self.results.popleft()
+
+            if image_key in self.textures:
+                texture = self.textures[image_key]
+                self.textures.move_to_end(image_key)
+            elif image is not None:
+                texture = Texture(image)
+                self._remember(image_key, texture)
+            elif shared and image_key not in (key, None):
+                # The shared picture was evicted while the worker looked it up
+                self.pool.submit(self._work, key, self.decoders[key], False)
+                continue
+            else:
+                texture = None
+
+            # Tracks point at the picture they share with the rest of the album.
+            # Failed decodes aren't remembered, the next request tries again.
+            # Folders without a cover aren't either, one may be added later.
+            if image_key is None and not key.startswith("folder:"):
+                self._alias(key, None)
+            elif key != image_key and texture:
+                self._alias(key, image_key)
+
+            del self.decoders[key]
+            for callback in self.callbacks.pop(key, ()):
+                callback(texture)
+
+    def shutdown(self) -> None:
+        """Stops the worker without waiting for queued images
+        """
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,38 @@
+import os
+from pathlib import Path, PosixPath
+
+# Directory name used under the XDG base directories
+APP_DIR_NAME: str = "PlayStar"
+
+
+def _xdg_dir(env_var: str, fallback: str) -> PosixPath:
+    """Resolves a XDG base directory for this application and creates it
+
+    Args:
+        env_var (str): XDG environment variable, example: "XDG_CACHE_HOME"
+        fallback (str): Path relative to home used when env_var is unset
+
+    Returns:
+        PosixPath: Application directory inside the XDG base directory
+    """
+    base = os.environ.get(env_var) or os.path.join(Path.home(), fallback)
+    app_dir = Path(base) / APP_DIR_NAME
+
+    try:
+        app_dir.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        pass
+
+    return app_dir
+
+
+def cache_dir() -> PosixPath:
+    """Returns the cache directory (~/.cache/PlayStar by default)
+    """
+    return _xdg_dir("XDG_CACHE_HOME", ".cache")
+
+
+def state_dir() -> PosixPath:
+    """Returns the state directory (~/.local/state/PlayStar by default)
+    """
+    return _xdg_dir("XDG_STATE_HOME", os.path.join(".local", "state"))
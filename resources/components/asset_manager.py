@@ -0,0 +1,105 @@
+from collections import deque
+
+from panda3d.core import Filename, FontPool, TexturePool
+from ursina import Entity, Texture, application
+from ursina import texture_importer
+
+
+# Everything the loading screen and Interface show, as they name it
+UI_TEXTURES: tuple[str, ...] = (
+    "assets/textures/newgbg.jpg",
+    "assets/textures/DVD_logo.png",
+    "assets/textures/newcd.png",
+    "assets/textures/dvd_logo_white.png",
+    "assets/textures/default_albumart.png",
+    "assets/textures/play_btn_white.png",
+    "assets/textures/pause_btn.png",
+    "assets/textures/skip_btn.png",
+    "assets/textures/prev_btn.png",
+    "assets/textures/arrow_right.png",
+    "assets/textures/arrow_left.png",
+    "assets/textures/volume_texture.png",
+)
+
+UI_FONTS: tuple[str, ...] = (
+    "assets/fonts/Audiowide/Audiowide-Regular.ttf",
+    "assets/fonts/NotoSansJP/static/NotoSansJP-Light.ttf",
+    "assets/fonts/NotoSansJP/static/NotoSansJP-Bold.ttf",
+)
+
+
+class AssetManager(Entity):
+    def __init__(self, textures: tuple[str, ...] = UI_TEXTURES, fonts: tuple[str, ...] = UI_FONTS) -> None:
+        """Loads the UI's textures and fonts in one batch, off the render thread
+
+        Files are read and decoded on a Panda3D threaded task chain. Textures
+        are then handed to ursina's texture cache, under the names entities
+        use, and queued for upload to the graphics card. Fonts land in
+        Panda3D's font pool, which Text looks them up in. After that no
+        texture or font assignment touches the disk.
+
+        Args:
+            textures (tuple[str, ...], optional): texture names. Defaults to UI_TEXTURES.
+            fonts (tuple[str, ...], optional): font paths. Defaults to UI_FONTS.
+        """
+        super().__init__()
+
+        self.textures: tuple[str, ...] = textures
+        self.fonts: tuple[str, ...] = fonts
+
+        # deque.append/popleft are atomic, the loader thread never takes a lock here
+        self.loaded: deque[tuple[str, object]] = deque()
+        self.pending: int = 0
+        self.started: bool = False
+
+    @property
+    def ready(self) -> bool:
+        return self.started and self.pending <= 0
+
+    def _load_batch(self, task):
+        for name in self.textures:
+            path = Filename.fromOsSpecific(str(application.asset_folder / name))
+            self.loaded.append((name, TexturePool.loadTexture(path)))
+
+        # Same names as Text uses, so the pool returns these instances
+        for name in self.fonts:
+            self.loaded.append((name, FontPool.loadFont(name)))
+
+        return task.done
+
+    def preload(self) -> "AssetManager":
+        """Starts loading every asset, once
+        """
+        if self.started:
+            return self
+        self.started = True
+        self.pending = len(self.textures) + len(self.fonts)
+
+        task_mgr = application.base.taskMgr
+        task_mgr.setupTaskChain("asset-preload", numThreads=1)
+        task_mgr.add(self._load_batch, "asset-preload", taskChain="asset-preload")
+
+        return self
+
+    def _register(self, name: str, asset) -> None:
+        if name not in self.textures or asset is None:
+            return
+
+        # Entities given this name take a copy of the cached texture
+        texture = Texture(asset)
+
+        # Set like a texture ursina loaded itself (its __del__ expects _cached_image)
+        texture.path = application.asset_folder / name
+        texture._cached_image = None
+        texture_importer.imported_textures[name] = texture
+
+        if window := application.base.win:
+            asset.prepare(window.getGsg().getPreparedObjects())
+
+    def update(self) -> None:
+        """Registers the assets loaded since the last frame
+        """
+        while self.loaded:
+            name, asset = self.loaded.popleft()
+            self._register(name, asset)
+            self.pending -= 1
@@ -1,9 +1,78 @@
-import vlc
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter_ns
+
 from pathlib import Path, PosixPath
-from tinytag import TinyTag
 from ursina import Entity
 
+from .app_dirs import cache_dir
+from .metadata_index import MetadataIndex
+from .metrics import get_metrics
+
+log = logging.getLogger(__name__)
+
+# vlc and tinytag are imported on first use by load_backends, so they don't
+# delay the first frame
+vlc = None
+TinyTag = None
+
+_vlc_instance: vlc.Instance | None = None
+_vlc_audio_output: str | None = None
+
+# libvlc output that discards samples, for machines without a sound card
+NULL_AUDIO_OUTPUT: str = "adummy"
+
+# SoundManager event carrying a song's metadata, looked up off the render thread
+METADATA_EVENT: str = "metadata"
+
+_metadata_index: MetadataIndex | None = None
+_metadata_index_lock: threading.Lock = threading.Lock()
+
+
+def load_backends(audio: bool = True) -> None:
+    """Imports the tag parser and, optionally, the libvlc bindings
+
+    Safe to call from any thread, imports only happen once.
+
+    Args:
+        audio (bool, optional): also import vlc. Defaults to True.
+    """
+    global vlc, TinyTag
+
+    if TinyTag is None:
+        from tinytag import TinyTag as _TinyTag
+        TinyTag = _TinyTag
+
+    if audio and vlc is None:
+        import vlc as _vlc
+        vlc = _vlc
+
+
+def get_metadata_index() -> MetadataIndex:
+    """Returns the shared metadata index, opening it on first use
+    """
+    global _metadata_index
+
+    with _metadata_index_lock:
+        if _metadata_index is None:
+            _metadata_index = MetadataIndex(cache_dir() / "metadata.sqlite3")
+            atexit.register(_metadata_index.close)
+
+    return _metadata_index
+
+
 def get_audio_metadata(file_path) -> dict | None:
+    return get_metadata_index().get(str(file_path), parse_audio_metadata)
+
+
+def parse_audio_metadata(file_path) -> dict | None:
+    load_backends(audio=False)
+
     try:
         tag = TinyTag.get(file_path)
         metadata = {
@@ -14,15 +83,50 @@ def get_audio_metadata(file_path) -> dict | None:
         return metadata
     
     except Exception as e:
-        print("Error extracting metadata")
+        log.warning("Error extracting metadata of %s: %s", file_path, e)
+        return None
+
+def read_embedded_image(file_path) -> bytes | None:
+    load_backends(audio=False)
+
+    try:
+        return TinyTag.get(file_path, duration=False, image=True).get_image()
+    except Exception:
         return None
 
+def set_audio_output(name: str | None) -> None:
+    """Selects the libvlc audio output module. Only effective before the first player
+
+    Args:
+        name (str | None): libvlc module name (NULL_AUDIO_OUTPUT, "pulse", ...),
+            None for libvlc's default
+    """
+    global _vlc_audio_output
+    _vlc_audio_output = name
+
+def get_vlc_instance() -> vlc.Instance:
+    """Returns the libvlc instance shared by every player, creating it on first use
+    """
+    global _vlc_instance
+
+    load_backends()
+    if _vlc_instance is None:
+        args = ["--no-video", "--quiet"]
+        if _vlc_audio_output:
+            args.append(f"--aout={_vlc_audio_output}")
+
+        _vlc_instance = vlc.Instance(*args)
+
+    return _vlc_instance
+
 class DiscManager(Entity):
     def __init__(self, disc_audio1: PosixPath) -> None:
         super().__init__()
         self.bool_var = False
 
-        self.player :vlc.MediaPlayer = vlc.MediaPlayer(disc_audio1)
+        instance = get_vlc_instance()
+        self.player :vlc.MediaPlayer = instance.media_player_new()
+        self.player.set_media(instance.media_new_path(str(disc_audio1)))
         self.em = self.player.event_manager()
         self.em.event_attach(vlc.EventType.MediaPlayerEndReached, self.onEnd)
 
@@ -45,48 +149,334 @@ class DiscManager(Entity):
 class SoundManager(Entity):
     def __init__(self):
         super().__init__()
+        self.instance: vlc.Instance = get_vlc_instance()
+
+        # Two players take turns: one plays while the other holds the next song,
+        # opened and paused on its first frame
+        self.players: list[vlc.MediaPlayer] = [self.instance.media_player_new() for _ in range(2)]
+        self.loads: list[int] = [0, 0]
+        self.active: int = 0
+        self.preloaded: str | None = None
+
+        # libvlc calls that open, start or stop songs block, they run in order
+        # on this worker. loads, prerolled and handed_off are only written there.
+        self.pool: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio")
+        self.prerolled: tuple[int, str] | None = None
+        self.handed_off: tuple[int, str] | None = None
+        self.next_metadata: tuple[str, dict | None] | None = None
+
         self.current_song_name: str = None
-        self.current_song: vlc.MediaPlayer = vlc.MediaPlayer()
+        self.current_song: vlc.MediaPlayer = self.players[self.active]
         self.current_song_title: str | None = None
         self.current_song_artist: str | None = None
         self.current_volume: int = self.current_song.audio_get_volume()
 
-    def playsong(self, newSong, sname):
+        # Playback position in ms, kept up to date by player events
+        self.current_time: int = -1
+        self.current_length: int = -1
+        self.current_state: vlc.State = vlc.State.NothingSpecial
+
+        # Player events are queued by libvlc's thread and applied in poll_events
+        self.events: deque[tuple[int, int, int, int]] = deque()
+
+        for index, player in enumerate(self.players):
+            self._attach_events(player, index)
+
+    def _attach_events(self, player: vlc.MediaPlayer, index: int) -> None:
+        em = player.event_manager()
+        for event_type in (
+            vlc.EventType.MediaPlayerEndReached,
+            vlc.EventType.MediaPlayerTimeChanged,
+            vlc.EventType.MediaPlayerLengthChanged,
+            vlc.EventType.MediaPlayerPlaying,
+            vlc.EventType.MediaPlayerPaused,
+            vlc.EventType.MediaPlayerStopped,
+        ):
+            em.event_attach(event_type, self.onPlayerEvent, index)
+
+    def onPlayerEvent(self, event, index: int) -> None:
+        """libvlc event callback. Runs on libvlc's thread, so it only queues the event
+        """
+        load = self.loads[index]
+
+        match event.type:
+            case vlc.EventType.MediaPlayerTimeChanged:
+                self.events.append((index, load, event.type, event.u.new_time))
+            case vlc.EventType.MediaPlayerLengthChanged:
+                self.events.append((index, load, event.type, event.u.new_length))
+            case vlc.EventType.MediaPlayerPlaying:
+                # When playback really started, not when the frame noticed it
+                self.events.append((index, load, event.type, perf_counter_ns()))
+            case vlc.EventType.MediaPlayerEndReached:
+                # The next song starts now instead of on the frame that polls this
+                self.pool.submit(self._hand_off, index, load)
+                self.events.append((index, load, event.type, 0))
+            case _:
+                self.events.append((index, load, event.type, 0))
+
+    def poll_events(self) -> tuple[bool, bool]:
+        """Applies queued player events. Meant to be called once per frame
+
+        Returns:
+            tuple[bool, bool]: (time_changed, end_reached) for the current song
+        """
+        time_changed = False
+        end_reached = False
+
+        while self.events:
+            index, load, event_type, value = self.events.popleft()
+
+            # Events from the idle player or from a song it doesn't hold anymore
+            if index != self.active or load != self.loads[index]:
+                continue
+
+            if event_type == METADATA_EVENT:
+                self._apply_metadata(value)
+            elif event_type == vlc.EventType.MediaPlayerTimeChanged:
+                self.current_time = value
+                time_changed = True
+            elif event_type == vlc.EventType.MediaPlayerLengthChanged:
+                self.current_length = value
+                time_changed = True
+            elif event_type == vlc.EventType.MediaPlayerEndReached:
+                self.current_time = self.current_length
+                self.current_state = vlc.State.Ended
+                end_reached = True
+
+                # The next song's events wait until playsong made it the active one
+                break
+            elif event_type == vlc.EventType.MediaPlayerPlaying:
+                self.current_state = vlc.State.Playing
+                get_metrics().end("track_switch", value)
+            elif event_type == vlc.EventType.MediaPlayerPaused:
+                self.current_state = vlc.State.Paused
+            elif event_type == vlc.EventType.MediaPlayerStopped:
+                self.current_state = vlc.State.Stopped
+
+        return time_changed, end_reached
+
+    def _apply_metadata(self, metadata: dict | None) -> None:
+        if metadata:
+            self.current_song_title = metadata["title"] or self.current_song_name
+            self.current_song_artist = metadata["artist"]
+
+            if metadata["duration"] and self.current_length < 0:
+                self.current_length = int(metadata["duration"] * 1000)
+        else:
+            self.current_song_title = self.current_song_name
+            self.current_song_artist = self.current_song_name
+
+    def _load(self, index: int, newSong: str, start_ms: int = 0, paused: bool = False) -> None:
+        media = self.instance.media_new_path(newSong)
+
+        if start_ms:
+            media.add_option(f":start-time={start_ms / 1000:.3f}")
+        if paused:
+            media.add_option(":start-paused")
+
+        # Asynchronous parse of the local tags and duration only, the file is
+        # opened by play()
+        media.parse_with_options(vlc.MediaParseFlag.local, 0)
+
+        self.loads[index] += 1
+        self.players[index].set_media(media)
+
+    def _start(self, index: int) -> None:
+        player = self.players[index]
+
+        # Pre-roll events of the paused song are dropped
+        self.loads[index] += 1
+        if self.current_volume >= 0:
+            player.audio_set_volume(self.current_volume)
+        player.set_pause(0)
+
+    def _preroll(self, index: int, newSong: str | None) -> None:
+        self.prerolled = None
+        player = self.players[index]
+
+        if newSong is None:
+            player.stop()
+            return
+
+        # Input, demuxer, decoder and audio output are opened now, playback
+        # stops on the first frame
+        self._load(index, newSong, paused=True)
+        player.audio_set_volume(0)
+        player.play()
+
+        self.prerolled = (index, newSong)
+        self.next_metadata = (newSong, get_audio_metadata(newSong))
+
+    def _hand_off(self, index: int, load: int) -> None:
+        # Only for the end of the active song, while its successor is pre-rolled
+        if index != self.active or load != self.loads[index] or self.prerolled is None:
+            return
+
+        idle, newSong = self.prerolled
+        if idle == index or self.players[idle].get_state() != vlc.State.Paused:
+            return
+
+        self._start(idle)
+        self.prerolled = None
+        self.handed_off = (idle, newSong)
+
+    def _switch(self, previous: int, index: int, newSong: str, start_ms: int, paused: bool,
+                metadata_known: bool) -> None:
+        metrics = get_metrics()
+        player = self.players[index]
+
+        if self.handed_off == (index, newSong) and not start_ms and not paused:
+            # Already playing since the previous song ended
+            metrics.counter("preload_hits").inc()
+        elif (self.prerolled == (index, newSong) and not start_ms and not paused
+              and player.get_state() == vlc.State.Paused):
+            self._start(index)
+            metrics.counter("preload_hits").inc()
+        else:
+            self._load(index, newSong, start_ms, paused)
+            if self.current_volume >= 0:
+                player.audio_set_volume(self.current_volume)
+            player.play()
+            metrics.counter("preload_misses").inc()
+
+        self.prerolled = None
+        self.handed_off = None
+
+        if not metadata_known:
+            self.events.append((index, self.loads[index], METADATA_EVENT, get_audio_metadata(newSong)))
+
+        if self.players[previous].get_state() in (vlc.State.Playing, vlc.State.Paused, vlc.State.Ended):
+            self.players[previous].stop()
+
+    def preload(self, newSong: str | None) -> None:
+        """Opens a song in the idle player, paused on its first frame
+
+        playsong then starts it right away, and when the current song ends
+        it starts from libvlc's event thread without waiting for a frame.
+
+        Args:
+            newSong (str | None): audio file path of the song likely to play
+                next, None if nothing plays next
+        """
+        if self.preloaded == newSong:
+            return
+
+        self.preloaded = newSong
+        self.pool.submit(self._preroll, 1 - self.active, newSong)
+
+    def playsong(self, newSong, sname, start_ms: int = 0, paused: bool = False):
+        # Measured until libvlc reports the Playing state
+        metrics = get_metrics()
+        metrics.begin("track_switch")
+        metrics.counter("tracks_played").inc()
+
         self.current_song_name = sname
-        
-        if nm := get_audio_metadata(newSong):
-            self.current_song_title = nm["title"]
-            self.current_song_artist = nm["artist"]
+        self.current_time = start_ms
+        self.current_length = -1
+
+        # Known if the song was preloaded, otherwise sent by the worker as an event
+        metadata_known = self.next_metadata is not None and self.next_metadata[0] == newSong
+        if metadata_known:
+            self._apply_metadata(self.next_metadata[1])
         else:
             self.current_song_title = sname
-            self.current_song_artist = sname
+            self.current_song_artist = None
 
-        if self.current_song.get_state() == vlc.State.Playing or self.current_song.get_state() == vlc.State.Paused:
-            self.current_song.stop()
+        # Switches to the idle player, it may already hold this song.
+        # The previous one is stopped by the worker, libvlc's stop blocks for a while
+        previous = self.active
+        self.active = 1 - previous
+        self.current_song = self.players[self.active]
+        self.preloaded = None
 
-        self.current_song = vlc.MediaPlayer(newSong)
-        self.current_song.play()
-        
-        if self.current_song_title == None:
-            self.current_song_title = sname
+        self.pool.submit(self._switch, previous, self.active, newSong, start_ms, paused, metadata_known)
+
+        log.info("Playing %s", self.current_song_title)
+
+    def toggle_pause(self) -> None:
+        """Pauses a playing song or resumes a paused one
+        """
+        match self.current_song.get_state():
+            case vlc.State.Paused:
+                # play() would replay the :start-paused of a pre-rolled song
+                self.current_song.set_pause(0)
+            case vlc.State.Playing:
+                self.current_song.pause()
+
+    def seek(self, time_ms: int) -> bool:
+        """Moves the current song to a position
+
+        Args:
+            time_ms (int): position in ms, clamped to the song length when known
+
+        Returns:
+            bool: False if no song is playing or paused
+        """
+        if self.current_state not in (vlc.State.Playing, vlc.State.Paused):
+            return False
+
+        time_ms = max(time_ms, 0)
+        if self.current_length > 0:
+            time_ms = min(time_ms, self.current_length)
 
-        print(self.current_song_title)
-        
+        self.current_song.set_time(time_ms)
+        self.current_time = time_ms
+        return True
+
+    def set_volume(self, volume: int) -> int:
+        """Sets the volume of the current and next songs
+
+        Args:
+            volume (int): 0 to 100, clamped
+
+        Returns:
+            int: the volume set
+        """
+        self.current_volume = min(max(volume, 0), 100)
+        self.current_song.audio_set_volume(self.current_volume)
+        return self.current_volume
+
+    def is_playing(self) -> bool:
+        return self.current_state == vlc.State.Playing
+
+    def is_paused(self) -> bool:
+        return self.current_state == vlc.State.Paused
+
+    def _unload(self, index: int) -> None:
+        # Events the stop still queues belong to the forgotten song
+        self.loads[index] += 1
+        self.players[index].stop()
+        self._preroll(1 - index, None)
 
     def stop(self):
-        self.current_song.stop()
+        self.pool.submit(self.current_song.stop)
+
+    def unload(self) -> None:
+        """Stops the current song and forgets it, for a song list it isn't part of
+        """
+        self.pool.submit(self._unload, self.active)
+        self.preloaded = None
+
+        self.current_song_name = None
+        self.current_song_title = None
+        self.current_song_artist = None
+        self.current_time = -1
+        self.current_length = -1
+        self.current_state = vlc.State.Stopped
     
     def input(self, event) -> None:
         self.current_volume = self.current_song.audio_get_volume()
 
         if event == "up arrow":
             if self.current_volume < 100:
-                self.current_song.audio_set_volume(self.current_volume + 2)
+                self.current_song.audio_set_volume(min(self.current_volume + 2, 100))
 
-                if self.current_volume > 100:
-                    self.current_song.audio_set_volume(100)
-                
         elif event == "down arrow":
             if self.current_volume >= 1:
                 self.current_song.audio_set_volume(self.current_volume - 1)
+
+        else:
+            return
+
+        self.current_volume = self.current_song.audio_get_volume()
         
\ No newline at end of file
@@ -0,0 +1,226 @@
+import os
+import json
+import asyncio
+import logging
+import threading
+from collections import deque
+from pathlib import PosixPath
+from time import perf_counter_ns
+from typing import Any, Callable
+
+from ursina import Entity
+
+from .metrics import get_metrics
+
+
+log = logging.getLogger(__name__)
+
+# Handlers run on the render thread and get the request's JSON object
+Handler = Callable[[dict], Any]
+
+
+class ControlError(Exception):
+    """Raised by handlers for requests that can't be done, sent back as an error reply
+    """
+
+
+class ControlServer(Entity):
+    def __init__(self, socket_path: PosixPath | str, handlers: dict[str, Handler] | None = None,
+                 on_command: Callable[[], None] | None = None,
+                 max_line: int = 64 * 1024, max_pending_events: int = 64) -> None:
+        """Controls the player from other processes over a Unix socket
+
+        Clients send one JSON object per line, example:
+            {"id": 1, "cmd": "volume", "value": 40}
+        and get one reply line per request, in order:
+            {"id": 1, "ok": true, "result": 40}
+            {"id": 2, "ok": false, "error": "unknown command: foo"}
+
+        The asyncio loop runs on its own thread; commands are queued and run
+        by update() on the render thread, so a reply waits one frame at most
+        (1 / --idle-fps while nobody uses the player). After
+        {"cmd": "subscribe"} a client also gets {"event": ..., ...} lines
+        pushed by publish(). A client that reads too slowly only loses its
+        oldest events.
+
+        Args:
+            socket_path (PosixPath | str): socket file, replaced if it exists
+            handlers (dict[str, Handler] | None, optional): command name to handler,
+                can be filled later. Defaults to none, every command is refused.
+            on_command (Callable[[], None] | None, optional): called after a frame
+                ran commands, example: FrameScheduler.wake
+            max_line (int, optional): longest request in bytes. Defaults to 64 KiB.
+            max_pending_events (int, optional): events kept per slow subscriber. Defaults to 64.
+        """
+        super().__init__()
+
+        self.socket_path: str = os.fspath(socket_path)
+        self.handlers: dict[str, Handler] = handlers if handlers is not None else {}
+        self.on_command: Callable[[], None] | None = on_command
+        self.max_line: int = max_line
+        self.max_pending_events: int = max_pending_events
+
+        # deque.append/popleft are atomic, the loop thread never takes a lock here
+        self.requests: deque[tuple[dict, asyncio.Future, int]] = deque()
+
+        # Subscribers' event queues, only touched on the loop thread
+        self.subscribers: set[asyncio.Queue] = set()
+        self.clients: int = 0
+
+        self.loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self.server: asyncio.AbstractServer | None = None
+        self.ready: threading.Event = threading.Event()
+        self.error: OSError | None = None
+
+        self.thread: threading.Thread = threading.Thread(
+            target=self._run,
+            name="control-server",
+            daemon=True
+        )
+
+    def start(self) -> "ControlServer":
+        """Starts listening, returns once the socket accepts connections
+        """
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+        self.thread.start()
+        self.ready.wait()
+
+        if self.error:
+            raise self.error
+        return self
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+
+        try:
+            self.server = self.loop.run_until_complete(asyncio.start_unix_server(
+                self._client, path=self.socket_path, limit=self.max_line
+            ))
+        except OSError as e:
+            self.error = e
+            return
+        finally:
+            self.ready.set()
+
+        log.info("Control socket listening on %s", self.socket_path)
+        self.loop.run_forever()
+
+    async def _send_events(self, writer: asyncio.StreamWriter, events: asyncio.Queue) -> None:
+        while True:
+            writer.write(await events.get())
+            await writer.drain()
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.clients += 1
+        events: asyncio.Queue | None = None
+        sender: asyncio.Task | None = None
+
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                except ValueError as e:
+                    writer.write(self._encode({"id": None, "ok": False, "error": f"bad request: {e}"}))
+                    await writer.drain()
+                    continue
+
+                if request.get("cmd") == "subscribe" and events is None:
+                    events = asyncio.Queue(maxsize=self.max_pending_events)
+                    self.subscribers.add(events)
+
+                future = self.loop.create_future()
+                self.requests.append((request, future, perf_counter_ns()))
+                reply = await future
+
+                # Replies go out before events queued after them
+                writer.write(self._encode(reply))
+                await writer.drain()
+
+                if events is not None and sender is None:
+                    sender = asyncio.create_task(self._send_events(writer, events))
+
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            self.clients -= 1
+            if events is not None:
+                self.subscribers.discard(events)
+            if sender:
+                sender.cancel()
+            writer.close()
+
+    @staticmethod
+    def _encode(message: dict) -> bytes:
+        return json.dumps(message, ensure_ascii=False, default=str).encode() + b"\n"
+
+    def _reply(self, future: asyncio.Future, reply: dict) -> None:
+        if not future.done():
+            future.set_result(reply)
+
+    def _push(self, line: bytes) -> None:
+        for events in self.subscribers:
+            # Only the latest state matters to a client that fell behind
+            if events.full():
+                events.get_nowait()
+            events.put_nowait(line)
+
+    def publish(self, event: str, data: dict) -> None:
+        """Pushes an event to every subscribed client. Render thread only
+
+        Args:
+            event (str): event name, example: "state"
+            data (dict): JSON-serializable fields sent with it
+        """
+        if self.subscribers:
+            self.loop.call_soon_threadsafe(self._push, self._encode({"event": event, **data}))
+
+    def update(self) -> None:
+        """Runs the commands received since the last frame
+        """
+        if not self.requests:
+            return
+
+        latency = get_metrics().histogram("control_latency")
+
+        while self.requests:
+            request, future, received = self.requests.popleft()
+            cmd = request.get("cmd")
+            reply = {"id": request.get("id")}
+
+            try:
+                if not self.handlers:
+                    raise ControlError("player is still loading")
+
+                handler = self.handlers.get(cmd)
+                if handler is None:
+                    raise ControlError(f"unknown command: {cmd}")
+                reply.update(ok=True, result=handler(request))
+            except ControlError as e:
+                reply.update(ok=False, error=str(e))
+            except Exception as e:
+                log.exception("Control command %s failed", cmd)
+                reply.update(ok=False, error=f"{type(e).__name__}: {e}")
+
+            self.loop.call_soon_threadsafe(self._reply, future, reply)
+            latency.record_since(received)
+
+        if self.on_command:
+            self.on_command()
+
+    def close(self) -> None:
+        """Stops the server and removes the socket file
+        """
+        if self.server:
+            self.loop.call_soon_threadsafe(self.server.close)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
@@ -0,0 +1,173 @@
+import os
+import json
+import threading
+from collections import deque
+from functools import wraps
+from pathlib import PosixPath
+from time import perf_counter_ns
+from typing import Callable
+
+from ursina import scene
+
+from . import audio_scripts
+
+
+# libvlc methods timed when python-vlc is loaded, by class name
+VLC_CALLS: dict[str, tuple[str, ...]] = {
+    "MediaPlayer": (
+        "play", "stop", "pause", "set_pause", "set_media", "get_state",
+        "audio_get_volume", "audio_set_volume", "get_time", "get_length", "event_manager",
+    ),
+    "Instance": ("media_new_path", "media_player_new"),
+    "Media": ("parse_with_options",),
+}
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Returns the value below which a fraction of the sorted values falls
+
+    Args:
+        values (list[float]): sorted values
+        fraction (float): 0 to 1, example: .99
+
+    Returns:
+        float: nearest-rank percentile, 0 if values is empty
+    """
+    if not values:
+        return 0
+    return values[min(int(fraction * len(values)), len(values) - 1)]
+
+
+class FrameProfiler():
+    def __init__(self, app, max_events: int = 1_000_000) -> None:
+        """Times entity updates, input handlers and libvlc calls per frame
+
+        Nothing is wrapped until start() is called, so an unused profiler
+        costs nothing. Events are kept as Chrome trace events ("X" phase) and
+        can be opened in chrome://tracing or Perfetto.
+
+        Args:
+            app (Ursina): running application
+            max_events (int, optional): events kept, older ones are dropped.
+                Defaults to 1_000_000.
+        """
+        self.app = app
+        self.pid: int = os.getpid()
+        self.events: deque[dict] = deque(maxlen=max_events)
+        self.frame_times: list[float] = []
+
+        # Total and worst time per handler, in ns
+        self.totals: dict[str, int] = {}
+        self.worst: dict[str, int] = {}
+
+        self.vlc_wrapped: bool = False
+        self.frame_start: int = 0
+        self.render_start: int = 0
+
+    def _record(self, name: str, category: str, start: int, end: int) -> None:
+        duration = end - start
+
+        self.events.append({
+            "name": name, "cat": category, "ph": "X", "pid": self.pid,
+            "tid": threading.get_ident(), "ts": start / 1000, "dur": duration / 1000,
+        })
+
+        self.totals[name] = self.totals.get(name, 0) + duration
+        if duration > self.worst.get(name, 0):
+            self.worst[name] = duration
+
+    def _wrap(self, fn: Callable, name: str, category: str) -> Callable:
+        @wraps(fn)
+        def timed(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._record(name, category, start, perf_counter_ns())
+
+        timed.profiled = True
+        return timed
+
+    def _instrument_entities(self) -> None:
+        # Checked every frame, entities come and go and may swap their handlers
+        for entity in scene.entities:
+            for handler in ("update", "input"):
+                fn = getattr(entity, handler, None)
+                if callable(fn) and not getattr(fn, "profiled", False):
+                    name = getattr(fn, "__qualname__", f"{type(entity).__name__}.{handler}")
+                    setattr(entity, handler, self._wrap(fn, name, handler))
+
+    def _instrument_vlc(self) -> None:
+        # python-vlc is loaded lazily, on a background thread
+        vlc = audio_scripts.vlc
+        if vlc is None or self.vlc_wrapped:
+            return
+        self.vlc_wrapped = True
+
+        for class_name, methods in VLC_CALLS.items():
+            cls = getattr(vlc, class_name)
+            for method in methods:
+                if fn := getattr(cls, method, None):
+                    setattr(cls, method, self._wrap(fn, f"vlc.{class_name}.{method}", "libvlc"))
+
+    def _frame_begin(self, task):
+        now = perf_counter_ns()
+
+        if self.frame_start:
+            self._record("render", "engine", self.render_start, now)
+            self._record("frame", "frame", self.frame_start, now)
+            self.frame_times.append((now - self.frame_start) / 1e6)
+
+        self.frame_start = now
+        self._instrument_entities()
+        self._instrument_vlc()
+        return task.cont
+
+    def _frame_render(self, task):
+        self.render_start = perf_counter_ns()
+        return task.cont
+
+    def start(self) -> "FrameProfiler":
+        """Starts timing from the next frame
+        """
+        # Around ursina's update task (sort 0) and Panda3D's render (igLoop, sort 50)
+        self.app.taskMgr.add(self._frame_begin, "profiler-frame-begin", sort=-100)
+        self.app.taskMgr.add(self._frame_render, "profiler-frame-render", sort=49)
+        return self
+
+    def summary(self, top: int = 5) -> str:
+        """Returns frame time percentiles and the slowest handlers
+
+        Args:
+            top (int, optional): handlers listed. Defaults to 5.
+
+        Returns:
+            str: human-readable summary
+        """
+        times = sorted(self.frame_times)
+        lines = [
+            f"{len(times)} frames: p50 {percentile(times, .5):.2f} ms, "
+            f"p99 {percentile(times, .99):.2f} ms, max {percentile(times, 1):.2f} ms"
+        ]
+
+        handlers = sorted(
+            (name for name in self.totals if name not in ("frame", "render")),
+            key=lambda name: self.totals[name], reverse=True
+        )
+        for name in handlers[:top]:
+            lines.append(
+                f"  {name}: {self.totals[name] / 1e6:.2f} ms total, "
+                f"{self.totals[name] / 1e6 / max(len(times), 1):.3f} ms/frame, "
+                f"worst {self.worst[name] / 1e6:.2f} ms"
+            )
+
+        return "\n".join(lines)
+
+    def dump(self, trace_path: PosixPath | str) -> None:
+        """Writes the recorded events as a Chrome trace-event JSON file
+
+        Args:
+            trace_path (PosixPath | str): output file
+        """
+        with open(trace_path, "w") as f:
+            json.dump({"traceEvents": list(self.events), "displayTimeUnit": "ms"}, f)
@@ -0,0 +1,86 @@
+from time import perf_counter
+from typing import Callable
+
+from panda3d.core import ClockObject
+from ursina import Entity, mouse
+
+
+class FrameScheduler(Entity):
+    def __init__(
+        self,
+        fps_cap: float = 60,
+        playing_fps: float = 30,
+        idle_fps: float = 5,
+        active_time: float = 2.0
+    ) -> None:
+        """Lowers the frame rate while nobody is using the player
+
+        Runs at fps_cap while keys are pressed or the mouse moves and for
+        active_time seconds after, at playing_fps while a song plays untouched
+        and at idle_fps otherwise. Rates are applied with Panda3D's limited
+        clock mode, which sleeps between frames instead of rendering. Frame
+        stepping with a fixed dt (non-real-time clock) is left alone.
+
+        Until is_playing is set (loading screen) the player counts as animating.
+
+        Args:
+            fps_cap (float, optional): highest frame rate, 0 for uncapped. Defaults to 60.
+            playing_fps (float, optional): rate while playing without input. Defaults to 30.
+            idle_fps (float, optional): rate while paused or stopped without input. Defaults to 5.
+            active_time (float, optional): seconds at full rate after input. Defaults to 2.0.
+        """
+        super().__init__()
+
+        self.fps_cap: float = fps_cap
+        self.playing_fps: float = playing_fps
+        self.idle_fps: float = idle_fps
+        self.active_time: float = active_time
+
+        self.is_playing: Callable[[], bool] | None = None
+        self.clock: ClockObject = ClockObject.getGlobalClock()
+        self.last_input: float = perf_counter()
+        self.rate: float | None = None
+
+    def _limit(self, rate: float) -> float:
+        return min(rate, self.fps_cap) if self.fps_cap else rate
+
+    def wake(self) -> None:
+        """Goes back to the full rate, for changes not caused by input
+        """
+        self.last_input = perf_counter()
+
+    def target_rate(self) -> float:
+        """Returns the frame rate the player should run at now, 0 for uncapped
+        """
+        if self.is_playing is None or perf_counter() - self.last_input < self.active_time:
+            return self.fps_cap
+        if self.is_playing():
+            return self._limit(self.playing_fps)
+        return self._limit(self.idle_fps)
+
+    def set_rate(self, rate: float) -> None:
+        """Applies a frame rate to the global clock
+
+        Args:
+            rate (float): frames per second, 0 for uncapped
+        """
+        self.rate = rate
+
+        if rate:
+            self.clock.setMode(ClockObject.MLimited)
+            self.clock.setFrameRate(rate)
+        else:
+            self.clock.setMode(ClockObject.MNormal)
+
+    def input(self, key: str) -> None:
+        self.wake()
+
+    def update(self) -> None:
+        if self.clock.getMode() == ClockObject.MNonRealTime:
+            return
+
+        if mouse.moving:
+            self.wake()
+
+        if (rate := self.target_rate()) != self.rate:
+            self.set_rate(rate)
@@ -0,0 +1,189 @@
+import json
+import logging
+import weakref
+from collections import deque
+from pathlib import PosixPath
+from time import perf_counter
+
+from panda3d.core import DynamicTextFont, FontPool
+from ursina import Entity, Text
+
+from .app_dirs import cache_dir
+
+
+log = logging.getLogger(__name__)
+
+# Pixels per font unit, what Interface used to set for every Text
+DEFAULT_RESOLUTION: int = round(1080 * Text.size)
+
+
+class GlyphCache(Entity):
+    def __init__(
+        self,
+        resolution: int = DEFAULT_RESOLUTION,
+        max_bytes: int = 16 * 1024 ** 2,
+        max_chars: int = 4096,
+        prewarm_budget: float = .002,
+        cache_file: PosixPath | None = None
+    ) -> None:
+        """Font instances per (font, resolution), with glyphs warmed from earlier runs
+
+        ursina's Text shares one pooled font per file and clears its glyphs
+        every time a Text picks it, and a resolution change on one widget
+        rasterizes every widget's glyphs again. Texts given to apply() get a
+        font of their own resolution instead, which nothing clears.
+
+        Characters shown on those Texts are counted and saved; the next run
+        rasterizes the most used ones a few at a time while the loading screen
+        plays. When the glyph pages of all fonts grow over max_bytes, glyphs no
+        longer shown on screen are dropped (rarely used CJK glyphs, mostly).
+
+        Args:
+            resolution (int, optional): default pixels per font unit. Defaults to DEFAULT_RESOLUTION.
+            max_bytes (int, optional): glyph texture memory before eviction. Defaults to 16 MiB.
+            max_chars (int, optional): characters saved per font. Defaults to 4096.
+            prewarm_budget (float, optional): seconds of rasterizing per frame. Defaults to 2 ms.
+            cache_file (PosixPath | None, optional): JSON usage file.
+                Defaults to glyphs.json in the cache directory.
+        """
+        super().__init__()
+
+        self.resolution: int = resolution
+        self.max_bytes: int = max_bytes
+        self.max_chars: int = max_chars
+        self.prewarm_budget: float = prewarm_budget
+        self.cache_file: PosixPath = cache_file or cache_dir() / "glyphs.json"
+
+        # Keyed by "font path@resolution"
+        self.fonts: dict[str, DynamicTextFont] = {}
+        self.usage: dict[str, dict[str, int]] = self._read()
+        self.prewarm: deque[tuple[str, str]] = deque()
+
+        # Texts using our fonts and the text they showed last
+        self.texts: weakref.WeakKeyDictionary[Text, tuple[str, str]] = weakref.WeakKeyDictionary()
+
+        self.evictions: int = 0
+        self._last_bytes_check: float = 0
+
+    def _read(self) -> dict[str, dict[str, int]]:
+        try:
+            with open(self.cache_file) as f:
+                usage = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        return usage if isinstance(usage, dict) else {}
+
+    def save(self) -> None:
+        """Writes the most used characters of each font to the cache file
+        """
+        usage = {
+            key: dict(sorted(chars.items(), key=lambda item: item[1], reverse=True)[:self.max_chars])
+            for key, chars in self.usage.items()
+        }
+
+        try:
+            with open(self.cache_file, "w") as f:
+                json.dump(usage, f, ensure_ascii=False)
+        except OSError as e:
+            log.warning("Couldn't save glyph cache: %s", e)
+
+    def font(self, font_path: str, resolution: int | None = None) -> DynamicTextFont | None:
+        """Returns the font instance of a font file at a resolution
+
+        Args:
+            font_path (str): font file, as given to Text
+            resolution (int | None, optional): pixels per font unit. Defaults to self.resolution.
+
+        Returns:
+            DynamicTextFont | None: None if the file can't be loaded
+        """
+        key = f"{font_path}@{resolution or self.resolution}"
+        if key in self.fonts:
+            return self.fonts[key]
+
+        pooled = FontPool.loadFont(font_path)
+        if pooled is None:
+            return None
+
+        # A copy shares the face but not the glyph pages
+        font = pooled.makeCopy()
+        font.setPixelsPerUnit(resolution or self.resolution)
+        self.fonts[key] = font
+
+        # Most used characters first
+        chars = self.usage.get(key, {})
+        self.prewarm.extend((key, char) for char in sorted(chars, key=chars.get, reverse=True))
+
+        return font
+
+    def apply(self, text: Text, font_path: str, resolution: int | None = None) -> None:
+        """Makes a Text use a font at its own resolution
+
+        Args:
+            text (Text): widget
+            font_path (str): font file, example: "assets/fonts/Audiowide/Audiowide-Regular.ttf"
+            resolution (int | None, optional): pixels per font unit. Defaults to self.resolution.
+        """
+        font = self.font(font_path, resolution)
+        if font is None:
+            text.font = font_path
+            return
+
+        key = f"{font_path}@{resolution or self.resolution}"
+        font.setLineHeight(text.line_height)
+        text._font = font
+        self.texts[text] = (key, "")
+
+        # Rebuilds the text nodes with the new font
+        if raw_text := getattr(text, "raw_text", None):
+            text.text = raw_text
+
+    def _count(self) -> None:
+        for text, (key, shown) in list(self.texts.items()):
+            raw_text = getattr(text, "raw_text", None) or ""
+            if raw_text == shown:
+                continue
+
+            self.texts[text] = (key, raw_text)
+            chars = self.usage.setdefault(key, {})
+            for char in set(raw_text):
+                if not char.isspace():
+                    chars[char] = chars.get(char, 0) + 1
+
+    def _prewarm(self) -> None:
+        deadline = perf_counter() + self.prewarm_budget
+
+        while self.prewarm and perf_counter() < deadline:
+            key, char = self.prewarm.popleft()
+            self.fonts[key].getGlyph(ord(char))
+
+    def glyph_bytes(self) -> int:
+        """Returns the texture memory used by the glyph pages of every font
+        """
+        return sum(
+            page.getExpectedRamImageSize()
+            for font in self.fonts.values()
+            for page in font.getPages()
+        )
+
+    def _evict(self) -> None:
+        if self.glyph_bytes() <= self.max_bytes:
+            return
+
+        # Glyphs no text node uses anymore
+        for font in self.fonts.values():
+            self.evictions += font.garbageCollect()
+
+        log.debug("Glyph pages over %d bytes, %d glyphs evicted", self.max_bytes, self.evictions)
+
+    def update(self) -> None:
+        """Counts shown characters, warms glyphs and keeps the memory cap
+        """
+        self._count()
+        self._prewarm()
+
+        now = perf_counter()
+        if now - self._last_bytes_check >= 1:
+            self._last_bytes_check = now
+            self._evict()
@@ -0,0 +1,65 @@
+from typing import Any
+
+
+_UNSET = object()
+
+
+class HudViewModel():
+    def __init__(self, refresh_rate: float = 4.0, throttled: tuple[str, ...] = ("time", "progress")) -> None:
+        """Keeps what the HUD currently shows and reports only what changed
+
+        Args:
+            refresh_rate (float, optional): refreshes per second of the throttled
+                fields, 0 or less refreshes them every frame. Defaults to 4.0.
+            throttled (tuple[str, ...], optional): fields refreshed at refresh_rate
+                instead of every frame. Defaults to ("time", "progress").
+        """
+        self.refresh_interval: float = 1 / refresh_rate if refresh_rate > 0 else 0
+        self.throttled: frozenset[str] = frozenset(throttled)
+
+        self.shown: dict[str, Any] = {}
+        self.elapsed: float = self.refresh_interval
+
+    def changes(self, state: dict[str, Any], dt: float) -> dict[str, Any]:
+        """Diffs a new HUD state against the shown one
+
+        Args:
+            state (dict[str, Any]): field name -> value to display
+            dt (float): seconds since the last call
+
+        Returns:
+            dict[str, Any]: fields whose value changed, to be applied to the widgets
+        """
+        self.elapsed += dt
+        refresh_throttled = self.elapsed >= self.refresh_interval
+
+        if refresh_throttled:
+            self.elapsed = 0
+
+        changed = {}
+        for field, value in state.items():
+            if not refresh_throttled and field in self.throttled:
+                continue
+
+            if self.shown.get(field, _UNSET) != value:
+                self.shown[field] = value
+                changed[field] = value
+
+        return changed
+
+    def invalidate(self, *fields: str) -> None:
+        """Forces fields to be reported on the next changes() call
+
+        Args:
+            *fields (str): field names, all fields if none is given
+        """
+        if not fields:
+            self.shown.clear()
+            self.elapsed = self.refresh_interval
+            return
+
+        for field in fields:
+            self.shown.pop(field, None)
+
+            if field in self.throttled:
+                self.elapsed = self.refresh_interval
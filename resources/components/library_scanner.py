@@ -0,0 +1,159 @@
+import os
+import threading
+import time
+from collections import deque
+from pathlib import PosixPath
+from typing import Iterator
+
+
+DEFAULT_EXTENSIONS: frozenset[str] = frozenset({".flac", ".mp3", ".m4a", ".ogg"})
+
+
+def normalize_extensions(extensions: list[str] | frozenset[str]) -> frozenset[str]:
+    """Returns lower-case extensions with a leading dot
+
+    Args:
+        extensions (list[str] | frozenset[str]): extensions like "mp3" or ".FLAC"
+
+    Returns:
+        frozenset[str]: normalized extensions, example: {".mp3", ".flac"}
+    """
+    return frozenset(
+        ext.lower() if ext.startswith(".") else f".{ext.lower()}"
+        for ext in extensions if ext
+    )
+
+
+def scan_library(root: PosixPath | str,
+                 extensions: frozenset[str] = DEFAULT_EXTENSIONS,
+                 recursive: bool = True,
+                 follow_symlinks: bool = True,
+                 dirs: dict[str, int] | None = None) -> Iterator[str]:
+    """Yields audio files under root, as paths relative to root
+
+    Files of a directory are yielded (sorted) before its sub-directories are
+    entered, so the first album is available right away on large trees.
+    Directories reached twice (symlink loops, bind mounts) are skipped.
+
+    Args:
+        root (PosixPath | str): library directory
+        extensions (frozenset[str], optional): lower-case extensions to accept.
+            Defaults to DEFAULT_EXTENSIONS.
+        recursive (bool, optional): descend into sub-directories. Defaults to True.
+        follow_symlinks (bool, optional): follow symlinked directories. Defaults to True.
+        dirs (dict[str, int] | None, optional): filled with the mtime_ns of every
+            directory listed, by relative path ("" for root). Defaults to None.
+
+    Yields:
+        Iterator[str]: relative file path, example: "Artist/Album/01.flac"
+    """
+    root = os.fspath(root)
+    visited: set[tuple[int, int]] = set()
+    stack: list[str] = [""]
+
+    while stack:
+        rel_dir = stack.pop()
+        abs_dir = os.path.join(root, rel_dir) if rel_dir else root
+
+        try:
+            st = os.stat(abs_dir)
+            if (st.st_dev, st.st_ino) in visited:
+                continue
+            visited.add((st.st_dev, st.st_ino))
+            if dirs is not None:
+                dirs[rel_dir] = st.st_mtime_ns
+
+            with os.scandir(abs_dir) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_file():
+                    if os.path.splitext(entry.name)[1].lower() in extensions:
+                        yield os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+
+                elif recursive and entry.is_dir(follow_symlinks=follow_symlinks):
+                    subdirs.append(os.path.join(rel_dir, entry.name) if rel_dir else entry.name)
+            except OSError:
+                continue
+
+        # Reversed so sub-directories are popped in name order
+        stack.extend(reversed(subdirs))
+
+
+class LibraryScan():
+    def __init__(self, scanner: Iterator[str], batch_size: int = 256, flush_interval: float = .1) -> None:
+        """Runs a library scanner on a background thread
+
+        Results are buffered in batches; poll() hands them to the render thread.
+
+        Args:
+            scanner (Iterator[str]): scan_library generator
+            batch_size (int, optional): files per batch. Defaults to 256.
+            flush_interval (float, optional): seconds after which a partial batch
+                is handed over anyway, for slow (network) trees. Defaults to .1.
+        """
+        self.scanner: Iterator[str] = scanner
+        self.batch_size: int = batch_size
+        self.flush_interval: float = flush_interval
+        self.batches: deque[list[str]] = deque()
+        self.done: bool = False
+        self.cancelled: bool = False
+
+        self.thread: threading.Thread = threading.Thread(
+            target=self._run,
+            name="library-scan",
+            daemon=True
+        )
+        self.thread.start()
+
+    def _run(self) -> None:
+        batch: list[str] = []
+        limit = 5
+        last_flush = time.monotonic()
+
+        try:
+            for file in self.scanner:
+                if self.cancelled:
+                    return
+
+                batch.append(file)
+
+                # First batch is flushed early so the first page shows up at once
+                if len(batch) >= limit or time.monotonic() - last_flush >= self.flush_interval:
+                    self.batches.append(batch)
+                    batch = []
+                    limit = self.batch_size
+                    last_flush = time.monotonic()
+        finally:
+            if batch:
+                self.batches.append(batch)
+            self.done = True
+
+    def poll(self) -> list[str]:
+        """Returns the files found since the last poll
+
+        Returns:
+            list[str]: relative file paths, empty if there's nothing new
+        """
+        if not self.batches:
+            return []
+
+        files = []
+        while self.batches:
+            files.extend(self.batches.popleft())
+
+        return files
+
+    def finished(self) -> bool:
+        """Returns True when the scan ended and every batch was polled
+        """
+        return self.done and not self.batches
+
+    def cancel(self) -> None:
+        """Stops the scan thread after its current file
+        """
+        self.cancelled = True
@@ -0,0 +1,449 @@
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from pathlib import PosixPath
+
+from .library_scanner import DEFAULT_EXTENSIONS, scan_library
+
+
+# Delta kinds returned by LibraryWatcher.poll()
+ADDED: str = "added"
+REMOVED: str = "removed"
+RENAMED: str = "renamed"
+MODIFIED: str = "modified"
+REMOVED_TREE: str = "removed_tree"
+LISTED: str = "listed"
+RESCANNED: str = "rescanned"
+
+Delta = tuple[str, str, str | None]
+
+
+class LibraryWatcher(ABC):
+    def __init__(self, root: PosixPath | str, extensions: frozenset[str] = DEFAULT_EXTENSIONS,
+                 recursive: bool = True, follow_symlinks: bool = True) -> None:
+        """Base class of library watchers
+
+        Watchers run on a background thread and queue deltas as
+        (kind, path, new_path) tuples with paths relative to root. new_path is
+        only set for RENAMED; REMOVED_TREE means every song under path is gone.
+        When events were lost, the songs under path are listed again as LISTED,
+        which may be known already, then RESCANNED tells the songs under path
+        that weren't listed are gone. They see the same files as scan_library
+        with the same settings.
+
+        Args:
+            root (PosixPath | str): library directory
+            extensions (frozenset[str], optional): lower-case extensions to watch.
+                Defaults to DEFAULT_EXTENSIONS.
+            recursive (bool, optional): watch sub-directories. Defaults to True.
+            follow_symlinks (bool, optional): follow symlinked directories. Defaults to True.
+        """
+        self.root: str = os.fspath(root)
+        self.extensions: frozenset[str] = extensions
+        self.recursive: bool = recursive
+        self.follow_symlinks: bool = follow_symlinks
+        self.deltas: deque[Delta] = deque()
+        self.running: bool = True
+
+        self.thread: threading.Thread = threading.Thread(
+            target=self._run,
+            name=f"library-watch-{type(self).__name__}",
+            daemon=True
+        )
+
+    def start(self) -> "LibraryWatcher":
+        self.thread.start()
+        return self
+
+    @abstractmethod
+    def _run(self) -> None:
+        """Watches the library until stop() is called, on the watcher thread
+        """
+
+    def _is_song(self, name: str) -> bool:
+        return os.path.splitext(name)[1].lower() in self.extensions
+
+    def _rel(self, *parts: str) -> str:
+        return os.path.join(*[p for p in parts if p])
+
+    def _emit_tree(self, rel_dir: str, kind: str = ADDED) -> None:
+        # A directory appeared, every song inside it is new
+        for name in scan_library(os.path.join(self.root, rel_dir), self.extensions,
+                                 recursive=self.recursive, follow_symlinks=self.follow_symlinks):
+            self.deltas.append((kind, self._rel(rel_dir, name), None))
+
+    def poll(self) -> list[Delta]:
+        """Returns the deltas detected since the last poll
+
+        Returns:
+            list[Delta]: (kind, path, new_path) tuples, empty if nothing changed
+        """
+        if not self.deltas:
+            return []
+
+        deltas = []
+        while self.deltas:
+            deltas.append(self.deltas.popleft())
+
+        return deltas
+
+    def stop(self) -> None:
+        """Stops the watcher thread
+        """
+        self.running = False
+
+
+class InotifyWatcher(LibraryWatcher):
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM  = 0x00000040
+    IN_MOVED_TO    = 0x00000080
+    IN_CREATE      = 0x00000100
+    IN_DELETE      = 0x00000200
+    IN_Q_OVERFLOW  = 0x00004000
+    IN_IGNORED     = 0x00008000
+    IN_ONLYDIR     = 0x01000000
+    IN_ISDIR       = 0x40000000
+    IN_NONBLOCK    = 0o4000
+    IN_CLOEXEC     = 0o2000000
+
+    WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+                  | IN_CREATE | IN_DELETE | IN_ONLYDIR)
+
+    _HEADER = struct.Struct("iIII")
+
+    def __init__(self, root: PosixPath | str, extensions: frozenset[str] = DEFAULT_EXTENSIONS,
+                 recursive: bool = True, follow_symlinks: bool = True) -> None:
+        """Watches a library with Linux inotify, one watch per directory
+
+        Watches are added on the watcher thread. If the tree needs more watches
+        than fs.inotify.max_user_watches allows, it falls back to a PollingWatcher.
+        Without recursive only the root is watched.
+
+        Raises:
+            OSError: inotify is unavailable
+        """
+        super().__init__(root, extensions, recursive, follow_symlinks)
+
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd: int = self.libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.watches: dict[int, str] = {}
+        self.watched_dirs: set[str] = set()
+        self.fallback: PollingWatcher | None = None
+
+    def _add_watch(self, rel_dir: str) -> None:
+        path = os.path.join(self.root, rel_dir).encode()
+        wd = self.libc.inotify_add_watch(self.fd, path, self.WATCH_MASK)
+
+        if wd < 0:
+            err = ctypes.get_errno()
+            # Directory vanished meanwhile, nothing to watch
+            if err in (errno.ENOENT, errno.ENOTDIR):
+                return
+            raise OSError(err, os.strerror(err))
+
+        # A directory reached twice (symlink) keeps its first path, like the scan
+        if wd not in self.watches:
+            self.watches[wd] = rel_dir
+            self.watched_dirs.add(rel_dir)
+
+    def _watch_tree(self, rel_dir: str) -> None:
+        if not self.recursive:
+            self._add_watch(rel_dir)
+            return
+
+        # Same walk as scan_library: symlinks followed by policy, loops skipped
+        visited: set[tuple[int, int]] = set()
+        stack: list[str] = [rel_dir]
+
+        while stack:
+            rel = stack.pop()
+            try:
+                st = os.stat(os.path.join(self.root, rel))
+                if (st.st_dev, st.st_ino) in visited:
+                    continue
+                visited.add((st.st_dev, st.st_ino))
+
+                with os.scandir(os.path.join(self.root, rel)) as it:
+                    stack.extend(
+                        self._rel(rel, entry.name) for entry in it
+                        if entry.is_dir(follow_symlinks=self.follow_symlinks)
+                    )
+            except OSError:
+                continue
+
+            self._add_watch(rel)
+
+    def _unwatch_tree(self, rel_dir: str) -> None:
+        prefix = rel_dir + os.sep
+        for wd, watched in list(self.watches.items()):
+            if watched == rel_dir or watched.startswith(prefix):
+                self.libc.inotify_rm_watch(self.fd, wd)
+                del self.watches[wd]
+                self.watched_dirs.discard(watched)
+
+    def _is_tree(self, rel_path: str, mask: int) -> bool:
+        if mask & self.IN_ISDIR:
+            return True
+        if not self.follow_symlinks:
+            return False
+
+        # Symlinks to directories come without IN_ISDIR
+        if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+            return os.path.isdir(os.path.join(self.root, rel_path))
+        return rel_path in self.watched_dirs
+
+    def _run(self) -> None:
+        try:
+            self._watch_tree("")
+        except OSError:
+            os.close(self.fd)
+
+            # Watch limit reached, poll into the same delta queue instead
+            self.fallback = PollingWatcher(self.root, self.extensions, self.recursive, self.follow_symlinks)
+            self.fallback.deltas = self.deltas
+            self.fallback.running = self.running
+            self.fallback._run()
+            return
+
+        try:
+            while self.running:
+                ready, _, _ = select.select([self.fd], [], [], .5)
+                if not ready:
+                    continue
+
+                try:
+                    data = os.read(self.fd, 64 * 1024)
+                except BlockingIOError:
+                    continue
+
+                try:
+                    self._handle(data)
+                except OSError:
+                    # A new directory couldn't be watched, keep the rest going
+                    continue
+        finally:
+            os.close(self.fd)
+
+    def stop(self) -> None:
+        """Stops the watcher thread
+        """
+        super().stop()
+        if self.fallback:
+            self.fallback.stop()
+
+    def _handle(self, data: bytes) -> None:
+        moved_from: dict[int, tuple[str, bool]] = {}
+        offset = 0
+
+        while offset < len(data):
+            wd, mask, cookie, length = self._HEADER.unpack_from(data, offset)
+            offset += self._HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode(errors="surrogateescape")
+            offset += length
+
+            if mask & self.IN_Q_OVERFLOW:
+                # Events were dropped, the library is listed again and diffed by the app
+                self._emit_tree("", LISTED)
+                self.deltas.append((RESCANNED, "", None))
+                continue
+
+            if mask & self.IN_IGNORED:
+                self.watched_dirs.discard(self.watches.pop(wd, None))
+                continue
+
+            if wd not in self.watches:
+                continue
+
+            rel_path = self._rel(self.watches[wd], name)
+            is_dir = self._is_tree(rel_path, mask)
+
+            # Sub-directories aren't listed without recursive
+            if is_dir and not self.recursive:
+                continue
+
+            if mask & self.IN_MOVED_FROM:
+                moved_from[cookie] = (rel_path, is_dir)
+
+            elif mask & self.IN_MOVED_TO:
+                old = moved_from.pop(cookie, None)
+
+                if is_dir:
+                    if old:
+                        self._unwatch_tree(old[0])
+                        self.deltas.append((REMOVED_TREE, old[0], None))
+                    self._watch_tree(rel_path)
+                    self._emit_tree(rel_path)
+                elif self._is_song(name):
+                    if old and self._is_song(old[0]):
+                        self.deltas.append((RENAMED, old[0], rel_path))
+                    else:
+                        self.deltas.append((ADDED, rel_path, None))
+                elif old and self._is_song(old[0]):
+                    self.deltas.append((REMOVED, old[0], None))
+
+            elif mask & self.IN_CREATE:
+                if is_dir:
+                    self._watch_tree(rel_path)
+                    self._emit_tree(rel_path)
+
+            elif mask & self.IN_CLOSE_WRITE:
+                # Covers both new files (once fully written) and tag edits
+                if self._is_song(name):
+                    self.deltas.append((MODIFIED, rel_path, None))
+
+            elif mask & self.IN_DELETE:
+                if is_dir:
+                    self.deltas.append((REMOVED_TREE, rel_path, None))
+                elif self._is_song(name):
+                    self.deltas.append((REMOVED, rel_path, None))
+
+        # Moved out of the library
+        for rel_path, is_dir in moved_from.values():
+            if is_dir:
+                self._unwatch_tree(rel_path)
+                self.deltas.append((REMOVED_TREE, rel_path, None))
+            elif self._is_song(rel_path):
+                self.deltas.append((REMOVED, rel_path, None))
+
+
+class PollingWatcher(LibraryWatcher):
+    def __init__(self, root: PosixPath | str, extensions: frozenset[str] = DEFAULT_EXTENSIONS,
+                 recursive: bool = True, follow_symlinks: bool = True, interval: float = 5.0) -> None:
+        """Watches a library by comparing directory mtimes every interval seconds
+
+        Only directories whose mtime changed are listed again, so a check costs
+        one stat per directory. Renames are detected by matching inode numbers
+        of removed and added files. Tag edits done in place (without replacing
+        the file) are not reported; the metadata index still catches them by mtime.
+
+        Args:
+            interval (float, optional): seconds between checks. Defaults to 5.0.
+        """
+        super().__init__(root, extensions, recursive, follow_symlinks)
+        self.interval: float = interval
+
+        # rel_dir -> (mtime_ns, {song name: (inode, mtime_ns)}, sub-directories)
+        self.snapshot: dict[str, tuple[int, dict[str, tuple[int, int]], list[str]]] = {}
+
+    def _list(self, rel_dir: str) -> tuple[dict[str, tuple[int, int]], list[str]]:
+        songs: dict[str, tuple[int, int]] = {}
+        subdirs: list[str] = []
+
+        with os.scandir(os.path.join(self.root, rel_dir)) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=self.follow_symlinks):
+                        if self.recursive:
+                            subdirs.append(self._rel(rel_dir, entry.name))
+                    elif self._is_song(entry.name):
+                        st = entry.stat()
+                        songs[entry.name] = (st.st_ino, st.st_mtime_ns)
+                except OSError:
+                    continue
+
+        return songs, subdirs
+
+    def _check(self, initial: bool = False) -> None:
+        seen: set[str] = set()
+        visited: set[tuple[int, int]] = set()
+        stack: list[str] = [""]
+
+        while stack:
+            rel_dir = stack.pop()
+
+            try:
+                st = os.stat(os.path.join(self.root, rel_dir))
+            except OSError:
+                continue
+
+            # Reached twice through a symlink, listed under its first path only
+            if (st.st_dev, st.st_ino) in visited:
+                continue
+            visited.add((st.st_dev, st.st_ino))
+            seen.add(rel_dir)
+            mtime = st.st_mtime_ns
+
+            old = self.snapshot.get(rel_dir)
+
+            if old and old[0] == mtime:
+                songs = old[1]
+                subdirs = old[2]
+            else:
+                try:
+                    songs, subdirs = self._list(rel_dir)
+                except OSError:
+                    continue
+
+                self.snapshot[rel_dir] = (mtime, songs, subdirs)
+
+                if not initial:
+                    self._diff(rel_dir, old[1] if old else {}, songs)
+
+            stack.extend(subdirs)
+
+        for rel_dir in list(self.snapshot):
+            if rel_dir not in seen:
+                del self.snapshot[rel_dir]
+                if not initial:
+                    self.deltas.append((REMOVED_TREE, rel_dir, None))
+
+    def _diff(self, rel_dir: str, old: dict[str, tuple[int, int]], new: dict[str, tuple[int, int]]) -> None:
+        removed = {old[name][0]: name for name in old.keys() - new.keys()}
+
+        for name in new.keys() - old.keys():
+            inode = new[name][0]
+            if inode in removed:
+                self.deltas.append((RENAMED, self._rel(rel_dir, removed.pop(inode)), self._rel(rel_dir, name)))
+            else:
+                self.deltas.append((ADDED, self._rel(rel_dir, name), None))
+
+        for name in removed.values():
+            self.deltas.append((REMOVED, self._rel(rel_dir, name), None))
+
+        for name in old.keys() & new.keys():
+            if old[name][1] != new[name][1]:
+                self.deltas.append((MODIFIED, self._rel(rel_dir, name), None))
+
+    def _run(self) -> None:
+        self._check(initial=True)
+
+        while self.running:
+            time.sleep(self.interval)
+            self._check()
+
+
+def watch_library(root: PosixPath | str, extensions: frozenset[str] = DEFAULT_EXTENSIONS,
+                  recursive: bool = True, follow_symlinks: bool = True) -> LibraryWatcher:
+    """Starts the best available watcher for a library
+
+    Args:
+        root (PosixPath | str): library directory
+        extensions (frozenset[str], optional): lower-case extensions to watch.
+            Defaults to DEFAULT_EXTENSIONS.
+        recursive (bool, optional): watch sub-directories, as scan_library's
+            recursive. Defaults to True.
+        follow_symlinks (bool, optional): follow symlinked directories, as
+            scan_library's follow_symlinks. Defaults to True.
+
+    Returns:
+        LibraryWatcher: InotifyWatcher on Linux, PollingWatcher otherwise or
+        when inotify can't watch the whole tree
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root, extensions, recursive, follow_symlinks).start()
+        except (OSError, AttributeError, TypeError):
+            pass
+
+    return PollingWatcher(root, extensions, recursive, follow_symlinks).start()
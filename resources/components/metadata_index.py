@@ -0,0 +1,233 @@
+import os
+import sqlite3
+import threading
+from pathlib import PosixPath
+from typing import Callable
+
+
+# Rows are only trusted while the file keeps the same size and mtime
+_SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS tracks (
+    path     TEXT PRIMARY KEY,
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    parsed   INTEGER NOT NULL,
+    title    TEXT,
+    artist   TEXT,
+    duration REAL
+);
+CREATE TABLE IF NOT EXISTS art (
+    path       TEXT PRIMARY KEY,
+    size       INTEGER NOT NULL,
+    mtime_ns   INTEGER NOT NULL,
+    image_hash TEXT NOT NULL
+)
+"""
+
+
+class MetadataIndex():
+    def __init__(self, db_path: PosixPath | str, commit_every: int = 64) -> None:
+        """Persistent metadata index keyed by path, size and mtime
+
+        Args:
+            db_path (PosixPath | str): SQLite database file (":memory:" is allowed)
+            commit_every (int, optional): pending writes before a commit. Defaults to 64.
+        """
+        self.db_path: str = str(db_path)
+        self.commit_every: int = commit_every
+        self._pending: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+        try:
+            self.conn: sqlite3.Connection = self._connect(self.db_path)
+        except sqlite3.Error:
+            # Read-only or broken cache, keep working without persistence
+            self.db_path = ":memory:"
+            self.conn = self._connect(self.db_path)
+
+    @staticmethod
+    def _connect(db_path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        conn.commit()
+        return conn
+
+    @staticmethod
+    def _row_to_metadata(row: tuple) -> dict | None:
+        parsed, title, artist, duration = row
+        if not parsed:
+            return None
+
+        return {
+            'title': title,
+            'artist': artist,
+            'duration': duration
+        }
+
+    def lookup(self, file_path: str, stat: os.stat_result | None = None) -> tuple[bool, dict | None]:
+        """Looks up a file in the index
+
+        Args:
+            file_path (str): audio file path
+            stat (os.stat_result | None, optional): pre-computed stat of file_path
+
+        Returns:
+            tuple[bool, dict | None]: (hit, metadata). hit is False when the entry
+            is missing or stale; metadata is None for files that failed to parse.
+        """
+        try:
+            st = stat or os.stat(file_path)
+        except OSError:
+            return False, None
+
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT size, mtime_ns, parsed, title, artist, duration "
+                "FROM tracks WHERE path = ?",
+                (file_path,)
+            ).fetchone()
+
+        if row is None or row[0] != st.st_size or row[1] != st.st_mtime_ns:
+            return False, None
+
+        return True, self._row_to_metadata(row[2:])
+
+    def store(self, file_path: str, stat: os.stat_result, metadata: dict | None) -> None:
+        """Stores (or replaces) the metadata of a file
+
+        Args:
+            file_path (str): audio file path
+            stat (os.stat_result): stat of file_path at parsing time
+            metadata (dict | None): get_audio_metadata format, None if parsing failed
+        """
+        md = metadata or {}
+        values = (
+            file_path, stat.st_size, stat.st_mtime_ns, metadata is not None,
+            md.get('title'), md.get('artist'), md.get('duration')
+        )
+
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO tracks "
+                "(path, size, mtime_ns, parsed, title, artist, duration) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                values
+            )
+            self._pending += 1
+
+            if self._pending >= self.commit_every:
+                self.conn.commit()
+                self._pending = 0
+
+    def get(self, file_path: str, parser: Callable[[str], dict | None]) -> dict | None:
+        """Returns the indexed metadata, parsing and storing it on a miss
+
+        Args:
+            file_path (str): audio file path
+            parser (Callable[[str], dict | None]): tag parser used on misses
+
+        Returns:
+            dict | None: metadata dict or None when it can't be extracted
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+
+        hit, metadata = self.lookup(file_path, st)
+        if hit:
+            return metadata
+
+        metadata = parser(file_path)
+        self.store(file_path, st, metadata)
+        return metadata
+
+    def lookup_art(self, file_path: str, stat: os.stat_result) -> tuple[bool, str]:
+        """Looks up the embedded picture hash of a file
+
+        Args:
+            file_path (str): audio file path
+            stat (os.stat_result): current stat of file_path
+
+        Returns:
+            tuple[bool, str]: (hit, image_hash). image_hash is "" for files
+            without an embedded picture.
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT size, mtime_ns, image_hash FROM art WHERE path = ?",
+                (file_path,)
+            ).fetchone()
+
+        if row is None or row[0] != stat.st_size or row[1] != stat.st_mtime_ns:
+            return False, ""
+
+        return True, row[2]
+
+    def store_art(self, file_path: str, stat: os.stat_result, image_hash: str) -> None:
+        """Stores the embedded picture hash of a file
+
+        Args:
+            file_path (str): audio file path
+            stat (os.stat_result): stat of file_path at extraction time
+            image_hash (str): picture hash, "" if the file has none
+        """
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO art (path, size, mtime_ns, image_hash) "
+                "VALUES (?, ?, ?, ?)",
+                (file_path, stat.st_size, stat.st_mtime_ns, image_hash)
+            )
+            self._pending += 1
+
+            if self._pending >= self.commit_every:
+                self.conn.commit()
+                self._pending = 0
+
+    def titles_under(self, folder: PosixPath | str) -> list[tuple[str, str | None, str | None]]:
+        """Returns the indexed titles and artists of every song under a folder
+
+        Rows aren't validated against the files, callers only use them as search text.
+
+        Args:
+            folder (PosixPath | str): library folder
+
+        Returns:
+            list[tuple[str, str | None, str | None]]: (path, title, artist) rows
+        """
+        prefix = os.path.join(str(folder), "")
+
+        # Range scan on the primary key, up to the character after the separator
+        with self._lock:
+            return self.conn.execute(
+                "SELECT path, title, artist FROM tracks WHERE parsed AND path >= ? AND path < ?",
+                (prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1))
+            ).fetchall()
+
+    def invalidate(self, file_path: str) -> None:
+        """Removes a file from the index
+
+        Args:
+            file_path (str): audio file path
+        """
+        with self._lock:
+            self.conn.execute("DELETE FROM tracks WHERE path = ?", (file_path,))
+            self.conn.execute("DELETE FROM art WHERE path = ?", (file_path,))
+            self._pending += 1
+
+    def flush(self) -> None:
+        """Commits pending writes to disk
+        """
+        with self._lock:
+            if self._pending:
+                self.conn.commit()
+                self._pending = 0
+
+    def close(self) -> None:
+        """Commits pending writes and closes the database
+        """
+        self.flush()
+        with self._lock:
+            self.conn.close()
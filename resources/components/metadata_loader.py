@@ -0,0 +1,163 @@
+import threading
+from collections import OrderedDict, deque
+from typing import Callable
+
+from ursina import Entity
+
+from .audio_scripts import get_audio_metadata
+
+
+MetadataCallback = Callable[[str, dict | None], None]
+
+
+class MetadataLoader(Entity):
+    def __init__(self, workers: int = 2, capacity: int = 1024) -> None:
+        """Loads audio metadata on background worker threads
+
+        Parsing happens on worker threads; results are queued and delivered to
+        callbacks from update(), so callbacks always run on the render thread.
+        Requests go ahead of prefetches, so rows being shown never wait behind
+        the pages around them. Results are kept in a bounded LRU cache.
+
+        Args:
+            workers (int, optional): number of worker threads. Defaults to 2.
+            capacity (int, optional): results kept in memory. Defaults to 1024.
+        """
+        super().__init__()
+
+        self.capacity: int = capacity
+        self.known: OrderedDict[str, dict | None] = OrderedDict()
+        self.inflight: set[str] = set()
+        self.callbacks: dict[str, list[MetadataCallback]] = {}
+
+        # Files waiting for a worker, True if requested, False if prefetched.
+        # Guarded by lock, like both queues.
+        self.lock: threading.Condition = threading.Condition()
+        self.queued: dict[str, bool] = {}
+        self.requested: deque[str] = deque()
+        self.prefetched: deque[str] = deque()
+        self.closed: bool = False
+
+        # deque.append/popleft are atomic, workers never take a lock here
+        self.results: deque[tuple[str, dict | None]] = deque()
+
+        self.workers: list[threading.Thread] = [
+            threading.Thread(target=self._run, name=f"metadata_{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    def _next(self) -> str | None:
+        with self.lock:
+            while True:
+                while not (self.requested or self.prefetched or self.closed):
+                    self.lock.wait()
+                if self.closed:
+                    return None
+
+                file_path = (self.requested or self.prefetched).popleft()
+                # A promoted prefetch stays in its old queue, whichever copy comes second is skipped
+                if self.queued.pop(file_path, None) is not None:
+                    return file_path
+
+    def _run(self) -> None:
+        while (file_path := self._next()) is not None:
+            self.results.append((file_path, get_audio_metadata(file_path)))
+
+    def _queue(self, file_path: str, requested: bool) -> None:
+        with self.lock:
+            waiting = self.queued.get(file_path)
+            if waiting is None:
+                if file_path in self.inflight:
+                    # Already being parsed
+                    return
+            elif waiting or not requested:
+                # Already queued, at least as early
+                return
+
+            self.queued[file_path] = requested
+            (self.requested if requested else self.prefetched).append(file_path)
+            self.inflight.add(file_path)
+            self.lock.notify()
+
+    def _request(self, file_path: str, callback: MetadataCallback | None, requested: bool) -> bool:
+        if file_path in self.known:
+            self.known.move_to_end(file_path)
+            if callback:
+                callback(file_path, self.known[file_path])
+            return True
+
+        if callback:
+            self.callbacks.setdefault(file_path, []).append(callback)
+
+        self._queue(file_path, requested)
+        return False
+
+    def request(self, file_path: str, callback: MetadataCallback | None = None) -> bool:
+        """Requests the metadata of a file, ahead of the prefetched ones
+
+        Args:
+            file_path (str): audio file path
+            callback (MetadataCallback | None, optional): called as
+                callback(file_path, metadata) on the render thread
+
+        Returns:
+            bool: True if the metadata was already known and callback ran immediately
+        """
+        return self._request(file_path, callback, True)
+
+    def prefetch(self, file_paths: list[str]) -> None:
+        """Warms metadata of files that are likely to be shown soon
+
+        They are parsed once no requested file is waiting.
+
+        Args:
+            file_paths (list[str]): audio file paths
+        """
+        for file_path in file_paths:
+            self._request(file_path, None, False)
+
+    def get(self, file_path: str) -> dict | None:
+        """Returns already loaded metadata without blocking
+
+        Args:
+            file_path (str): audio file path
+
+        Returns:
+            dict | None: metadata, or None if it's unknown yet
+        """
+        return self.known.get(file_path)
+
+    def forget(self, file_path: str) -> None:
+        """Drops a file from the in-memory results so it's loaded again
+
+        Args:
+            file_path (str): audio file path
+        """
+        self.known.pop(file_path, None)
+
+    def update(self) -> None:
+        """Delivers finished results to their callbacks
+        """
+        while self.results:
+            file_path, metadata = self.results.popleft()
+            self.inflight.discard(file_path)
+            self.known[file_path] = metadata
+            self.known.move_to_end(file_path)
+
+            while len(self.known) > self.capacity:
+                self.known.popitem(last=False)
+
+            for callback in self.callbacks.pop(file_path, ()):
+                callback(file_path, metadata)
+
+    def shutdown(self) -> None:
+        """Stops the workers without waiting for queued files
+        """
+        with self.lock:
+            self.closed = True
+            self.queued.clear()
+            self.requested.clear()
+            self.prefetched.clear()
+            self.lock.notify_all()
@@ -0,0 +1,232 @@
+import os
+import json
+import socket
+import threading
+from pathlib import PosixPath
+from time import perf_counter_ns
+
+
+class Counter():
+    def __init__(self) -> None:
+        """Monotonic event counter
+        """
+        self.value: int = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+    def snapshot(self) -> int:
+        return self.value
+
+
+class Histogram():
+    def __init__(self, sub_bucket_bits: int = 7) -> None:
+        """Log-linear (HDR-style) histogram of durations in microseconds
+
+        Values below 2**sub_bucket_bits are counted exactly; above that every
+        power of two is split into 2**(sub_bucket_bits - 1) buckets, so the
+        relative error stays under 2**(1 - sub_bucket_bits) at any scale and
+        recording is O(1).
+
+        Args:
+            sub_bucket_bits (int, optional): precision bits. Defaults to 7 (~1.6%).
+        """
+        self.bits: int = sub_bucket_bits
+        self.counts: dict[int, int] = {}
+        self.count: int = 0
+        self.total: int = 0
+        self.min: int = 0
+        self.max: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    def _index(self, value: int) -> int:
+        shift = value.bit_length() - self.bits
+        if shift <= 0:
+            return value
+
+        half = 1 << (self.bits - 1)
+        return (1 << self.bits) + (shift - 1) * half + (value >> shift) - half
+
+    def _bounds(self, index: int) -> tuple[int, int]:
+        if index < 1 << self.bits:
+            return index, index
+
+        half = 1 << (self.bits - 1)
+        offset = index - (1 << self.bits)
+        shift = offset // half + 1
+        low = (offset % half + half) << shift
+        return low, low + (1 << shift) - 1
+
+    def record(self, value_us: int) -> None:
+        """Records a duration
+
+        Args:
+            value_us (int): duration in microseconds, negative values count as 0
+        """
+        value_us = max(int(value_us), 0)
+        index = self._index(value_us)
+
+        with self._lock:
+            self.counts[index] = self.counts.get(index, 0) + 1
+            if not self.count or value_us < self.min:
+                self.min = value_us
+            if value_us > self.max:
+                self.max = value_us
+            self.count += 1
+            self.total += value_us
+
+    def record_since(self, start_ns: int) -> None:
+        """Records the time elapsed since a perf_counter_ns() timestamp
+        """
+        self.record((perf_counter_ns() - start_ns) // 1000)
+
+    def percentile(self, fraction: float) -> int:
+        """Returns the duration below which a fraction of the records fall
+
+        Args:
+            fraction (float): 0 to 1, example: .99
+
+        Returns:
+            int: microseconds, 0 if nothing was recorded
+        """
+        with self._lock:
+            counts = sorted(self.counts.items())
+            count = self.count
+
+        rank = max(int(fraction * count + .5), 1)
+        seen = 0
+
+        for index, n in counts:
+            seen += n
+            if seen >= rank:
+                low, high = self._bounds(index)
+                return max(min((low + high) // 2, self.max), self.min)
+
+        return 0
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "min_us": self.min,
+            "mean_us": self.total / self.count if self.count else 0,
+            "p50_us": self.percentile(.5),
+            "p90_us": self.percentile(.9),
+            "p99_us": self.percentile(.99),
+            "max_us": self.max,
+        }
+
+
+class MetricsRegistry():
+    def __init__(self) -> None:
+        """Named counters, histograms and in-flight operations
+        """
+        self.counters: dict[str, Counter] = {}
+        self.histograms: dict[str, Histogram] = {}
+
+        # Operations started on one frame and finished on a later one
+        self.pending: dict[str, int] = {}
+
+        self.server: socket.socket | None = None
+
+    def counter(self, name: str) -> Counter:
+        if name not in self.counters:
+            self.counters[name] = Counter()
+        return self.counters[name]
+
+    def histogram(self, name: str) -> Histogram:
+        if name not in self.histograms:
+            self.histograms[name] = Histogram()
+        return self.histograms[name]
+
+    def begin(self, name: str) -> None:
+        """Starts timing an operation, restarting it if it was already running
+
+        Args:
+            name (str): histogram the duration is recorded in
+        """
+        self.pending[name] = perf_counter_ns()
+
+    def end(self, name: str, end_ns: int | None = None) -> bool:
+        """Finishes an operation started with begin
+
+        Args:
+            name (str): histogram the duration is recorded in
+            end_ns (int | None, optional): perf_counter_ns() when it finished,
+                if that was before now. Defaults to None.
+
+        Returns:
+            bool: False if the operation wasn't running
+        """
+        start = self.pending.pop(name, None)
+        if start is None:
+            return False
+
+        # Operations handed off ahead of time finished before begin
+        self.histogram(name).record(max((end_ns or perf_counter_ns()) - start, 0) // 1000)
+        return True
+
+    def snapshot(self) -> dict:
+        """Returns every metric as JSON-serializable data
+        """
+        return {
+            "counters": {name: c.snapshot() for name, c in list(self.counters.items())},
+            "histograms": {name: h.snapshot() for name, h in list(self.histograms.items())},
+        }
+
+    def export(self, file_path: PosixPath | str) -> None:
+        """Writes a snapshot to a JSON file
+
+        Args:
+            file_path (PosixPath | str): output file
+        """
+        with open(file_path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    def _serve(self) -> None:
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return
+
+            with conn:
+                try:
+                    conn.sendall(json.dumps(self.snapshot()).encode() + b"\n")
+                except OSError:
+                    pass
+
+    def serve(self, socket_path: PosixPath | str) -> None:
+        """Sends a JSON snapshot to every client connecting to a Unix socket
+
+        Example: socat - UNIX-CONNECT:/tmp/playstar-metrics.sock
+
+        Args:
+            socket_path (PosixPath | str): socket file, replaced if it exists
+        """
+        socket_path = os.fspath(socket_path)
+        try:
+            os.unlink(socket_path)
+        except FileNotFoundError:
+            pass
+
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(socket_path)
+        self.server.listen()
+
+        threading.Thread(target=self._serve, name="metrics-socket", daemon=True).start()
+
+    def close(self) -> None:
+        """Stops serving the socket
+        """
+        if self.server:
+            self.server.close()
+            self.server = None
+
+
+_registry: MetricsRegistry = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Returns the process-wide metrics registry
+    """
+    return _registry
@@ -0,0 +1,119 @@
+import os
+import unicodedata
+
+
+# Song-list label width, in half-width cells ("..." included)
+TITLE_WIDTH: int = 18
+ELLIPSIS: str = "..."
+
+
+def char_width(char: str) -> int:
+    """Returns the cells a character takes: 2 for wide CJK, 0 for combining marks
+    """
+    if unicodedata.combining(char):
+        return 0
+    return 2 if unicodedata.east_asian_width(char) in ("W", "F") else 1
+
+
+def fit_title(title: str, max_width: int = TITLE_WIDTH) -> str:
+    """Cuts a title to a display width, ending it with "..." if it's too long
+
+    Args:
+        title (str): full title
+        max_width (int, optional): width in half-width cells. Defaults to TITLE_WIDTH.
+
+    Returns:
+        str: title that fits in max_width cells
+    """
+    widths = [char_width(char) for char in title]
+    if sum(widths) <= max_width:
+        return title
+
+    room = max_width - len(ELLIPSIS)
+    used = 0
+    for i, width in enumerate(widths):
+        if used + width > room:
+            return title[:i] + ELLIPSIS
+        used += width
+
+    return title
+
+
+class PageModel():
+    def __init__(self, page_size: int = 5, max_width: int = TITLE_WIDTH) -> None:
+        """Display labels of a library's songs, split in pages
+
+        Labels are fitted once per song and kept until the song changes, so a
+        page flip only slices the song list and looks labels up. The model is
+        keyed by song name, so it serves the disc's songs and search results.
+
+        Args:
+            page_size (int, optional): rows per page. Defaults to 5.
+            max_width (int, optional): label width in half-width cells. Defaults to TITLE_WIDTH.
+        """
+        self.page_size: int = page_size
+        self.max_width: int = max_width
+
+        self.labels: dict[str, str] = {}
+
+        # Songs labelled from their metadata, the others show their file name
+        self.titled: set[str] = set()
+
+    def label(self, name: str) -> str:
+        """Returns the label of a song, its file name until metadata is known
+
+        Args:
+            name (str): file path relative to the library
+        """
+        if (label := self.labels.get(name)) is None:
+            label = self.labels[name] = fit_title(os.path.basename(name), self.max_width)
+        return label
+
+    def set_metadata(self, name: str, metadata: dict | None) -> str:
+        """Labels a song with its metadata title
+
+        Args:
+            name (str): file path relative to the library
+            metadata (dict | None): get_audio_metadata format, None if the file has no tags
+
+        Returns:
+            str: new label
+        """
+        self.titled.add(name)
+
+        if metadata and (title := metadata['title']):
+            label = self.labels[name] = fit_title(title, self.max_width)
+            return label
+
+        self.labels.pop(name, None)
+        return self.label(name)
+
+    def forget(self, name: str) -> None:
+        """Drops the label of a changed or removed song
+
+        Args:
+            name (str): file path relative to the library
+        """
+        self.labels.pop(name, None)
+        self.titled.discard(name)
+
+    def page_count(self, count: int) -> int:
+        """Returns the number of pages of count songs, at least one
+        """
+        return max(count - 1, 0) // self.page_size + 1
+
+    def page(self, names: list[str], page: int) -> tuple[int, list[tuple[str, str]], bool]:
+        """Returns the rows of a page
+
+        Args:
+            names (list[str]): songs listed, in order
+            page (int): page index
+
+        Returns:
+            tuple[int, list[tuple[str, str]], bool]: index of the first row,
+                (name, label) of each row and whether a next page exists
+        """
+        start = page * self.page_size
+        end = start + self.page_size
+
+        return start, [(name, self.label(name)) for name in names[start:end]], end < len(names)
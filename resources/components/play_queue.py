@@ -0,0 +1,267 @@
+import random
+
+
+# Repeat modes of PlayQueue
+REPEAT_OFF: str = "off"
+REPEAT_ONE: str = "one"
+REPEAT_ALL: str = "all"
+
+REPEAT_MODES: tuple[str, ...] = (REPEAT_OFF, REPEAT_ALL, REPEAT_ONE)
+
+
+class PlayQueue():
+    def __init__(self, length: int = 0, repeat: str = REPEAT_ALL, shuffle: bool = False,
+                 rng: random.Random | None = None) -> None:
+        """Play order over the library, tracked by index
+
+        Songs are referred to by their index in the library content, so moving
+        to the next or previous song is O(1). Shuffle is a permutation of the
+        indices, computed once when it's turned on.
+
+        Args:
+            length (int, optional): songs in the library. Defaults to 0.
+            repeat (str, optional): REPEAT_OFF, REPEAT_ONE or REPEAT_ALL. Defaults to REPEAT_ALL.
+            shuffle (bool, optional): play in shuffled order. Defaults to False.
+            rng (random.Random | None, optional): random source for shuffling
+        """
+        self.length: int = length
+        self.repeat: str = repeat
+        self.rng: random.Random = rng or random.Random()
+
+        # Play order and its inverse, None while not shuffled (identity order)
+        self.order: list[int] | None = None
+        self.slots: list[int] | None = None
+
+        # position is -1 when the current song was removed before the first one
+        self.current: int | None = None
+        self.position: int | None = None
+
+        if shuffle:
+            self.set_shuffle(True)
+
+    @property
+    def shuffled(self) -> bool:
+        return self.order is not None
+
+    def _index_at(self, position: int) -> int:
+        return self.order[position] if self.order is not None else position
+
+    def _position_of(self, index: int) -> int:
+        return self.slots[index] if self.slots is not None else index
+
+    def _step(self, position: int | None, offset: int, auto: bool) -> int | None:
+        if self.length == 0 or position is None:
+            return None
+
+        if auto and self.repeat == REPEAT_ONE and self.current is not None:
+            return position
+
+        position += offset
+
+        if 0 <= position < self.length:
+            return position
+
+        if self.repeat != REPEAT_OFF:
+            return position % self.length
+
+        # Nothing before the first song, a manual skip past the end stops
+        return 0 if offset < 0 else None
+
+    def select(self, index: int) -> int:
+        """Makes a library index the current song
+
+        Args:
+            index (int): index in the library content
+
+        Returns:
+            int: the same index
+        """
+        self.current = index
+        self.position = self._position_of(index)
+        return index
+
+    def next(self, auto: bool = False) -> int | None:
+        """Moves to the song after the current one
+
+        Args:
+            auto (bool, optional): the current song ended by itself, so
+                REPEAT_ONE plays it again. Defaults to False.
+
+        Returns:
+            int | None: library index to play, None if playback should stop
+        """
+        position = self._step(self.position, 1, auto)
+        if position is None:
+            return None
+
+        return self.select(self._index_at(position))
+
+    def prev(self) -> int | None:
+        """Moves to the song before the current one
+
+        Returns:
+            int | None: library index to play, None if nothing is playing
+        """
+        position = self._step(self.position, -1, False)
+        if position is None:
+            return None
+
+        return self.select(self._index_at(position))
+
+    def peek_next(self) -> int | None:
+        """Returns the song that next(auto=True) would move to, without moving
+
+        Returns:
+            int | None: library index, None if playback would stop
+        """
+        position = self._step(self.position, 1, True)
+        return None if position is None else self._index_at(position)
+
+    def rewind(self) -> None:
+        """Makes next() start with the first song of the play order, if nothing was played
+        """
+        if self.position is None:
+            self.position = -1
+
+    def upcoming(self, count: int) -> list[int]:
+        """Returns the songs that skipping forward would play, in order
+
+        Args:
+            count (int): most songs returned, each song is listed once
+
+        Returns:
+            list[int]: library indices, empty if nothing is playing
+        """
+        indices = []
+        position = self.position
+
+        for _ in range(min(count, self.length - 1 if self.current is not None else self.length)):
+            position = self._step(position, 1, False)
+            if position is None:
+                break
+            indices.append(self._index_at(position))
+
+        return indices
+
+    def set_shuffle(self, shuffle: bool) -> None:
+        """Turns shuffled order on or off
+
+        The current song becomes the first one of a new shuffled order, so
+        every other song plays once before it repeats.
+
+        Args:
+            shuffle (bool): play in shuffled order
+        """
+        if not shuffle:
+            self.order = None
+            self.slots = None
+        else:
+            self.order = [i for i in range(self.length) if i != self.current]
+            self.rng.shuffle(self.order)
+
+            if self.current is not None:
+                self.order.insert(0, self.current)
+
+            self._update_slots()
+
+        if self.current is not None:
+            self.position = self._position_of(self.current)
+
+    def cycle_repeat(self) -> str:
+        """Switches to the next repeat mode (off -> all -> one -> off)
+
+        Returns:
+            str: the new repeat mode
+        """
+        self.repeat = REPEAT_MODES[(REPEAT_MODES.index(self.repeat) + 1) % len(REPEAT_MODES)]
+        return self.repeat
+
+    def state(self) -> dict:
+        """Returns the play order and current song as marshal-able data
+        """
+        return {
+            "length": self.length,
+            "repeat": self.repeat,
+            "order": self.order,
+            "current": self.current,
+        }
+
+    def restore(self, state: dict) -> bool:
+        """Goes back to a state() of the same library
+
+        Args:
+            state (dict): PlayQueue.state return format
+
+        Returns:
+            bool: False if the library length changed and state was ignored
+        """
+        if state["length"] != self.length:
+            return False
+
+        self.repeat = state["repeat"]
+        self.order = list(state["order"]) if state["order"] is not None else None
+        self.slots = None
+        if self.order is not None:
+            self._update_slots()
+
+        if state["current"] is not None:
+            self.select(state["current"])
+
+        return True
+
+    def _update_slots(self) -> None:
+        self.slots = [0] * self.length
+        for position, index in enumerate(self.order):
+            self.slots[index] = position
+
+    def extend(self, count: int) -> None:
+        """Adds songs appended to the library content
+
+        Args:
+            count (int): number of new songs
+        """
+        new = list(range(self.length, self.length + count))
+        self.length += count
+
+        if self.order is not None:
+            self.rng.shuffle(new)
+            self.slots.extend([0] * count)
+            for index in new:
+                self.slots[index] = len(self.order)
+                self.order.append(index)
+
+    def remap(self, mapping: list[int | None], length: int) -> None:
+        """Follows a library content change that removed or reordered songs
+
+        Args:
+            mapping (list[int | None]): new index of every old index, None
+                for removed songs
+            length (int): songs in the library after the change
+        """
+        # Song that follows the current one, in case the current one is gone
+        following = None
+        if self.position is not None and (self.current is None or mapping[self.current] is None):
+            for position in range(max(self.position + 1, 0), len(mapping)):
+                following = mapping[self._index_at(position)]
+                if following is not None:
+                    break
+
+        self.length = length
+
+        if self.order is not None:
+            self.order = [mapping[i] for i in self.order if mapping[i] is not None]
+            self._update_slots()
+
+        if self.current is not None:
+            self.current = mapping[self.current]
+
+        if self.current is not None:
+            self.position = self._position_of(self.current)
+        elif following is not None:
+            # Current song is gone, next() continues with the one after it
+            self.position = self._position_of(following) - 1
+        elif length == 0 and self.position is not None:
+            # Emptied, next() starts with the first song added later
+            self.position = -1
+        else:
+            self.position = None
@@ -0,0 +1,135 @@
+import os
+import logging
+from collections import deque
+from pathlib import PosixPath
+from typing import Iterator
+from urllib.parse import unquote, urlparse
+from xml.etree.ElementTree import ParseError, iterparse
+
+
+log = logging.getLogger(__name__)
+
+PLAYLIST_EXTENSIONS: frozenset[str] = frozenset({".m3u", ".m3u8", ".pls", ".xspf"})
+
+
+def is_playlist(path: PosixPath | str) -> bool:
+    """Returns True for a playlist file the player can read
+    """
+    return os.path.splitext(os.fspath(path))[1].lower() in PLAYLIST_EXTENSIONS
+
+
+def song_name(base_dir: PosixPath | str, file_path: str) -> str:
+    """Returns how a playlist disc names a song
+
+    Songs below the playlist's folder are named relative to it, like songs of
+    a folder disc; the others keep their absolute path, which joining with
+    the folder leaves unchanged.
+
+    Args:
+        base_dir (PosixPath | str): absolute folder of the playlist
+        file_path (str): normalized absolute audio file path
+    """
+    # A prefix test, os.path.relpath costs more than reading the entry
+    prefix = os.path.join(os.fspath(base_dir), "")
+    return file_path[len(prefix):] if file_path.startswith(prefix) else file_path
+
+
+def _m3u_entries(f) -> Iterator[str]:
+    # #EXTM3U, #EXTINF and other directives are skipped
+    for line in f:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+
+def _pls_entries(f) -> Iterator[str]:
+    # FileN=... lines, in file order; Title/Length lines are skipped
+    for line in f:
+        key, sep, value = line.strip().partition("=")
+        if sep and key[:4].lower() == "file" and key[4:].isdigit():
+            yield value.strip()
+
+
+def _xspf_entries(f) -> Iterator[str]:
+    # Open elements, the parent of an ending element is the last one
+    open_elems = []
+
+    for event, elem in iterparse(f, events=("start", "end")):
+        if event == "start":
+            open_elems.append(elem)
+            continue
+        open_elems.pop()
+
+        # Namespaced or not, "{http://xspf.org/ns/0/}location"
+        tag = elem.tag.rpartition("}")[2]
+        if tag == "location" and elem.text:
+            yield elem.text.strip()
+
+        # Finished tracks are dropped, memory stays flat on huge playlists
+        elif tag == "track" and open_elems:
+            open_elems[-1].remove(elem)
+
+
+def _resolve(base_dir: str, entry: str) -> str | None:
+    if "://" in entry:
+        url = urlparse(entry)
+        if url.scheme != "file":
+            # Streams aren't files of a disc
+            return None
+        return os.path.normpath(unquote(url.path))
+
+    return os.path.normpath(os.path.join(base_dir, os.path.expanduser(entry)))
+
+
+def _relative_uri(entry: str) -> str:
+    # XSPF locations are URIs, relative ones are still percent-encoded
+    return entry if "://" in entry else unquote(entry)
+
+
+def read_playlist(path: PosixPath | str, missing: deque[str] | None = None) -> Iterator[str]:
+    """Yields the songs of an M3U/M3U8, PLS or XSPF playlist as they are read
+
+    The file is read line by line (XSPF with an incremental XML parser), so
+    the first songs are available before the rest of a huge playlist is
+    read. Relative entries are resolved against the playlist's folder.
+    Entries that aren't local files, or don't exist, are skipped and
+    appended to missing.
+
+    Args:
+        path (PosixPath | str): playlist file
+        missing (deque[str] | None, optional): receives skipped entries, as
+            written in the playlist. Defaults to None.
+
+    Yields:
+        Iterator[str]: song_name of each song, in playlist order
+    """
+    path = os.fspath(path)
+    base_dir = os.path.dirname(os.path.abspath(path))
+    extension = os.path.splitext(path)[1].lower()
+
+    try:
+        if extension == ".xspf":
+            f = open(path, "rb")
+            entries = (_relative_uri(entry) for entry in _xspf_entries(f))
+        else:
+            # surrogateescape keeps undecodable bytes, they map back to the same file name.
+            # .m3u8 is UTF-8 by definition; most .m3u files are too.
+            f = open(path, encoding="utf-8-sig", errors="surrogateescape")
+            entries = _pls_entries(f) if extension == ".pls" else _m3u_entries(f)
+    except OSError as e:
+        log.warning("Couldn't open playlist %s: %s", path, e)
+        return
+
+    with f:
+        try:
+            for entry in entries:
+                file_path = _resolve(base_dir, entry)
+
+                if file_path is None or not os.path.isfile(file_path):
+                    if missing is not None:
+                        missing.append(entry)
+                    continue
+
+                yield song_name(base_dir, file_path)
+        except (OSError, ParseError) as e:
+            log.warning("Playlist %s read up to an error: %s", path, e)
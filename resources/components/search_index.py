@@ -0,0 +1,223 @@
+import os
+import threading
+import unicodedata
+from array import array
+
+
+def normalize(text: str) -> str:
+    """Returns text folded for matching: NFKC (full-width to ASCII, ...) and case-folded
+    """
+    return unicodedata.normalize("NFKC", text).casefold()
+
+
+def trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def word_prefixes(text: str) -> set[str]:
+    # Queries shorter than a trigram match the start of a word
+    prefixes = set()
+    for word in text.split():
+        prefixes.add(word[:1])
+        if len(word) > 1:
+            prefixes.add(word[:2])
+    return prefixes
+
+
+class SearchIndex():
+    def __init__(self) -> None:
+        """Incremental substring search over song names, titles and artists
+
+        Every song is a document whose text is matched by trigram posting
+        lists (queries of one or two characters use word prefixes instead).
+        Candidates of the most selective trigram are verified with a plain
+        substring test. A query that extends the previous one only re-checks
+        the previous results, so typing stays fast on large libraries.
+
+        All methods are thread-safe; the index is meant to be filled from a
+        worker thread while the render thread searches it.
+        """
+        self.names: list[str | None] = []
+        self.texts: list[str] = []
+        # Title and artist part of each text, kept to rebuild it on rename
+        self.fields: list[str] = []
+        self.ids: dict[str, int] = {}
+        self.postings: dict[str, array] = {}
+
+        self.last_query: list[str] | None = None
+        self.last_ids: list[int] = []
+        self.new_ids: list[int] = []
+
+        # Bumped on every change, so a shown result can tell it's outdated
+        self.version: int = 0
+
+        self._lock: threading.Lock = threading.Lock()
+
+    def _post(self, doc: int, keys: set[str]) -> None:
+        for key in keys:
+            if (posting := self.postings.get(key)) is None:
+                posting = self.postings[key] = array("I")
+            posting.append(doc)
+
+    def _touched(self, doc: int) -> None:
+        # Only needed to narrow the last query
+        if self.last_query is not None:
+            self.new_ids.append(doc)
+        self.version += 1
+
+    @staticmethod
+    def _name_text(name: str) -> str:
+        # Texts start with a space so word prefixes can be found with " " + term
+        return " " + normalize(os.path.splitext(name)[0].replace(os.sep, " "))
+
+    def _add(self, name: str, fields: str) -> None:
+        doc = self.ids.get(name)
+
+        if doc is None:
+            doc = self.ids[name] = len(self.names)
+            text = self._name_text(name) + fields
+            self.names.append(name)
+            self.texts.append(text)
+            self.fields.append(fields)
+            self._post(doc, trigrams(text) | word_prefixes(text))
+            self._touched(doc)
+            return
+
+        if fields in self.fields[doc]:
+            return
+
+        # Only keys the document didn't have yet are posted
+        old = self.texts[doc]
+        self.fields[doc] += fields
+        new = self.texts[doc] = self._name_text(name) + self.fields[doc]
+        self._post(doc, (trigrams(new) | word_prefixes(new)) - trigrams(old) - word_prefixes(old))
+        self._touched(doc)
+
+    def add(self, name: str, *fields: str | None) -> None:
+        """Adds a song or adds text to an existing one
+
+        Args:
+            name (str): song file path relative to the library
+            fields (str | None): extra searchable text (title, artist), None is skipped
+        """
+        fields = [field for field in fields if field]
+        text = " " + normalize(" ".join(fields)) if fields else ""
+
+        with self._lock:
+            self._add(name, text)
+
+    def add_files(self, names: list[str]) -> None:
+        """Adds songs searchable by file name
+
+        Args:
+            names (list[str]): song file paths relative to the library
+        """
+        for name in names:
+            self.add(name)
+
+    def remove(self, name: str) -> None:
+        """Removes a song
+
+        Args:
+            name (str): song file path relative to the library
+        """
+        with self._lock:
+            doc = self.ids.pop(name, None)
+            if doc is not None:
+                # Posting lists keep the id; verification skips removed documents
+                self.names[doc] = None
+                self.last_query = None
+                self.version += 1
+
+    def rename(self, name: str, new_name: str) -> None:
+        """Moves a song's title and artist to its new name
+
+        The song is removed and added again, so its old file name stops matching.
+
+        Args:
+            name (str): old relative path
+            new_name (str): new relative path
+        """
+        with self._lock:
+            doc = self.ids.pop(name, None)
+            if doc is None:
+                return
+
+            self.names[doc] = None
+            self.last_query = None
+            self.version += 1
+
+            self._add(new_name, self.fields[doc])
+
+    def _candidates(self, term: str) -> array | list[int]:
+        if len(term) < 3:
+            return self.postings.get(term, ())
+
+        # Rarest trigram of the term
+        best = None
+        for gram in trigrams(term):
+            posting = self.postings.get(gram)
+            if posting is None:
+                return ()
+            if best is None or len(posting) < len(best):
+                best = posting
+
+        return best
+
+    def _verify(self, candidates: array | list[int], terms: list[str]) -> list[int]:
+        names = self.names
+        texts = self.texts
+
+        ids = [doc for doc in candidates if names[doc] is not None]
+        for term in terms:
+            needle = f" {term}" if len(term) < 3 else term
+            ids = [doc for doc in ids if needle in texts[doc]]
+
+        return ids
+
+    def search(self, query: str) -> list[str]:
+        """Returns the songs whose text contains every word of query
+
+        Args:
+            query (str): typed text, example: "beat ab"
+
+        Returns:
+            list[str]: matching song names, in the order they were added
+        """
+        terms = normalize(query).split()
+        if not terms:
+            return []
+
+        with self._lock:
+            names = self.names
+            last = self.last_query
+
+            # Narrowing the previous query only needs to check what changed in it.
+            # A term growing to three characters switches from word-prefix to substring matching.
+            if last and len(terms) >= len(last) and terms[:len(last) - 1] == last[:-1] and (
+                terms[len(last) - 1].startswith(last[-1])
+                and (len(last[-1]) >= 3 or len(terms[len(last) - 1]) < 3)
+            ):
+                changed = len(last) - 1 if terms[len(last) - 1] != last[-1] else len(last)
+                ids = self._verify(self.last_ids, terms[changed:])
+
+                # Songs added or updated since then are checked against the whole query
+                if self.new_ids:
+                    ids = sorted(set(ids).union(self._verify(self.new_ids, terms)))
+            else:
+                candidates = min((self._candidates(term) for term in terms), key=len)
+
+                # A lone word prefix or trigram needs no substring check
+                ids = self._verify(candidates, terms if len(terms) > 1 or len(terms[0]) > 3 else [])
+
+                # Posting lists are in insertion order except for updated songs
+                ids.sort()
+
+            self.last_query = terms
+            self.last_ids = ids
+            self.new_ids = []
+
+            return [names[doc] for doc in ids]
+
+    def __len__(self) -> int:
+        return len(self.ids)
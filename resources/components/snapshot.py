@@ -0,0 +1,197 @@
+import os
+import marshal
+import logging
+import threading
+from collections import deque
+from pathlib import PosixPath
+
+from .app_dirs import state_dir
+from .library_scanner import scan_library
+from .library_watcher import ADDED, REMOVED, REMOVED_TREE, Delta
+
+
+log = logging.getLogger(__name__)
+
+# Bumped when the layout changes, older snapshots are ignored
+SNAPSHOT_VERSION: int = 1
+
+
+def snapshot_path() -> PosixPath:
+    """Returns the snapshot file (~/.local/state/PlayStar/snapshot.marshal by default)
+    """
+    return state_dir() / "snapshot.marshal"
+
+
+def load_snapshot(file_path: PosixPath | None = None) -> dict | None:
+    """Reads the snapshot written by the last run
+
+    marshal only holds built-in types and loads 100k song names in a few
+    milliseconds, so it's read on the render thread before the first frame.
+
+    Args:
+        file_path (PosixPath | None, optional): snapshot file. Defaults to snapshot_path().
+
+    Returns:
+        dict | None: None if there's no usable snapshot
+    """
+    try:
+        with open(file_path or snapshot_path(), "rb") as f:
+            snapshot = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+        return None
+
+    return snapshot
+
+
+def save_snapshot(snapshot: dict, file_path: PosixPath | None = None) -> None:
+    """Writes a snapshot, replacing the old one only once it's complete
+
+    Args:
+        snapshot (dict): built-in types only, "version" is added
+        file_path (PosixPath | None, optional): snapshot file. Defaults to snapshot_path().
+    """
+    file_path = file_path or snapshot_path()
+    temp_path = f"{file_path}.tmp"
+
+    try:
+        with open(temp_path, "wb") as f:
+            marshal.dump({**snapshot, "version": SNAPSHOT_VERSION}, f)
+        os.replace(temp_path, file_path)
+    except (OSError, ValueError) as e:
+        log.warning("Couldn't save snapshot: %s", e)
+
+
+def stale_dirs(root: PosixPath | str, dirs: dict[str, int]) -> list[str]:
+    """Returns the directories whose listing changed since they were scanned
+
+    A file added, removed or renamed changes its directory's mtime, changes
+    inside a song file don't (the metadata index checks those).
+
+    Args:
+        root (PosixPath | str): library directory
+        dirs (dict[str, int]): mtime_ns by relative directory, from scan_library
+
+    Returns:
+        list[str]: relative directories changed or gone, parents first
+    """
+    root = os.fspath(root)
+    stale = []
+
+    for rel_dir, mtime_ns in dirs.items():
+        try:
+            if os.stat(os.path.join(root, rel_dir) if rel_dir else root).st_mtime_ns != mtime_ns:
+                stale.append(rel_dir)
+        except OSError:
+            stale.append(rel_dir)
+
+    return sorted(stale)
+
+
+class LibraryRefresh():
+    def __init__(self, root: PosixPath | str, songs: list[str], dirs: dict[str, int],
+                 extensions: frozenset[str], recursive: bool = True) -> None:
+        """Rescans only the directories of a restored library that changed
+
+        Runs on a background thread and queues the differences as watcher
+        deltas, so they're applied like changes seen while running. dirs is
+        updated in place with the new mtimes.
+
+        Args:
+            root (PosixPath | str): library directory
+            songs (list[str]): restored songs, relative to root
+            dirs (dict[str, int]): mtime_ns by relative directory
+            extensions (frozenset[str]): lower-case extensions to list
+            recursive (bool, optional): list sub-directories. Defaults to True.
+        """
+        self.root: str = os.fspath(root)
+        self.dirs: dict[str, int] = dirs
+        self.extensions: frozenset[str] = extensions
+        self.recursive: bool = recursive
+        self.deltas: deque[Delta] = deque()
+        self.done: bool = False
+
+        # Songs of each directory, as they were saved
+        self.songs: dict[str, set[str]] = {}
+        for name in songs:
+            self.songs.setdefault(os.path.dirname(name), set()).add(name)
+
+        self.thread: threading.Thread = threading.Thread(
+            target=self._run,
+            name="library-refresh",
+            daemon=True
+        )
+        self.thread.start()
+
+    def _rel(self, rel_dir: str, name: str) -> str:
+        return os.path.join(rel_dir, name) if rel_dir else name
+
+    def _rescan(self, rel_dir: str) -> None:
+        abs_dir = os.path.join(self.root, rel_dir) if rel_dir else self.root
+
+        try:
+            st = os.stat(abs_dir)
+            with os.scandir(abs_dir) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            # Gone with everything below it
+            self.deltas.append((REMOVED_TREE, rel_dir, None))
+            prefix = os.path.join(rel_dir, "") if rel_dir else ""
+            for gone in [d for d in self.dirs if d == rel_dir or d.startswith(prefix)]:
+                del self.dirs[gone]
+            return
+
+        self.dirs[rel_dir] = st.st_mtime_ns
+        files = set()
+
+        for entry in entries:
+            try:
+                if entry.is_file():
+                    if os.path.splitext(entry.name)[1].lower() in self.extensions:
+                        files.add(self._rel(rel_dir, entry.name))
+
+                # New sub-directories are listed whole, known ones are checked on their own
+                elif self.recursive and entry.is_dir() and self._rel(rel_dir, entry.name) not in self.dirs:
+                    sub_dir = self._rel(rel_dir, entry.name)
+                    sub_dirs: dict[str, int] = {}
+
+                    for name in scan_library(entry.path, self.extensions, dirs=sub_dirs):
+                        self.deltas.append((ADDED, self._rel(sub_dir, name), None))
+                    for name, mtime_ns in sub_dirs.items():
+                        self.dirs[self._rel(sub_dir, name) if name else sub_dir] = mtime_ns
+            except OSError:
+                continue
+
+        old = self.songs.get(rel_dir, set())
+        for name in sorted(files - old):
+            self.deltas.append((ADDED, name, None))
+        for name in sorted(old - files):
+            self.deltas.append((REMOVED, name, None))
+
+    def _run(self) -> None:
+        try:
+            stale = stale_dirs(self.root, self.dirs)
+            if stale:
+                log.info("%d changed directories under %s", len(stale), self.root)
+
+            for rel_dir in stale:
+                # Not in dirs anymore if a parent was removed
+                if rel_dir in self.dirs:
+                    self._rescan(rel_dir)
+        finally:
+            self.done = True
+
+    def poll(self) -> list[Delta]:
+        """Returns the deltas found since the last poll
+        """
+        deltas = []
+        while self.deltas:
+            deltas.append(self.deltas.popleft())
+        return deltas
+
+    def finished(self) -> bool:
+        """Returns True when the refresh ended and every delta was polled
+        """
+        return self.done and not self.deltas
@@ -0,0 +1,97 @@
+from typing import Callable
+
+from ursina import Entity, Button, Func, color
+
+
+class SongListView(Entity):
+    def __init__(self, on_select: Callable[[int], None], rows: int = 5, **kwargs) -> None:
+        """Virtualized song list with a fixed pool of row buttons
+
+        Rows are created once and rebound with bind() when the visible window
+        of the library changes, nothing is allocated per page flip.
+
+        Args:
+            on_select (Callable[[int], None]): called with the library index of a clicked row
+            rows (int, optional): number of visible rows. Defaults to 5.
+        """
+        super().__init__(**kwargs)
+
+        self.on_select: Callable[[int], None] = on_select
+        self.first: int = 0
+        self.keys: list[str | None] = [None] * rows
+        self.labels: list[str | None] = [None] * rows
+        self.rows: list[Button] = [self._create_row(i) for i in range(rows)]
+
+    def _create_row(self, i: int) -> Button:
+        row = Button(
+            parent=self,
+            scale_y=.7,
+            scale_x=7.5,
+            text=' ',
+            origin_y=-3.05,
+            origin_x=-.33,
+            y=.5-(i*.8),
+            collider='box',
+            enabled=False
+        )
+
+        # Edit button's text config
+        row.text_entity.font = "assets/fonts/NotoSansJP/static/NotoSansJP-Light.ttf"
+        row.text_entity.wordwrap = 30
+        row.text_entity.line_height = .01
+        row.text_entity.scale = (1.4, 15)
+        row.text_entity.origin = (0, -50)
+
+        # Edit button config and function
+        row.color = color.rgba(1, 1, 1, .01)
+        row.highlight_color = color.rgba(.149,.149,1, .4)
+        row.on_click = Func(self._clicked, i)
+
+        return row
+
+    def _clicked(self, i: int) -> None:
+        if self.keys[i] is not None:
+            self.on_select(self.first + i)
+
+    def _set_row_label(self, i: int, label: str) -> None:
+        # Text rebuilds its glyphs on every assignment, skip unchanged labels
+        if self.labels[i] != label:
+            self.labels[i] = label
+            self.rows[i].text = label
+
+    def bind(self, first: int, items: list[tuple[str, str]]) -> None:
+        """Rebinds the rows to a window of the library
+
+        Args:
+            first (int): library index shown by the first row
+            items (list[tuple[str, str]]): (key, label) of each visible song,
+                rows past the end of items are hidden
+        """
+        self.first = first
+
+        for i, row in enumerate(self.rows):
+            if i < len(items):
+                key, label = items[i]
+                self.keys[i] = key
+                self._set_row_label(i, label)
+                row.enabled = True
+            else:
+                self.keys[i] = None
+                row.enabled = False
+
+    def set_label(self, key: str, label: str) -> bool:
+        """Changes the label of a visible row
+
+        Args:
+            key (str): key given to bind()
+            label (str): new label
+
+        Returns:
+            bool: False if no visible row has that key
+        """
+        for i, row_key in enumerate(self.keys):
+            if row_key == key:
+                self._set_row_label(i, label)
+                return True
+
+        return False
@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+
+import pytest
+
+from resources.components.library_scanner import scan_library
+from resources.components.library_watcher import ADDED, MODIFIED, InotifyWatcher, PollingWatcher
+
+
+def wait_added(watcher, timeout: float = 1.5) -> set[str]:
+    # inotify reports a new file once written, as MODIFIED
+    added = set()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        added.update(path for kind, path, _ in watcher.poll() if kind in (ADDED, MODIFIED))
+        time.sleep(.05)
+    return added
+
+
+def watchers():
+    yield PollingWatcher
+    if sys.platform.startswith("linux"):
+        yield InotifyWatcher
+
+
+@pytest.mark.parametrize("watcher_class", list(watchers()))
+def test_not_recursive_ignores_sub_directories(tmp_path, watcher_class):
+    (tmp_path / "sub").mkdir()
+    kwargs = {"interval": .1} if watcher_class is PollingWatcher else {}
+    watcher = watcher_class(tmp_path, recursive=False, **kwargs).start()
+
+    try:
+        time.sleep(.3)
+        (tmp_path / "sub" / "a.mp3").write_bytes(b"")
+        (tmp_path / "new").mkdir()
+        (tmp_path / "new" / "b.mp3").write_bytes(b"")
+        (tmp_path / "c.mp3").write_bytes(b"")
+
+        added = wait_added(watcher)
+    finally:
+        watcher.stop()
+
+    assert "c.mp3" in added
+    assert not {"sub/a.mp3", "new/b.mp3"} & added
+
+
+@pytest.mark.parametrize("watcher_class", list(watchers()))
+def test_symlinked_directories_match_the_scan(tmp_path, watcher_class):
+    target = tmp_path / "target"
+    library = tmp_path / "library"
+    target.mkdir()
+    library.mkdir()
+    os.symlink(target, library / "linked")
+
+    kwargs = {"interval": .1} if watcher_class is PollingWatcher else {}
+    watcher = watcher_class(library, **kwargs).start()
+
+    try:
+        time.sleep(.3)
+        (target / "a.mp3").write_bytes(b"")
+        added = wait_added(watcher)
+    finally:
+        watcher.stop()
+
+    assert set(scan_library(library)) == {"linked/a.mp3"}
+    assert "linked/a.mp3" in added
@@ -0,0 +1,55 @@
+import threading
+import time
+
+from resources.components import metadata_loader
+from resources.components.metadata_loader import MetadataLoader
+
+
+def wait_result(loader, file_path: str, timeout: float = 2) -> None:
+    deadline = time.monotonic() + timeout
+    while file_path not in loader.known and time.monotonic() < deadline:
+        loader.update()
+        time.sleep(.01)
+
+
+def test_requests_go_ahead_of_prefetches(monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+    parsed = []
+
+    def parse(file_path):
+        if file_path == "busy":
+            started.set()
+            release.wait()
+        parsed.append(file_path)
+        return {"title": file_path}
+
+    monkeypatch.setattr(metadata_loader, "get_audio_metadata", parse)
+    loader = MetadataLoader(workers=1)
+
+    # Keeps the worker busy while the queues fill up
+    loader.request("busy")
+    started.wait()
+
+    loader.prefetch(["p1", "p2", "shown"])
+    loader.request("r1")
+    loader.request("shown")
+    release.set()
+
+    for file_path in ("r1", "shown", "p1", "p2"):
+        wait_result(loader, file_path)
+    assert parsed == ["busy", "r1", "shown", "p1", "p2"]
+    loader.shutdown()
+
+
+def test_known_results_are_bounded(monkeypatch):
+    monkeypatch.setattr(metadata_loader, "get_audio_metadata", lambda file_path: {"title": file_path})
+    loader = MetadataLoader(workers=1, capacity=2)
+
+    for file_path in ("a", "b", "c"):
+        loader.request(file_path)
+        wait_result(loader, file_path)
+
+    assert list(loader.known) == ["b", "c"]
+    assert loader.get("a") is None
+    loader.shutdown()
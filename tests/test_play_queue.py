@@ -0,0 +1,36 @@
+import random
+
+from resources.components.play_queue import REPEAT_ALL, PlayQueue
+
+
+def test_rewind_makes_next_start_the_play_order():
+    queue = PlayQueue(length=3)
+    assert queue.next() is None
+
+    queue.rewind()
+    assert queue.upcoming(2) == [0, 1]
+    assert queue.next() == 0
+    assert queue.next() == 1
+
+
+def test_rewind_keeps_a_played_position():
+    queue = PlayQueue(length=3, repeat=REPEAT_ALL)
+    queue.select(2)
+
+    queue.rewind()
+    assert queue.next() == 0
+
+
+def test_rewind_follows_shuffled_order():
+    queue = PlayQueue(length=5, shuffle=True, rng=random.Random(1))
+    queue.rewind()
+    assert queue.next() == queue.order[0]
+
+
+def test_songs_added_to_an_emptied_queue_play_next():
+    queue = PlayQueue(length=1)
+    queue.rewind()
+
+    queue.remap([None], 0)
+    queue.extend(1)
+    assert queue.next() == 0
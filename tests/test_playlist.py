@@ -0,0 +1,48 @@
+from argparse import Namespace
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from resources.components.playlist import read_playlist
+
+
+def write_songs(folder: Path, *names: str) -> None:
+    for name in names:
+        (folder / name).parent.mkdir(parents=True, exist_ok=True)
+        (folder / name).write_bytes(b"")
+
+
+def test_relative_entries_resolve_against_playlist_folder(tmp_path):
+    write_songs(tmp_path, "a.mp3", "sub/b.mp3")
+    outside = tmp_path.parent / f"{tmp_path.name}-outside.mp3"
+    outside.write_bytes(b"")
+
+    playlist = tmp_path / "list.m3u8"
+    playlist.write_text(f"#EXTM3U\n#EXTINF:1,A\na.mp3\nsub/b.mp3\n{outside}\nmissing.mp3\n")
+
+    missing = deque()
+    names = list(read_playlist(playlist, missing))
+
+    assert names == ["a.mp3", "sub/b.mp3", str(outside)]
+    assert list(missing) == ["missing.mp3"]
+
+
+def test_playlist_disc_joins_songs_with_its_folder(tmp_path):
+    project = pytest.importorskip("project")
+    write_songs(tmp_path, "a.mp3")
+    playlist = tmp_path / "list.m3u"
+    playlist.write_text("a.mp3\n")
+
+    options = Namespace(repeat="all", shuffle=False)
+    with ThreadPoolExecutor(max_workers=1) as indexer:
+        disc = project.Disc(playlist, options, indexer)
+
+        assert disc.source == playlist
+        assert disc.contentraw["path"] == tmp_path
+
+        for name in read_playlist(playlist):
+            song_path = disc.contentraw["path"] / name
+            assert song_path.is_file()
+            assert disc.song_name(str(song_path)) == name
@@ -0,0 +1,58 @@
+from resources.components.search_index import SearchIndex
+
+
+def make_index(*names):
+    index = SearchIndex()
+    index.add_files(list(names))
+    return index
+
+
+def test_prefix_growing_to_a_trigram_matches_inside_words():
+    index = make_index("cabbage.mp3", "abbey road.mp3")
+
+    # One or two characters match the start of a word only
+    assert index.search("ab") == ["abbey road.mp3"]
+    assert index.search("abb") == ["cabbage.mp3", "abbey road.mp3"]
+    assert index.search("abbe") == ["abbey road.mp3"]
+
+
+def test_every_term_must_match():
+    index = make_index("beat it.mp3", "abbey beat.mp3", "road.mp3")
+
+    assert index.search("beat") == ["beat it.mp3", "abbey beat.mp3"]
+    assert index.search("beat ab") == ["abbey beat.mp3"]
+    assert index.search("beat abbey") == ["abbey beat.mp3"]
+    assert index.search("abbey beat") == ["abbey beat.mp3"]
+    assert index.search("road beat") == []
+
+
+def test_songs_added_after_a_query_are_found_when_it_narrows():
+    index = make_index("abbey road.mp3")
+    assert index.search("ro") == ["abbey road.mp3"]
+
+    index.add("road trip.mp3")
+    index.add("track 1.mp3", "Roadrunner")
+    assert index.search("roa") == ["abbey road.mp3", "road trip.mp3", "track 1.mp3"]
+    assert index.search("road trip") == ["road trip.mp3"]
+
+
+def test_removed_songs_are_not_found():
+    index = make_index("so what.mp3", "what else.mp3")
+    assert index.search("what") == ["so what.mp3", "what else.mp3"]
+
+    index.remove("so what.mp3")
+    assert index.search("what") == ["what else.mp3"]
+    assert index.search("what e") == ["what else.mp3"]
+    assert len(index) == 1
+
+
+def test_renamed_song_keeps_its_title_but_not_its_old_name():
+    index = make_index("so what.mp3")
+    index.add("so what.mp3", "Blue in Green", "Miles Davis")
+    assert index.search("what") == ["so what.mp3"]
+
+    index.rename("so what.mp3", "freddie.mp3")
+    assert index.search("what") == []
+    assert index.search("freddie") == ["freddie.mp3"]
+    assert index.search("miles") == ["freddie.mp3"]
+    assert index.search("blue green") == ["freddie.mp3"]